@@ -0,0 +1,206 @@
+"""
+Walk-Forward Backtester for Stock Price Predictor
+Retrains the model on expanding or rolling windows and trades each following period
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+from stock_predictor import StockPredictor
+import config
+
+# Features and targets of the backtest being run, set once per worker process so
+# the folds only send index ranges instead of copies of the feature matrix
+_fold_features = None
+_fold_target = None
+
+
+def _init_worker(features, target):
+    """Cache the feature matrix and targets in a worker process"""
+    global _fold_features, _fold_target
+    _fold_features = features
+    _fold_target = target
+
+
+def _run_fold(fold, train, test, model_params):
+    """
+    Train on one window and predict the period after it.
+    Runs in a worker process, so it must stay a module-level function.
+
+    Returns:
+        tuple: (fold number, test row positions, predictions, probabilities of UP)
+    """
+    X, y = _fold_features, _fold_target
+    model = RandomForestClassifier(**model_params)
+    model.fit(X[train[0]:train[1]], y[train[0]:train[1]])
+    X_test = X[test[0]:test[1]]
+    proba = model.predict_proba(X_test)
+    # a window with only one class has a single probability column
+    up = list(model.classes_).index(1) if 1 in model.classes_ else None
+    prob_up = proba[:, up] if up is not None else np.zeros(len(X_test))
+    return fold, np.arange(*test), (prob_up > 0.5).astype(int), prob_up
+
+
+class WalkForwardBacktester:
+    """
+    Walk-forward evaluation of the StockPredictor model.
+
+    The features are computed once; every fold trains on a window of past rows
+    (growing from the start for 'expanding', fixed length for 'rolling'), then
+    predicts the next test_size rows, which it has never seen. A long-only strategy
+    holds the stock for the next day whenever the model predicts UP.
+    """
+
+    def __init__(self, predictor, train_size=None, test_size=None, mode=None, workers=None,
+                 cost_bps=None, model_params=None, verbose=True):
+        """
+        Initialize the backtester
+
+        Args:
+            predictor (StockPredictor): Predictor with data (features are created if missing)
+            train_size (int): Rows in the first (expanding) or every (rolling) training window
+            test_size (int): Rows predicted by each fold, i.e. how often the model is retrained
+            mode (str): 'expanding' or 'rolling'
+            workers (int): Processes used for the folds (1 runs them in this process)
+            cost_bps (float): Trading cost in basis points, charged whenever the position changes
+            model_params (dict): RandomForestClassifier parameters (default: config.MODEL_PARAMS)
+            verbose (bool): Print progress (default: True)
+        All defaults not listed come from config.BACKTEST_SETTINGS.
+        """
+        settings = config.BACKTEST_SETTINGS
+        self.predictor = predictor
+        self.train_size = train_size or settings['train_size']
+        self.test_size = test_size or settings['test_size']
+        self.mode = mode or settings['mode']
+        self.workers = workers or settings['workers'] or os.cpu_count()
+        self.cost_bps = settings['cost_bps'] if cost_bps is None else cost_bps
+        # a single thread per fold, the parallelism comes from running folds side by side
+        self.model_params = {**config.MODEL_PARAMS, 'n_jobs': 1, **(model_params or {})}
+        self.verbose = verbose
+        self.results = None
+        self.stats = None
+        if self.mode not in ('expanding', 'rolling'):
+            raise ValueError(f"Unknown mode: {self.mode}")
+
+    def _log(self, *args):
+        """Print progress output unless the backtester is running quietly"""
+        if self.verbose:
+            print(*args)
+
+    def folds(self, n_rows):
+        """
+        Training and test row ranges of every fold
+
+        Returns:
+            list: (train (start, stop), test (start, stop)) tuples
+        """
+        folds = []
+        for start in range(self.train_size, n_rows, self.test_size):
+            train_start = 0 if self.mode == 'expanding' else start - self.train_size
+            folds.append(((train_start, start), (start, min(start + self.test_size, n_rows))))
+        return folds
+
+    def run(self):
+        """
+        Run every fold and compute the strategy statistics
+
+        Returns:
+            pd.DataFrame: One row per predicted day with the fold, prediction,
+                          probability, actual direction and strategy returns
+        """
+        if self.predictor.features is None and not self.predictor.create_features():
+            return None
+        features = self.predictor.features.to_numpy(dtype=np.float64)
+        target = self.predictor.target.to_numpy()
+        folds = self.folds(len(features))
+        if not folds:
+            self._log(f"Not enough data: {len(features)} rows for a {self.train_size} row training window")
+            return None
+
+        self._log(f"Backtesting {self.predictor.symbol}: {len(folds)} {self.mode} folds "
+                  f"of {self.test_size} days on {min(self.workers, len(folds))} workers...")
+        start = time.perf_counter()
+        args = [(i, train, test, self.model_params) for i, (train, test) in enumerate(folds)]
+        if self.workers == 1:
+            _init_worker(features, target)
+            outputs = [_run_fold(*a) for a in args]
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(folds)), initializer=_init_worker,
+                                     initargs=(features, target)) as pool:
+                outputs = list(pool.map(_run_fold, *zip(*args)))
+
+        rows = np.concatenate([o[1] for o in outputs])
+        index = self.predictor.features.index[rows]
+        results = pd.DataFrame({
+            'fold': np.concatenate([np.full(len(o[1]), o[0]) for o in outputs]),
+            'prediction': np.concatenate([o[2] for o in outputs]),
+            'prob_up': np.concatenate([o[3] for o in outputs]),
+            'target': target[rows],
+            'market_return': self.predictor.data['Next_Day_Return'].to_numpy()[rows],
+        }, index=index)
+        position = results['prediction'].to_numpy(dtype=np.float64)
+        trades = np.abs(np.diff(position, prepend=0.0))
+        results['strategy_return'] = position * results['market_return'] - trades * self.cost_bps / 1e4
+        results['equity'] = (1 + results['strategy_return']).cumprod()
+
+        self.results = results
+        self.stats = self._statistics(results, trades)
+        self._log(f"Finished in {time.perf_counter() - start:.1f}s")
+        self._log(self.summary())
+        return results
+
+    @staticmethod
+    def _statistics(results, trades):
+        """Accuracy and P&L statistics of a finished backtest"""
+        strategy = results['strategy_return']
+        equity = results['equity']
+        days = len(results)
+        std = strategy.std()
+        return {
+            'days': days,
+            'folds': results['fold'].nunique(),
+            'accuracy': (results['prediction'] == results['target']).mean(),
+            'fold_accuracy_std': (results['prediction'] == results['target']).groupby(results['fold']).mean().std(),
+            'total_return': equity.iloc[-1] - 1,
+            'buy_and_hold_return': (1 + results['market_return']).prod() - 1,
+            'annual_return': equity.iloc[-1] ** (252 / days) - 1,
+            'sharpe': strategy.mean() / std * np.sqrt(252) if std > 0 else np.nan,
+            'max_drawdown': (equity / equity.cummax() - 1).min(),
+            'exposure': results['prediction'].mean(),
+            'trades': int(trades.sum()),
+        }
+
+    def summary(self):
+        """Human-readable statistics of the last run"""
+        if self.stats is None:
+            return "No backtest has been run."
+        s = self.stats
+        return "\n".join([
+            f"Walk-forward backtest for {self.predictor.symbol} ({s['folds']} folds, {s['days']} days)",
+            f"Accuracy:          {s['accuracy']:.4f} (fold std {s['fold_accuracy_std']:.4f})",
+            f"Strategy return:   {s['total_return']:.2%} (annualized {s['annual_return']:.2%})",
+            f"Buy and hold:      {s['buy_and_hold_return']:.2%}",
+            f"Sharpe ratio:      {s['sharpe']:.2f}",
+            f"Max drawdown:      {s['max_drawdown']:.2%}",
+            f"Days in market:    {s['exposure']:.1%} ({s['trades']} position changes)",
+        ])
+
+
+def main():
+    """Run a walk-forward backtest from the command line"""
+    symbol = input("Enter stock symbol (default: AAPL): ").strip().upper() or 'AAPL'
+    period = input("Enter time period (2y, 5y, 10y, max) (default: 5y): ").strip() or '5y'
+    predictor = StockPredictor(symbol=symbol, period=period, verbose=False)
+    if not predictor.fetch_data() or not predictor.create_features():
+        print("Could not prepare data for the backtest.")
+        return
+    WalkForwardBacktester(predictor).run()
+
+
+if __name__ == "__main__":
+    main()
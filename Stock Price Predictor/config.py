@@ -2,6 +2,8 @@
 Configuration file for Stock Price Predictor
 """
 
+import os
+
 # Default settings
 DEFAULT_SYMBOL = "AAPL"
 DEFAULT_PERIOD = "2y"
@@ -12,7 +14,15 @@ MODEL_PARAMS = {
     'random_state': 42,
     'max_depth': 10,
     'min_samples_split': 5,
-    'min_samples_leaf': 2
+    'min_samples_leaf': 2,
+    'n_jobs': -1            # train (and predict with sklearn) on all cores
+}
+
+# Training and inference settings
+TRAINING_SETTINGS = {
+    'warm_start_trees': 20,     # trees added per update_model() call
+    'max_trees': 300,           # oldest trees are dropped beyond this
+    'fast_inference': True      # predict through the flattened forest (fast_forest.py)
 }
 
 # Feature parameters
@@ -20,7 +30,11 @@ FEATURE_PARAMS = {
     'ma_windows': [5, 10, 20],
     'volatility_windows': [5, 10],
     'rsi_period': 14,
-    'volume_ma_window': 5
+    'volume_ma_window': 5,
+    # optional indicators, None leaves them out of the model features
+    'macd': None,           # (fast, slow, signal) EMA spans, e.g. (12, 26, 9)
+    'bollinger': None,      # (window, number of standard deviations), e.g. (20, 2)
+    'atr_period': None      # Average True Range window, e.g. 14
 }
 
 # Popular stock symbols for quick testing
@@ -89,9 +103,80 @@ EVALUATION_SETTINGS = {
     'stratify': True
 }
 
+# Portfolio runner settings
+PORTFOLIO_SETTINGS = {
+    'fetch_workers': 16,     # threads for downloading data
+    'train_workers': None    # processes for training (None = one per CPU)
+}
+
+# Walk-forward backtest settings
+BACKTEST_SETTINGS = {
+    'train_size': 252,       # rows in the first (expanding) or every (rolling) training window
+    'test_size': 21,         # rows predicted per fold before retraining
+    'mode': 'expanding',     # 'expanding' or 'rolling'
+    'workers': None,         # processes for the folds (None = one per CPU)
+    'cost_bps': 0.0          # trading cost per position change, in basis points
+}
+
+# On-disk OHLCV cache settings
+CACHE_SETTINGS = {
+    'enabled': True,
+    'directory': os.path.join(os.path.expanduser('~'), '.cache', 'stock_predictor'),
+    'max_age_seconds': 60,        # serve cached bars without downloading while younger than this
+    'offline_directory': None,    # directory of <SYMBOL>.csv files to use instead of Yahoo Finance
+    # intraday intervals Yahoo Finance only serves for a recent window; older bars aren't kept
+    'max_periods': {
+        '1m': '7d',
+        '2m': '60d', '5m': '60d', '15m': '60d', '30m': '60d', '90m': '60d',
+        '60m': '730d', '1h': '730d'
+    }
+}
+
+# Memory settings for feature frames
+MEMORY_SETTINGS = {
+    'compact': False,           # float32 features in columnar arrays, without intermediate indicator columns
+    'memmap_directory': None,   # back compact features with memory-mapped files in this directory
+    'profile': False            # log the memory held by data, features and target after create_features
+}
+
+# Multi-horizon prediction settings
+PREDICTION_SETTINGS = {
+    'horizons': [1, 5, 20],      # trading days ahead
+    'calibration': 'sigmoid',    # 'sigmoid' (Platt), 'isotonic' or None
+    'calibration_size': 0.2,     # newest fraction of the history, held out from the forest
+    'evaluation_size': 0.5       # newest part of that held-out slice, used to measure accuracy instead of calibrating
+}
+
+# Trained model store settings
+MODEL_STORE_SETTINGS = {
+    'enabled': True,
+    'directory': os.path.join(os.path.expanduser('~'), '.cache', 'stock_predictor', 'models'),
+    'max_versions': 3,    # versions kept per symbol/period/feature set/model parameters
+    'reuse_days': 0       # reuse a model trained on data at most this many days older than the current data
+}
+
+# Live quote fetcher settings
+QUOTE_SETTINGS = {
+    'enabled': False,             # live predictors fetch intraday bars through one shared QuoteFetcher
+    'max_concurrency': 4,         # transport requests in flight at once
+    'batch_size': 20,             # symbols per request
+    'batch_window_seconds': 0.02, # wait this long for more symbols before sending a batch
+    'retries': 3,
+    'backoff_seconds': 0.5        # first retry delay, doubled for each further retry
+}
+
+# Market data replay settings
+REPLAY_SETTINGS = {
+    'speed': 1000,         # simulated seconds per real second (0 = clock only moves on advance())
+    'warmup_bars': 390     # bars already visible when a replay starts (one trading day of 1m bars)
+}
+
 # Live preview / streaming settings
 LIVE_SETTINGS = {
     'update_interval_seconds': 30,
     'intraday_interval': '1m',
-    'intraday_period': '5d'
+    'intraday_period': '5d',
+    'max_idle_predictors': 8,          # unwatched dashboard predictors kept running
+    'session_timeout_seconds': 300,    # release a dashboard session after this long without a poll
+    'chart_max_points': 1000           # longer chart histories are downsampled (LTTB) to this many points
 }
@@ -0,0 +1,245 @@
+"""
+On-disk OHLCV cache for Stock Price Predictor
+Keeps downloaded bars per (symbol, interval) and only fetches the missing date ranges
+"""
+
+import os
+import json
+import time
+import threading
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+import config
+
+
+def period_start(period, now=None):
+    """
+    Convert a yfinance period string to the first timestamp it covers
+
+    Returns:
+        pd.Timestamp or None: None for 'max' (the whole history)
+    """
+    now = now or pd.Timestamp.now(tz='UTC')
+    if period == 'max':
+        return None
+    if period == 'ytd':
+        return now.normalize().replace(month=1, day=1)
+    units = {'d': 'days', 'mo': 'months', 'y': 'years'}
+    for suffix, unit in units.items():
+        if period.endswith(suffix) and period[:-len(suffix)].isdigit():
+            return now - pd.DateOffset(**{unit: int(period[:-len(suffix)])})
+    raise ValueError(f"Unknown period: {period}")
+
+
+class YFinanceSource:
+    """Online source: downloads bars from Yahoo Finance"""
+
+    def history(self, symbol, interval='1d', start=None, end=None, period=None):
+        ticker = yf.Ticker(symbol)
+        if start is None:
+            return ticker.history(period=period or 'max', interval=interval)
+        return ticker.history(start=start, end=end, interval=interval)
+
+
+class CSVSource:
+    """
+    Offline source: reads bars from a directory of CSV files, one per symbol and interval.
+    Files are looked up as <SYMBOL>_<interval>.csv, then <SYMBOL>.csv, with the
+    timestamp in the first column.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def history(self, symbol, interval='1d', start=None, end=None, period=None):
+        for name in (f"{symbol}_{interval}.csv", f"{symbol}.csv"):
+            path = os.path.join(self.directory, name)
+            if os.path.exists(path):
+                break
+        else:
+            return pd.DataFrame()
+        df = pd.read_csv(path, index_col=0)
+        df.index = pd.to_datetime(df.index, utc=True)
+        if start is None and period is not None:
+            start = period_start(period, now=df.index[-1] if len(df) else None)
+        if start is not None:
+            df = df[df.index >= _as_utc(start)]
+        if end is not None:
+            df = df[df.index < _as_utc(end)]
+        return df
+
+
+def _as_utc(ts):
+    ts = pd.Timestamp(ts)
+    return ts.tz_localize('UTC') if ts.tzinfo is None else ts.tz_convert('UTC')
+
+
+class OHLCVCache:
+    """
+    Columnar on-disk store of OHLCV bars keyed by symbol and interval.
+
+    Each (symbol, interval) is one .npy file holding a (1 + columns, bars) float64
+    array, so every column is contiguous and the file can be memory-mapped, plus a
+    small JSON file with the column names, timezone and covered range. Requests
+    only download the bars that are missing: anything older than the cached range
+    and everything from the last cached bar on (which may still be changing).
+    """
+
+    def __init__(self, directory=None, source=None, max_age_seconds=None):
+        """
+        Initialize the OHLCV cache
+
+        Args:
+            directory (str): Where to keep the files (default: from config)
+            source: Object with a history(symbol, interval, start, end, period) method
+                    (default: YFinanceSource, or CSVSource if config sets an offline directory)
+            max_age_seconds (int): Serve the cache without any download while it is
+                                   younger than this (default: from config)
+        """
+        settings = config.CACHE_SETTINGS
+        self.directory = directory or settings['directory']
+        if source is None:
+            offline = settings.get('offline_directory')
+            source = CSVSource(offline) if offline else YFinanceSource()
+        self.source = source
+        self.max_age_seconds = settings['max_age_seconds'] if max_age_seconds is None else max_age_seconds
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def __getstate__(self):
+        # locks can't be pickled (e.g. to send a predictor to a worker process), the copy gets new ones
+        return {k: v for k, v in self.__dict__.items() if k not in ('_locks', '_locks_guard')}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _paths(self, symbol, interval):
+        base = os.path.join(self.directory, f"{symbol.upper()}_{interval}")
+        return base + '.npy', base + '.json'
+
+    def _lock(self, symbol, interval):
+        with self._locks_guard:
+            return self._locks.setdefault((symbol, interval), threading.Lock())
+
+    def _oldest(self, interval):
+        """First timestamp the source serves for an interval, None if it keeps the whole history"""
+        period = config.CACHE_SETTINGS.get('max_periods', {}).get(interval)
+        return None if period is None else period_start(period)
+
+    @staticmethod
+    def _trim(df, oldest):
+        return df if oldest is None else df[df.index >= oldest]
+
+    def load(self, symbol, interval='1d', mmap=True):
+        """
+        Read the cached bars for a symbol
+
+        Returns:
+            tuple: (DataFrame or None, metadata dict or None)
+        """
+        array_path, meta_path = self._paths(symbol, interval)
+        if not (os.path.exists(array_path) and os.path.exists(meta_path)):
+            return None, None
+        with open(meta_path) as f:
+            meta = json.load(f)
+        array = np.load(array_path, mmap_mode='r' if mmap else None)
+        index = pd.to_datetime(array[0], unit='s', utc=True).tz_convert(meta['tz'])
+        df = pd.DataFrame({name: array[i + 1] for i, name in enumerate(meta['columns'])}, index=index)
+        df.index.name = meta.get('index_name')
+        return df, meta
+
+    def save(self, symbol, interval, df, covered_from):
+        """Write bars for a symbol, replacing what was cached before"""
+        array_path, meta_path = self._paths(symbol, interval)
+        columns = [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c])]
+        array = np.empty((1 + len(columns), len(df)), dtype=np.float64)
+        index = df.index.tz_convert('UTC') if df.index.tz else df.index.tz_localize('UTC')
+        array[0] = index.as_unit('ns').asi8 // 10**9
+        for i, name in enumerate(columns):
+            array[i + 1] = df[name].to_numpy(dtype=np.float64)
+        meta = {
+            'columns': columns,
+            'tz': str(df.index.tz or 'UTC'),
+            'index_name': df.index.name,
+            'covered_from': None if covered_from is None else covered_from.isoformat(),
+            'fetched_at': time.time(),
+        }
+        # write to temporary files first so readers never see a half-written array
+        with open(array_path + '.tmp', 'wb') as f:
+            np.save(f, array)
+        with open(meta_path + '.tmp', 'w') as f:
+            json.dump(meta, f)
+        os.replace(array_path + '.tmp', array_path)
+        os.replace(meta_path + '.tmp', meta_path)
+
+    def get(self, symbol, period='2y', interval='1d'):
+        """
+        Bars for a symbol over a period, downloading only what the cache is missing.
+        Intervals listed in config max_periods are kept only for the window the
+        source can serve, so their files don't grow without bound.
+
+        Returns:
+            pd.DataFrame: OHLCV bars, empty if nothing is available
+        """
+        start = period_start(period)
+        oldest = self._oldest(interval)
+        with self._lock(symbol, interval):
+            # nothing before the servable window is fetched or kept
+            fetch_start = oldest if oldest is not None and (start is None or start < oldest) else start
+            cached, meta = self.load(symbol, interval, mmap=False)
+            # a cache ending before the period can't be extended without leaving a gap
+            # (and sources may not serve a start that old, e.g. Yahoo's intraday window),
+            # so it is replaced by a fresh download of the period
+            if cached is None or len(cached) == 0 or (fetch_start is not None and cached.index[-1] < fetch_start):
+                cached = self.source.history(symbol, interval=interval, period=period)
+                if len(cached) > 0:
+                    cached = self._trim(cached, oldest)
+                    self.save(symbol, interval, cached, fetch_start)
+            else:
+                covered_from = meta['covered_from'] and pd.Timestamp(meta['covered_from'])
+                parts = [cached]
+                # history before what the cache covers
+                if meta['covered_from'] is not None and (fetch_start is None or fetch_start < covered_from):
+                    head = self.source.history(symbol, interval=interval, start=fetch_start, end=cached.index[0],
+                                               period=period if fetch_start is None else None)
+                    parts.insert(0, head)
+                    covered_from = fetch_start
+                # the last cached bar onwards, unless the cache is fresh enough
+                if time.time() - meta['fetched_at'] >= self.max_age_seconds:
+                    tail_start = cached.index[-1] if fetch_start is None else max(cached.index[-1], fetch_start)
+                    parts.append(self.source.history(symbol, interval=interval, start=tail_start))
+
+                if len(parts) > 1:
+                    merged = pd.concat([p for p in parts if len(p) > 0])
+                    merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+                    merged = self._trim(merged, oldest)
+                    if oldest is not None:
+                        covered_from = oldest if covered_from is None else max(covered_from, oldest)
+                    self.save(symbol, interval, merged, covered_from)
+                    cached = merged
+
+        # a source with no bars returns a frame without a DatetimeIndex
+        if len(cached) == 0:
+            return cached
+        if start is not None:
+            cached = cached[cached.index >= start]
+        return cached
+
+
+_default_cache = None
+
+
+def default_cache():
+    """The shared cache configured in config.CACHE_SETTINGS, or None if caching is disabled"""
+    global _default_cache
+    if not config.CACHE_SETTINGS['enabled']:
+        return None
+    if _default_cache is None:
+        _default_cache = OHLCVCache()
+    return _default_cache
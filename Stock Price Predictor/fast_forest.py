@@ -0,0 +1,139 @@
+"""
+Fast Forest Inference for Stock Price Predictor
+Evaluates a trained RandomForestClassifier as flat NumPy arrays, without sklearn's per-call overhead
+"""
+
+import numpy as np
+
+
+class FlatForest:
+    """
+    A fitted RandomForestClassifier flattened into one set of node arrays.
+
+    All trees are concatenated, with child indices offset into the shared arrays,
+    so a prediction walks every tree at once: each step is one vector operation
+    over (rows, trees) and the number of steps is the depth of the deepest tree.
+    Results are the same as the forest's predict_proba and predict.
+    """
+
+    def __init__(self, model):
+        """
+        Flatten a fitted forest
+
+        Args:
+            model: Fitted RandomForestClassifier (single output)
+        """
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        depth = 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            leaf = tree.children_left == -1
+            roots.append(offset)
+            # leaves point to themselves so extra steps leave them in place
+            own = np.arange(offset, offset + tree.node_count)
+            features.append(np.where(leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            lefts.append(np.where(leaf, own, tree.children_left + offset))
+            rights.append(np.where(leaf, own, tree.children_right + offset))
+            value = tree.value[:, 0, :]
+            values.append(value / value.sum(axis=1, keepdims=True))
+            offset += tree.node_count
+            depth = max(depth, tree.max_depth)
+        self.classes_ = model.classes_
+        self.n_trees = len(roots)
+        self.depth = depth
+        self.feature = np.concatenate(features).astype(np.intp)
+        self.threshold = np.concatenate(thresholds)
+        self.left = np.concatenate(lefts).astype(np.intp)
+        self.right = np.concatenate(rights).astype(np.intp)
+        self.value = np.concatenate(values)
+        self.roots = np.array(roots, dtype=np.intp)
+        self.tree_groups = [(0, self.n_trees)]
+    
+    @classmethod
+    def concat(cls, forests):
+        """
+        One FlatForest holding the trees of several flattened forests with the same
+        classes, so they can all be evaluated in a single call of group_proba.
+        tree_groups holds the (start, stop) tree range of each input forest.
+        """
+        flat = cls.__new__(cls)
+        offsets = np.cumsum([0] + [len(f.feature) for f in forests[:-1]])
+        flat.classes_ = forests[0].classes_
+        flat.n_trees = sum(f.n_trees for f in forests)
+        flat.depth = max(f.depth for f in forests)
+        flat.feature = np.concatenate([f.feature for f in forests])
+        flat.threshold = np.concatenate([f.threshold for f in forests])
+        flat.left = np.concatenate([f.left + o for f, o in zip(forests, offsets)])
+        flat.right = np.concatenate([f.right + o for f, o in zip(forests, offsets)])
+        flat.value = np.concatenate([f.value for f in forests])
+        flat.roots = np.concatenate([f.roots + o for f, o in zip(forests, offsets)])
+        starts = np.cumsum([0] + [f.n_trees for f in forests])
+        flat.tree_groups = list(zip(starts[:-1], starts[1:]))
+        return flat
+
+    @staticmethod
+    def _rows(X):
+        # sklearn compares float32 features with the thresholds, do the same for identical splits
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        return X.reshape(1, -1) if X.ndim == 1 else X
+
+    def _walk(self, X, rows, nodes):
+        """Follow each (row of X, start node) pair down to its leaf"""
+        for _ in range(self.depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+    
+    def _leaves(self, X, trees):
+        """Leaf reached by every row of X in every tree of `trees`, shaped (rows, trees)"""
+        nodes = np.broadcast_to(self.roots[trees], (len(X), len(trees)))
+        return self._walk(X, np.arange(len(X))[:, None], nodes)
+    
+    def group_proba(self, X, rows):
+        """
+        Class probabilities of every tree group for its own row of X: group g
+        (see concat) is evaluated on row rows[g] only
+        
+        Returns:
+            np.ndarray: (groups, classes) probabilities
+        """
+        X = self._rows(X)
+        starts = np.array([start for start, _ in self.tree_groups])
+        sizes = np.array([stop - start for start, stop in self.tree_groups])
+        leaves = self._walk(X, np.repeat(rows, sizes), self.roots)
+        return np.add.reduceat(self.value[leaves], starts, axis=0) / sizes[:, None]
+
+    def predict_proba(self, X):
+        """Class probabilities, the mean of the trees' leaf distributions"""
+        X = self._rows(X)
+        leaves = self._leaves(X, np.arange(self.n_trees))
+        return self.value[leaves].mean(axis=1)
+
+    def predict(self, X, early_exit=False, chunk=16):
+        """
+        Predicted classes
+
+        Args:
+            X: One row or a 2D array of rows
+            early_exit (bool): For two classes, evaluate the trees `chunk` at a time and
+                               stop once the remaining trees can no longer change the vote
+            chunk (int): Trees per step when exiting early
+        """
+        if not early_exit or len(self.classes_) != 2:
+            return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+        X = self._rows(X)
+        # the forest predicts the second class when its mean probability is above one half
+        half = self.n_trees / 2
+        total = np.zeros(len(X))
+        undecided = np.arange(len(X))
+        for start in range(0, self.n_trees, chunk):
+            trees = np.arange(start, min(start + chunk, self.n_trees))
+            total[undecided] += self.value[self._leaves(X[undecided], trees), 1].sum(axis=1)
+            remaining = self.n_trees - trees[-1] - 1
+            done = (total[undecided] > half) | (total[undecided] + remaining <= half)
+            undecided = undecided[~done]
+            if len(undecided) == 0:
+                break
+        return self.classes_[(total > half).astype(int)]
@@ -0,0 +1,188 @@
+"""
+Vectorized Technical Indicators for Stock Price Predictor
+Computes every indicator in config.FEATURE_PARAMS for many symbols at once
+"""
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+import config
+
+OHLCV = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def feature_columns(params=None):
+    """
+    Names of the model features for a set of feature parameters, in model column order
+
+    Args:
+        params (dict): Feature parameters (default: config.FEATURE_PARAMS)
+    """
+    params = params or config.FEATURE_PARAMS
+    columns = ['Price_Change', 'High_Low_Pct', 'Open_Close_Pct']
+    columns += [f'MA_{w}_ratio' for w in params['ma_windows']]
+    columns += [f'Volatility_{w}' for w in params['volatility_windows']]
+    columns += ['Volume_ratio', 'RSI']
+    if params.get('macd'):
+        columns += ['MACD_pct', 'MACD_hist_pct']
+    if params.get('bollinger'):
+        columns += ['BB_width', 'BB_pct']
+    if params.get('atr_period'):
+        columns += ['ATR_pct']
+    return columns
+
+
+def _shift(x):
+    """x shifted one step forward in time (last axis), NaN first"""
+    out = np.empty_like(x)
+    out[..., 0] = np.nan
+    out[..., 1:] = x[..., :-1]
+    return out
+
+
+def rolling_mean(x, window):
+    """
+    Mean over the trailing window along the last axis, from cumulative sums.
+    NaN until the window holds `window` valid values, like pandas' rolling().mean().
+    """
+    valid = ~np.isnan(x)
+    pad = np.zeros(x.shape[:-1] + (1,))
+    total = np.concatenate([pad, np.cumsum(np.where(valid, x, 0.0), axis=-1)], axis=-1)
+    count = np.concatenate([pad, np.cumsum(valid, axis=-1)], axis=-1)
+    out = np.full(x.shape, np.nan)
+    if x.shape[-1] >= window:
+        sums = total[..., window:] - total[..., :-window]
+        full = (count[..., window:] - count[..., :-window]) == window
+        out[..., window - 1:] = np.where(full, sums / window, np.nan)
+    return out
+
+
+def rolling_std(x, window):
+    """
+    Sample standard deviation over the trailing window along the last axis.
+    Uses a strided window view rather than cumulative sums of squares, which lose
+    precision when the mean is large compared with the spread (e.g. prices).
+    """
+    out = np.full(x.shape, np.nan)
+    if x.shape[-1] >= window:
+        out[..., window - 1:] = sliding_window_view(x, window, axis=-1).std(axis=-1, ddof=1)
+    return out
+
+
+def ema(x, span):
+    """
+    Exponential moving average along the last axis, like pandas' ewm(span, adjust=False).
+    The recursion runs over time only; every step is one vector operation across symbols.
+    """
+    alpha = 2.0 / (span + 1)
+    out = np.empty_like(x)
+    prev = np.full(x.shape[:-1], np.nan)
+    for t in range(x.shape[-1]):
+        # a symbol's average starts at its first valid value
+        prev = np.where(np.isnan(prev), x[..., t], alpha * x[..., t] + (1 - alpha) * prev)
+        out[..., t] = prev
+    return out
+
+
+def compute(bars, params=None):
+    """
+    Compute the indicators for one or many symbols
+
+    Args:
+        bars (dict): 'Open', 'High', 'Low', 'Close', 'Volume' arrays, shaped (time,)
+                     for one symbol or (symbols, time) for many, aligned on time
+        params (dict): Feature parameters (default: config.FEATURE_PARAMS)
+
+    Returns:
+        dict: column name -> array with the same shape as the inputs
+    """
+    params = params or config.FEATURE_PARAMS
+    o, h, l, c, v = (np.asarray(bars[k], dtype=np.float64) for k in OHLCV)
+    prev_close = _shift(c)
+    out = {}
+
+    # Price-based features
+    out['Price_Change'] = c / prev_close - 1
+    out['High_Low_Pct'] = (h - l) / c
+    out['Open_Close_Pct'] = (c - o) / o
+
+    # Moving averages and their ratios
+    for w in params['ma_windows']:
+        out[f'MA_{w}'] = rolling_mean(c, w)
+    for w in params['ma_windows']:
+        out[f'MA_{w}_ratio'] = c / out[f'MA_{w}']
+
+    # Volatility
+    for w in params['volatility_windows']:
+        out[f'Volatility_{w}'] = rolling_std(out['Price_Change'], w)
+
+    # Volume features
+    w = params['volume_ma_window']
+    out[f'Volume_MA_{w}'] = rolling_mean(v, w)
+    out['Volume_ratio'] = v / out[f'Volume_MA_{w}']
+
+    # RSI from simple moving averages of gains and losses
+    delta = c - prev_close
+    gain = rolling_mean(np.where(delta > 0, delta, 0.0), params['rsi_period'])
+    loss = rolling_mean(np.where(delta < 0, -delta, 0.0), params['rsi_period'])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out['RSI'] = 100 - 100 / (1 + gain / loss)
+
+    if params.get('macd'):
+        fast, slow, signal = params['macd']
+        out['MACD'] = ema(c, fast) - ema(c, slow)
+        out['MACD_signal'] = ema(out['MACD'], signal)
+        out['MACD_hist'] = out['MACD'] - out['MACD_signal']
+        out['MACD_pct'] = out['MACD'] / c
+        out['MACD_hist_pct'] = out['MACD_hist'] / c
+
+    if params.get('bollinger'):
+        window, num_std = params['bollinger']
+        middle = rolling_mean(c, window)
+        spread = num_std * rolling_std(c, window)
+        out['BB_upper'] = middle + spread
+        out['BB_lower'] = middle - spread
+        out['BB_width'] = 2 * spread / middle
+        out['BB_pct'] = (c - out['BB_lower']) / (2 * spread)
+
+    if params.get('atr_period'):
+        true_range = np.fmax(h - l, np.fmax(np.abs(h - prev_close), np.abs(l - prev_close)))
+        out['ATR'] = rolling_mean(true_range, params['atr_period'])
+        out['ATR_pct'] = out['ATR'] / c
+
+    return out
+
+
+def add_indicators(df, params=None):
+    """
+    Add the indicator columns to a single symbol's OHLCV DataFrame
+
+    Returns:
+        pd.DataFrame: A copy of df with one extra column per indicator
+    """
+    values = compute({k: df[k].to_numpy(dtype=np.float64) for k in OHLCV}, params)
+    return pd.concat([df, pd.DataFrame(values, index=df.index)], axis=1)
+
+
+def stack(frames):
+    """
+    Align OHLCV DataFrames of many symbols on a shared time index
+
+    Args:
+        frames (dict): symbol -> OHLCV DataFrame
+
+    Returns:
+        tuple: (list of symbols, shared index, dict of (symbols, time) arrays for compute());
+               bars a symbol does not have are NaN
+    """
+    symbols = list(frames)
+    index = frames[symbols[0]].index
+    for symbol in symbols[1:]:
+        index = index.union(frames[symbol].index)
+    bars = {k: np.full((len(symbols), len(index)), np.nan) for k in OHLCV}
+    for i, symbol in enumerate(symbols):
+        df = frames[symbol].reindex(index)
+        for k in OHLCV:
+            bars[k][i] = df[k].to_numpy(dtype=np.float64)
+    return symbols, index, bars
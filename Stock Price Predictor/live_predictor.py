@@ -13,30 +13,174 @@ import dash
 from dash import dcc, html, Input, Output, callback
 import dash_bootstrap_components as dbc
 import time
+import uuid
+import queue
 import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
 
 from stock_predictor import StockPredictor
+from quote_fetcher import default_quote_fetcher
+from prediction import predict_horizons
 import config
 
+# Traces of the live chart: name, subplot row and line style (bar color for volume)
+CHART_TRACES = [
+    ('Close Price', 1, dict(color='#1f77b4', width=2)),
+    ('MA 5', 1, dict(color='#ff7f0e', width=1)),
+    ('MA 20', 1, dict(color='#2ca02c', width=1)),
+    ('Volume (up)', 2, 'green'),
+    ('Volume (down)', 2, 'red'),
+    ('RSI', 3, dict(color='#9467bd', width=2)),
+]
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling: pick n_out points of (x, y) that keep
+    the visual shape of the line, always including the first and last point
+    
+    Returns:
+        np.ndarray: Sorted indices of the points to keep
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # n_out - 2 buckets between the fixed first and last point
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    keep = np.empty(n_out, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # the average of the next bucket is the third corner of the triangle
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[hi:next_hi].mean(), y[hi:next_hi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def _chart_columns(data):
+    """x and y values of every CHART_TRACES trace for the rows of data"""
+    up = (data['Close'] >= data['Open']).to_numpy()
+    index = data.index
+    x = [index, index, index, index[up], index[~up], index]
+    y = [data['Close'], data['MA_5'], data['MA_20'], data['Volume'][up], data['Volume'][~up], data['RSI']]
+    return x, [v.to_numpy() for v in y]
+
+
+def chart_extension(data, since):
+    """
+    The rows of data after `since` as a Dash extendData update of the live chart
+    
+    Returns:
+        tuple: (update dict, trace indices) for Graph.extendData, or None if there is nothing new
+    """
+    new = data[data.index > pd.Timestamp(since)]
+    if len(new) == 0:
+        return None
+    x, y = _chart_columns(new)
+    return dict(x=[list(v) for v in x], y=[v.tolist() for v in y]), list(range(len(CHART_TRACES)))
+
+
+def live_chart(symbol, data, max_points=None):
+    """
+    The live chart of a symbol as a Plotly figure
+    
+    Args:
+        symbol (str): Stock symbol, for the titles
+        data (pd.DataFrame): Rows with the CHART_TRACES columns, e.g. LiveStockPredictor.chart_data()
+        max_points (int): Longer histories are downsampled with LTTB to this many
+                          points (default: from config, None or 0 disables it)
+    """
+    if max_points is None:
+        max_points = config.LIVE_SETTINGS['chart_max_points']
+    if max_points and len(data) > max_points:
+        data = data.iloc[lttb_indices(data.index.asi8, data['Close'].to_numpy(), max_points)]
+    
+    # Create subplots
+    fig = make_subplots(
+        rows=3, cols=1,
+        shared_xaxes=True,
+        vertical_spacing=0.05,
+        subplot_titles=(f'{symbol} Price Chart', 'Volume', 'RSI'),
+        row_heights=[0.6, 0.2, 0.2]
+    )
+    
+    # One trace per entry of CHART_TRACES, in that order, so chart_extension can extend them
+    x, y = _chart_columns(data)
+    for (name, row, style), xs, ys in zip(CHART_TRACES, x, y):
+        if name.startswith('Volume'):
+            trace = go.Bar(x=xs, y=ys, name=name, marker_color=style, opacity=0.7)
+        else:
+            trace = go.Scatter(x=xs, y=ys, mode='lines', name=name, line=style,
+                               opacity=1.0 if name in ('Close Price', 'RSI') else 0.7)
+        fig.add_trace(trace, row=row, col=1)
+    
+    # Add RSI reference lines
+    fig.add_hline(y=70, line_dash="dash", line_color="red", 
+                 annotation_text="Overbought", row=3, col=1)
+    fig.add_hline(y=30, line_dash="dash", line_color="green", 
+                 annotation_text="Oversold", row=3, col=1)
+    
+    # Update layout
+    fig.update_layout(
+        title=f'{symbol} Live Stock Analysis',
+        height=800,
+        showlegend=True,
+        hovermode='x unified',
+        template='plotly_white'
+    )
+    
+    fig.update_xaxes(title_text="Date", row=3, col=1)
+    fig.update_yaxes(title_text="Price ($)", row=1, col=1)
+    fig.update_yaxes(title_text="Volume", row=2, col=1)
+    fig.update_yaxes(title_text="RSI", row=3, col=1)
+    
+    return fig
+
+
 class LiveStockPredictor(StockPredictor):
     """Enhanced Stock Predictor with live data capabilities"""
     
-    def __init__(self, symbol='AAPL', period='2y', update_interval=30):
-        super().__init__(symbol, period)
+    def __init__(self, symbol='AAPL', period='2y', update_interval=30, cache=None, live_source=None,
+                 quote_fetcher=None):
+        super().__init__(symbol, period, cache=cache)
         self.update_interval = update_interval  # seconds
+        # where intraday bars come from instead of Yahoo Finance, e.g. a replay.ReplaySource
+        self.live_source = live_source
+        # shared fetcher that batches and coalesces requests of many predictors
+        self.quote_fetcher = quote_fetcher if quote_fetcher is not None else default_quote_fetcher()
         self.live_data = None
         self.is_live = False
         self.last_update = None
+        # background serving: the thread owns all updates and publishes snapshots
+        self._snapshot = None
+        self._snapshot_lock = threading.Lock()
+        self._commands = queue.Queue()
+        self._thread = None
+        self._chart_version = 0
+        self._chart = None
         
     def get_live_data(self):
         """Get the most recent stock data"""
         try:
-            ticker = yf.Ticker(self.symbol)
-            # Get data for the last 5 days to ensure we have recent data
-            live_data = ticker.history(period="5d", interval="1m")
+            if self.live_source is not None:
+                live_data = self.live_source.history(self.symbol, interval="1m", period="5d")
+            elif self.quote_fetcher is not None:
+                live_data = self.quote_fetcher.fetch(self.symbol, interval="1m", period="5d")
+            elif self.cache is not None:
+                live_data = self.cache.get(self.symbol, period="5d", interval="1m")
+            else:
+                ticker = yf.Ticker(self.symbol)
+                # Get data for the last 5 days to ensure we have recent data
+                live_data = ticker.history(period="5d", interval="1m")
             if len(live_data) > 0:
                 self.live_data = live_data
                 self.last_update = datetime.now()
@@ -45,6 +189,30 @@ class LiveStockPredictor(StockPredictor):
             print(f"Error fetching live data: {e}")
         return False
     
+    def create_features(self):
+        """Create features; the whole data frame is replaced, so the chart starts over"""
+        created = super().create_features()
+        self._chart_version += 1
+        return created
+    
+    def refresh_features(self):
+        """
+        Bring the daily features up to date from the intraday live data.
+        Finished days are appended to the training set through the incremental
+        feature engine; today's partial bar replaces the newest bar (latest_features)
+        until the next day's bars arrive.
+        """
+        if self.feature_engine is None or self.live_data is None or len(self.live_data) == 0:
+            return False
+        
+        live = self.live_data
+        days = live.groupby(live.index.normalize()).agg(
+            {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'})
+        if days.index.tz is not None and self.data.index.tz is not None:
+            days.index = days.index.tz_convert(self.data.index.tz)
+        self.append_bars(days)
+        return True
+    
     def get_current_price(self):
         """Get current stock price"""
         if self.live_data is not None and len(self.live_data) > 0:
@@ -59,107 +227,23 @@ class LiveStockPredictor(StockPredictor):
             return ((current - previous) / previous) * 100
         return None
     
-    def create_live_chart(self):
-        """Create interactive live chart using Plotly"""
-        if self.data is None:
-            return go.Figure()
-        
-        # Create subplots
-        fig = make_subplots(
-            rows=3, cols=1,
-            shared_xaxes=True,
-            vertical_spacing=0.05,
-            subplot_titles=(f'{self.symbol} Price Chart', 'Volume', 'RSI'),
-            row_heights=[0.6, 0.2, 0.2]
-        )
-        
-        # Price chart with moving averages
-        fig.add_trace(
-            go.Scatter(
-                x=self.data.index,
-                y=self.data['Close'],
-                mode='lines',
-                name='Close Price',
-                line=dict(color='#1f77b4', width=2)
-            ),
-            row=1, col=1
-        )
-        
-        fig.add_trace(
-            go.Scatter(
-                x=self.data.index,
-                y=self.data['MA_5'],
-                mode='lines',
-                name='MA 5',
-                line=dict(color='#ff7f0e', width=1),
-                opacity=0.7
-            ),
-            row=1, col=1
-        )
+    def create_live_chart(self, max_points=None):
+        """
+        Create interactive live chart using Plotly
         
-        fig.add_trace(
-            go.Scatter(
-                x=self.data.index,
-                y=self.data['MA_20'],
-                mode='lines',
-                name='MA 20',
-                line=dict(color='#2ca02c', width=1),
-                opacity=0.7
-            ),
-            row=1, col=1
-        )
-        
-        # Volume chart
-        colors = ['green' if close >= open else 'red' 
-                 for close, open in zip(self.data['Close'], self.data['Open'])]
-        
-        fig.add_trace(
-            go.Bar(
-                x=self.data.index,
-                y=self.data['Volume'],
-                name='Volume',
-                marker_color=colors,
-                opacity=0.7
-            ),
-            row=2, col=1
-        )
-        
-        # RSI chart
-        fig.add_trace(
-            go.Scatter(
-                x=self.data.index,
-                y=self.data['RSI'],
-                mode='lines',
-                name='RSI',
-                line=dict(color='#9467bd', width=2)
-            ),
-            row=3, col=1
-        )
-        
-        # Add RSI reference lines
-        fig.add_hline(y=70, line_dash="dash", line_color="red", 
-                     annotation_text="Overbought", row=3, col=1)
-        fig.add_hline(y=30, line_dash="dash", line_color="green", 
-                     annotation_text="Oversold", row=3, col=1)
-        
-        # Update layout
-        fig.update_layout(
-            title=f'{self.symbol} Live Stock Analysis',
-            height=800,
-            showlegend=True,
-            hovermode='x unified',
-            template='plotly_white'
-        )
-        
-        fig.update_xaxes(title_text="Date", row=3, col=1)
-        fig.update_yaxes(title_text="Price ($)", row=1, col=1)
-        fig.update_yaxes(title_text="Volume", row=2, col=1)
-        fig.update_yaxes(title_text="RSI", row=3, col=1)
-        
-        return fig
+        Args:
+            max_points (int): Longer histories are downsampled with LTTB to this many
+                              points (default: from config, None or 0 disables it)
+        """
+        data = self.chart_data()
+        if data is None:
+            return go.Figure()
+        return live_chart(self.symbol, data, max_points)
     
     def get_live_prediction(self):
         """Get live prediction with current data"""
+        if self.model is None and self.features is not None:
+            self.load_model()
         if self.model is None:
             return None
         
@@ -167,10 +251,14 @@ class LiveStockPredictor(StockPredictor):
         self.get_live_data()
         
         if self.live_data is not None and len(self.live_data) > 0:
-            # Use the latest features for prediction
-            latest_features = self.features.iloc[-1:].values
-            prediction = self.model.predict(latest_features)[0]
-            prediction_proba = self.model.predict_proba(latest_features)[0]
+            # Use the latest features for prediction, including today's session so far
+            self.refresh_features()
+            if self.latest_features is not None:
+                latest_features = self.latest_features.values
+            else:
+                latest_features = self.features.iloc[-1:].values
+            prediction_proba = self._predict_proba(latest_features)[0]
+            prediction = self.model.classes_[np.argmax(prediction_proba)]
             
             direction = "UP" if prediction == 1 else "DOWN"
             confidence = max(prediction_proba) * 100
@@ -186,12 +274,217 @@ class LiveStockPredictor(StockPredictor):
             }
         return None
 
+    def start(self):
+        """
+        Start the background thread that keeps data, model and prediction up to date.
+        It fetches data and trains a model first if needed, then refreshes every
+        update_interval seconds and publishes a snapshot after every refresh.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self.is_live = True
+        self._thread = threading.Thread(target=self._serve, name=f"live-{self.symbol}", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout=None):
+        """Stop the background thread after its current refresh"""
+        self.is_live = False
+        self._commands.put('stop')
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def request(self, command):
+        """
+        Ask the background thread to run 'update' (fetch and rebuild features),
+        'train' or 'refresh' (new live prediction) as soon as possible, without waiting for it
+        """
+        self._commands.put(command)
+    
+    def snapshot(self):
+        """The latest published state (None until the first refresh has finished)"""
+        with self._snapshot_lock:
+            return self._snapshot
+    
+    def _serve(self):
+        """Background loop: run queued commands, refresh on every interval, publish snapshots"""
+        if self.features is None:
+            self._run_command('update')
+        if self.model is None and self.features is not None:
+            self._run_command('train')
+        elif not self.horizon_models and self.features is not None:
+            self.train_horizons()
+        self._publish()
+        while self.is_live:
+            try:
+                command = self._commands.get(timeout=self.update_interval)
+            except queue.Empty:
+                command = 'refresh'
+            if command == 'stop':
+                break
+            self._run_command(command)
+            self._publish()
+    
+    def _run_command(self, command):
+        """Run one command on the serving thread, which is the only one mutating the predictor"""
+        try:
+            if command == 'update':
+                if self.fetch_data():
+                    self.create_features()
+            elif command == 'train':
+                # a stored model is fine for the first one, an explicit retrain must really train
+                retrain = self.model is not None
+                self.train_model(retrain=retrain)
+                self.train_horizons(retrain=retrain)
+        except Exception as e:
+            print(f"Error running {command} for {self.symbol}: {e}")
+    
+    def _publish(self):
+        """Compute prediction, prices and chart, then swap them in as the new snapshot"""
+        try:
+            prediction = self.get_live_prediction()
+            horizons = predict_horizons(self) if self.horizon_models else None
+        except Exception as e:
+            print(f"Error predicting {self.symbol}: {e}")
+            prediction, horizons = None, None
+        try:
+            # the full figure is only rebuilt when the data was replaced; new bars are
+            # sent to the browser through chart_extension instead
+            if self._chart is None or self._chart[0] != self._chart_version:
+                data = self.chart_data()
+                last = data.index[-1].isoformat() if data is not None and len(data) > 0 else None
+                self._chart = (self._chart_version, self.create_live_chart(), last)
+            snapshot = {
+                'prediction': prediction,
+                'horizons': horizons,
+                'current_price': self.get_current_price(),
+                'price_change': self.get_price_change(),
+                'model_trained': self.model is not None,
+                'chart_version': self._chart[0],
+                'figure': self._chart[1],
+                'chart_last': self._chart[2],
+                'data': self.chart_data(),
+                'recent_features': self.features.tail(10).iloc[::-1] if self.features is not None else None,
+                'last_update': self.last_update,
+            }
+        except Exception as e:
+            # keep serving: the previous snapshot stays up and the next refresh tries again
+            print(f"Error publishing {self.symbol}: {e}")
+            return
+        with self._snapshot_lock:
+            self._snapshot = snapshot
+
+class PredictorPool:
+    """
+    Live predictors shared by dashboard sessions.
+
+    Sessions watching the same (symbol, period) share one predictor, so its data,
+    model and background thread are set up only once. Predictors nobody watches are
+    kept idle for a while in LRU order, so switching back is instant, and the least
+    recently used one is stopped once more than max_idle are idle. Sessions that
+    stop polling (e.g. a closed browser tab) are released after session_timeout.
+    """
+    
+    def __init__(self, max_idle=None, session_timeout=None, factory=None):
+        """
+        Initialize the predictor pool
+        
+        Args:
+            max_idle (int): Unwatched predictors kept running (default: from config)
+            session_timeout (float): Seconds without a poll before a session is released (default: from config)
+            factory: Callable (symbol, period) -> LiveStockPredictor (default: LiveStockPredictor)
+        """
+        settings = config.LIVE_SETTINGS
+        self.max_idle = settings['max_idle_predictors'] if max_idle is None else max_idle
+        self.session_timeout = session_timeout or settings['session_timeout_seconds']
+        self.factory = factory or (lambda symbol, period: LiveStockPredictor(
+            symbol=symbol, period=period, update_interval=settings['update_interval_seconds']))
+        self._lock = threading.Lock()
+        self._predictors = {}        # (symbol, period) -> predictor
+        self._refcounts = {}         # (symbol, period) -> number of sessions watching it
+        self._idle = OrderedDict()   # unwatched keys, least recently used first
+        self._sessions = {}          # session id -> (key, last seen)
+    
+    def acquire(self, session, symbol, period):
+        """
+        Point a session at the predictor for (symbol, period), creating and starting it if needed
+        
+        Returns:
+            LiveStockPredictor: The shared predictor
+        """
+        key = (symbol, period)
+        with self._lock:
+            previous = self._sessions.get(session)
+            if previous is not None and previous[0] == key:
+                self._sessions[session] = (key, time.monotonic())
+                return self._predictors[key]
+            if previous is not None:
+                self._release(previous[0])
+            predictor = self._predictors.get(key)
+            if predictor is None:
+                predictor = self._predictors[key] = self.factory(symbol, period)
+                predictor.start()
+            self._refcounts[key] = self._refcounts.get(key, 0) + 1
+            self._idle.pop(key, None)
+            self._sessions[session] = (key, time.monotonic())
+            stopped = self._evict()
+        for p in stopped:
+            p.stop(timeout=0)
+        return predictor
+    
+    def get(self, session):
+        """The session's predictor (None if it has none), marking the session as alive"""
+        with self._lock:
+            entry = self._sessions.get(session)
+            if entry is None:
+                return None
+            self._sessions[session] = (entry[0], time.monotonic())
+            return self._predictors[entry[0]]
+    
+    def release(self, session):
+        """Stop watching for a session; its predictor idles once no session watches it"""
+        with self._lock:
+            entry = self._sessions.pop(session, None)
+            if entry is not None:
+                self._release(entry[0])
+            stopped = self._evict()
+        for p in stopped:
+            p.stop(timeout=0)
+    
+    def expire(self):
+        """Release every session that has not polled within session_timeout"""
+        cutoff = time.monotonic() - self.session_timeout
+        with self._lock:
+            stale = [s for s, (_, seen) in self._sessions.items() if seen < cutoff]
+        for session in stale:
+            self.release(session)
+    
+    def stats(self):
+        """Number of sessions watching each predictor, and the idle predictors"""
+        with self._lock:
+            return {'watched': dict(self._refcounts), 'idle': list(self._idle)}
+    
+    def _release(self, key):
+        # caller holds the lock
+        self._refcounts[key] -= 1
+        if self._refcounts[key] == 0:
+            del self._refcounts[key]
+            self._idle[key] = True
+    
+    def _evict(self):
+        """Drop least recently used idle predictors beyond max_idle; caller holds the lock"""
+        stopped = []
+        while len(self._idle) > self.max_idle:
+            key, _ = self._idle.popitem(last=False)
+            stopped.append(self._predictors.pop(key))
+        return stopped
+
 # Initialize Dash app
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
 app.title = "Live Stock Price Predictor"
 
 # App layout
-app.layout = dbc.Container([
+base_layout = dbc.Container([
     dbc.Row([
         dbc.Col([
             html.H1("📈 Live Stock Price Predictor", 
@@ -285,67 +578,93 @@ app.layout = dbc.Container([
     ),
     
     # Store for predictor instance
-    dcc.Store(id='predictor-store')
+    dcc.Store(id='predictor-store'),
+    
+    # What the browser's chart holds, so only new points are sent
+    dcc.Store(id='chart-state')
     
 ], fluid=True)
 
-# Global predictor instance
-predictor = None
+def serve_layout():
+    """Layout for each page load, with its own session id"""
+    return html.Div([base_layout, dcc.Store(id='session-id', data=str(uuid.uuid4()))])
+
+app.layout = serve_layout
+
+# Predictors shared by all sessions
+pool = PredictorPool()
 
 @app.callback(
     Output('predictor-store', 'data'),
     [Input('symbol-dropdown', 'value'),
-     Input('period-dropdown', 'value')]
+     Input('period-dropdown', 'value')],
+    [dash.dependencies.State('session-id', 'data')]
 )
-def update_predictor(symbol, period):
-    """Update predictor when symbol or period changes"""
-    global predictor
-    predictor = LiveStockPredictor(symbol=symbol, period=period)
+def update_predictor(symbol, period, session_id):
+    """Point this session at the shared predictor when symbol or period changes"""
+    pool.acquire(session_id, symbol, period)
     return {'symbol': symbol, 'period': period}
 
 @app.callback(
     [Output('prediction-display', 'children'),
      Output('price-display', 'children'),
      Output('model-status', 'children'),
-     Output('live-chart', 'figure')],
+     Output('live-chart', 'figure'),
+     Output('live-chart', 'extendData'),
+     Output('chart-state', 'data')],
     [Input('update-button', 'n_clicks'),
      Input('train-button', 'n_clicks'),
      Input('interval-component', 'n_intervals')],
-    [dash.dependencies.State('predictor-store', 'data')]
+    [dash.dependencies.State('predictor-store', 'data'),
+     dash.dependencies.State('session-id', 'data'),
+     dash.dependencies.State('chart-state', 'data')]
 )
-def update_dashboard(update_clicks, train_clicks, n_intervals, predictor_data):
-    """Update dashboard components"""
-    global predictor
+def update_dashboard(update_clicks, train_clicks, n_intervals, predictor_data, session_id, chart_state):
+    """Update dashboard components from the predictor's latest snapshot"""
+    pool.expire()
+    predictor = pool.get(session_id)
+    if predictor is None and predictor_data:
+        # e.g. the session timed out while the tab was in the background
+        predictor = pool.acquire(session_id, predictor_data['symbol'], predictor_data['period'])
     
     if predictor is None:
-        return "No predictor", "No data", "Not initialized", go.Figure()
+        return "No predictor", "No data", "Not initialized", go.Figure(), dash.no_update, None
     
-    # Update data if update button was clicked
+    # Hand button clicks to the serving thread, the callback never waits for them
     ctx = dash.callback_context
     if ctx.triggered:
         trigger_id = ctx.triggered[0]['prop_id'].split('.')[0]
         if trigger_id == 'update-button':
-            predictor.fetch_data()
-            predictor.create_features()
+            predictor.request('update')
         elif trigger_id == 'train-button':
-            predictor.train_model()
+            predictor.request('train')
+    
+    snapshot = predictor.snapshot()
+    if snapshot is None:
+        loading = dbc.Alert("⏳ Loading...", color="info")
+        return loading, loading, loading, go.Figure(), dash.no_update, None
     
     # Get live prediction
-    prediction = predictor.get_live_prediction()
+    prediction = snapshot['prediction']
     
     # Prediction display
     if prediction:
         direction_color = "success" if prediction['direction'] == "UP" else "danger"
-        prediction_display = dbc.Alert([
+        prediction_display = [dbc.Alert([
             html.H3(f"{prediction['direction']}", className="mb-0"),
             html.P(f"Confidence: {prediction['confidence']:.1f}%", className="mb-0")
-        ], color=direction_color, className="text-center")
+        ], color=direction_color, className="text-center")]
+        horizons = snapshot['horizons']
+        if horizons is not None and len(horizons) > 0:
+            prediction_display.append(html.Small(" • ".join(
+                f"{h}d: {d} {p:.0%}" for h, d, p in zip(horizons['horizon'], horizons['direction'], horizons['prob_up'])
+            ), className="text-muted"))
     else:
         prediction_display = dbc.Alert("No prediction available", color="warning")
     
     # Price display
-    current_price = predictor.get_current_price()
-    price_change = predictor.get_price_change()
+    current_price = snapshot['current_price']
+    price_change = snapshot['price_change']
     
     if current_price:
         change_color = "success" if price_change and price_change >= 0 else "danger"
@@ -359,15 +678,24 @@ def update_dashboard(update_clicks, train_clicks, n_intervals, predictor_data):
         price_display = dbc.Alert("No price data", color="warning")
     
     # Model status
-    if predictor.model is not None:
+    if snapshot['model_trained']:
         model_status = dbc.Alert("✅ Model Trained", color="success")
     else:
         model_status = dbc.Alert("❌ Model Not Trained", color="danger")
     
-    # Chart
-    chart_figure = predictor.create_live_chart()
+    # Chart: the full figure when the browser holds another one, otherwise only new points
+    chart_key = [predictor.symbol, predictor.period, snapshot['chart_version']]
+    chart_figure, chart_extend = dash.no_update, dash.no_update
+    if chart_state is None or chart_state['key'] != chart_key:
+        chart_figure = snapshot['figure']
+        chart_state = {'key': chart_key, 'last': snapshot['chart_last']}
+    elif chart_state['last'] is not None and snapshot['data'] is not None and len(snapshot['data']) > 0:
+        data = snapshot['data']
+        if data.index[-1].isoformat() != chart_state['last']:
+            chart_extend = chart_extension(data, chart_state['last']) or dash.no_update
+            chart_state = {'key': chart_key, 'last': data.index[-1].isoformat()}
     
-    return prediction_display, price_display, model_status, chart_figure
+    return prediction_display, price_display, model_status, chart_figure, chart_extend, chart_state
 
 def run_live_dashboard(host='127.0.0.1', port=8050, debug=True):
     """Run the live dashboard"""
@@ -0,0 +1,158 @@
+"""
+Model Store for Stock Price Predictor
+Keeps trained models on disk so a new process can load them instead of retraining
+"""
+
+import os
+import json
+import time
+import hashlib
+from datetime import datetime
+
+import joblib
+import pandas as pd
+import sklearn
+
+import config
+
+
+def model_key(symbol, period, feature_params, model_params):
+    """
+    Identify the models that are interchangeable: same symbol and period, and a
+    hash of everything that changes the features or the model
+
+    Returns:
+        str: e.g. 'AAPL_2y_3f9c2a1b7d04'
+    """
+    spec = json.dumps({'features': feature_params, 'model': model_params}, sort_keys=True, default=str)
+    digest = hashlib.sha256(spec.encode()).hexdigest()[:12]
+    return f"{symbol.upper()}_{period}_{digest}"
+
+
+class ModelStore:
+    """
+    Versioned on-disk registry of trained models.
+
+    Every save writes a new version under <directory>/<key>/: the model as a
+    joblib file (uncompressed, so its arrays can be memory-mapped on load) and a
+    JSON file with the data range, accuracy and library versions it was made with.
+    Only the newest max_versions versions per key are kept.
+    """
+
+    def __init__(self, directory=None, max_versions=None, reuse_days=None):
+        """
+        Initialize the model store
+
+        Args:
+            directory (str): Where to keep the models (default: from config)
+            max_versions (int): Versions kept per key (default: from config)
+            reuse_days (int): A stored model is reused for data up to this many
+                              days newer than the data it was trained on (default: from config)
+        """
+        settings = config.MODEL_STORE_SETTINGS
+        self.directory = directory or settings['directory']
+        self.max_versions = max_versions or settings['max_versions']
+        self.reuse_days = settings['reuse_days'] if reuse_days is None else reuse_days
+        os.makedirs(self.directory, exist_ok=True)
+
+    def versions(self, key):
+        """
+        Metadata of every stored version of a key, newest first
+
+        Returns:
+            list: metadata dicts, each with a 'version' entry
+        """
+        folder = os.path.join(self.directory, key)
+        if not os.path.isdir(folder):
+            return []
+        metas = []
+        for name in os.listdir(folder):
+            if not name.endswith('.json'):
+                continue
+            with open(os.path.join(folder, name)) as f:
+                metas.append(json.load(f))
+        return sorted(metas, key=lambda m: m['version'], reverse=True)
+
+    def save(self, key, model, data_end, accuracy=None, feature_columns=None, held_out=None):
+        """
+        Store a trained model as a new version
+
+        Args:
+            held_out: Timestamps of the rows the model was evaluated on and never fitted with
+
+        Returns:
+            str: The new version
+        """
+        folder = os.path.join(self.directory, key)
+        os.makedirs(folder, exist_ok=True)
+        # one clock reading, so the fraction can't belong to a different second
+        version = datetime.now().strftime('%Y%m%dT%H%M%S.%f')
+        meta = {
+            'version': version,
+            'data_end': pd.Timestamp(data_end).isoformat(),
+            'accuracy': accuracy,
+            'feature_columns': list(feature_columns or []),
+            'held_out': None if held_out is None else [pd.Timestamp(t).isoformat() for t in held_out],
+            'sklearn_version': sklearn.__version__,
+            'saved_at': time.time(),
+        }
+        path = os.path.join(folder, version)
+        # the model goes first: a version only exists once its metadata file does
+        joblib.dump(model, path + '.joblib.tmp')
+        os.replace(path + '.joblib.tmp', path + '.joblib')
+        with open(path + '.json.tmp', 'w') as f:
+            json.dump(meta, f)
+        os.replace(path + '.json.tmp', path + '.json')
+        self.prune(key)
+        return version
+
+    def load(self, key, data_end=None, version=None, mmap=True):
+        """
+        Load a stored model
+
+        Args:
+            key (str): From model_key()
+            data_end: Newest bar the model will predict from; versions trained on data
+                      more than reuse_days older are skipped (default: accept any)
+            version (str): A specific version (default: the newest usable one)
+            mmap (bool): Memory-map the model's arrays instead of reading them
+
+        Returns:
+            tuple: (model, metadata), or (None, None) if no usable version exists
+        """
+        for meta in self.versions(key):
+            if version is not None and meta['version'] != version:
+                continue
+            if meta['sklearn_version'] != sklearn.__version__:
+                continue
+            if data_end is not None:
+                age = pd.Timestamp(data_end) - pd.Timestamp(meta['data_end'])
+                if age > pd.Timedelta(days=self.reuse_days):
+                    continue
+            path = os.path.join(self.directory, key, meta['version'] + '.joblib')
+            try:
+                return joblib.load(path, mmap_mode='r' if mmap else None), meta
+            except (OSError, EOFError, ValueError) as e:
+                print(f"Error loading model {key}/{meta['version']}: {e}")
+        return None, None
+
+    def prune(self, key):
+        """Delete all but the newest max_versions versions of a key"""
+        for meta in self.versions(key)[self.max_versions:]:
+            base = os.path.join(self.directory, key, meta['version'])
+            for path in (base + '.json', base + '.joblib'):
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+_default_store = None
+
+
+def default_model_store():
+    """The shared store configured in config.MODEL_STORE_SETTINGS, or None if it is disabled"""
+    global _default_store
+    if not config.MODEL_STORE_SETTINGS['enabled']:
+        return None
+    if _default_store is None:
+        _default_store = ModelStore()
+    return _default_store
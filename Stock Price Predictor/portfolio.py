@@ -0,0 +1,149 @@
+"""
+Portfolio Runner for Stock Price Predictor
+Fetches data, builds features and trains a model for many symbols concurrently
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+import pandas as pd
+
+from stock_predictor import StockPredictor
+import config
+
+
+def _train_predictor(predictor, keep_model=False):
+    """
+    Create features, train and predict for one fetched predictor.
+    Runs in a worker process, so it must stay a module-level function.
+
+    Returns:
+        tuple: (row dict for the prediction table, trained predictor or None)
+    """
+    row = {'symbol': predictor.symbol, 'rows': len(predictor.data)}
+    try:
+        if not predictor.create_features():
+            raise ValueError("could not create features")
+        if not predictor.train_model():
+            raise ValueError("could not train model")
+        prediction = predictor.predict_next_day()
+        row.update({
+            'direction': prediction['direction'],
+            'confidence': prediction['confidence'],
+            'prob_up': prediction['probabilities'][-1],
+            'accuracy': predictor.accuracy,
+            'last_close': predictor.data['Close'].iloc[-1],
+        })
+    except Exception as e:
+        row['error'] = str(e)
+        return row, None
+    return row, predictor if keep_model else None
+
+
+class PortfolioRunner:
+    """Runs the fetch -> features -> train -> predict pipeline over many symbols"""
+
+    def __init__(self, symbols=None, period='2y', fetch_workers=None, train_workers=None,
+                 keep_models=False, verbose=True):
+        """
+        Initialize the Portfolio Runner
+
+        Args:
+            symbols (list): Stock symbols (default: config.POPULAR_STOCKS)
+            period (str): Time period for data collection (default: 2y)
+            fetch_workers (int): Threads used for downloading (default: from config)
+            train_workers (int): Processes used for training (default: one per CPU)
+            keep_models (bool): Keep the trained predictors in self.predictors (default: False)
+            verbose (bool): Print progress (default: True)
+        """
+        settings = config.PORTFOLIO_SETTINGS
+        self.symbols = list(symbols or config.POPULAR_STOCKS)
+        self.period = period
+        self.fetch_workers = fetch_workers or settings['fetch_workers']
+        self.train_workers = train_workers or settings['train_workers'] or os.cpu_count()
+        self.keep_models = keep_models
+        self.verbose = verbose
+        self.predictors = {}
+        self.results = None
+
+    def _log(self, *args):
+        """Print progress output unless the runner is running quietly"""
+        if self.verbose:
+            print(*args)
+
+    def fetch_all(self):
+        """
+        Download data for every symbol on a thread pool (the work is network bound)
+
+        Returns:
+            tuple: (list of predictors with data, dict of symbol -> error message)
+        """
+        def fetch(symbol):
+            predictor = StockPredictor(symbol=symbol, period=self.period, verbose=False)
+            # symbols already train side by side, one core per forest avoids oversubscription
+            predictor.model_params['n_jobs'] = 1
+            ok = predictor.fetch_data() and predictor.data is not None and len(predictor.data) > 0
+            return predictor, ok
+
+        fetched, failed = [], {}
+        with ThreadPoolExecutor(max_workers=self.fetch_workers) as pool:
+            for predictor, ok in pool.map(fetch, self.symbols):
+                if ok:
+                    fetched.append(predictor)
+                else:
+                    failed[predictor.symbol] = "no data fetched"
+        return fetched, failed
+
+    def train_all(self, predictors):
+        """
+        Train and predict for every fetched predictor on a process pool (the work is CPU bound)
+
+        Returns:
+            list: one row dict per predictor
+        """
+        rows = []
+        with ProcessPoolExecutor(max_workers=self.train_workers) as pool:
+            futures = [pool.submit(_train_predictor, p, self.keep_models) for p in predictors]
+            for future in futures:
+                row, predictor = future.result()
+                rows.append(row)
+                if predictor is not None:
+                    self.predictors[predictor.symbol] = predictor
+        return rows
+
+    def run(self):
+        """
+        Run the full pipeline over all symbols
+
+        Returns:
+            pd.DataFrame: one row per symbol, sorted by prediction confidence
+        """
+        self._log(f"Running portfolio of {len(self.symbols)} symbols ({self.period})...")
+        start = time.perf_counter()
+
+        fetched, failed = self.fetch_all()
+        self._log(f"Fetched {len(fetched)} symbols in {time.perf_counter() - start:.1f}s")
+
+        rows = self.train_all(fetched)
+        rows += [{'symbol': symbol, 'error': error} for symbol, error in failed.items()]
+
+        columns = ['symbol', 'direction', 'confidence', 'prob_up', 'accuracy', 'last_close', 'rows', 'error']
+        results = pd.DataFrame(rows).reindex(columns=columns)
+        self.results = results.sort_values('confidence', ascending=False, na_position='last').reset_index(drop=True)
+
+        self._log(f"Finished in {time.perf_counter() - start:.1f}s")
+        return self.results
+
+
+def main():
+    """Run the portfolio over the popular stocks"""
+    period = input("Enter time period (1y, 2y, 5y, max) (default: 2y): ").strip() or '2y'
+    runner = PortfolioRunner(period=period)
+    results = runner.run()
+    print()
+    print(results.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
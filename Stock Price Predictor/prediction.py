@@ -0,0 +1,207 @@
+"""
+Multi-Horizon Prediction for Stock Price Predictor
+Calibrated up/down probabilities for several horizons and many symbols in one batched call
+"""
+
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.isotonic import IsotonicRegression
+from sklearn.linear_model import LogisticRegression
+
+from fast_forest import FlatForest
+import config
+
+PREDICTION_COLUMNS = ['symbol', 'horizon', 'direction', 'prob_up', 'raw_prob_up', 'confidence', 'as_of']
+
+
+def horizon_target(close, horizon):
+    """
+    Direction of the close `horizon` rows later: 1.0 up, 0.0 down, NaN where it is not known yet
+    """
+    close = np.asarray(close, dtype=np.float64)
+    target = np.full(len(close), np.nan)
+    if horizon < len(close):
+        target[:-horizon] = (close[horizon:] > close[:-horizon]).astype(np.float64)
+    return target
+
+
+class HorizonModel:
+    """
+    A forest predicting the direction `horizon` days ahead, and the map from its raw
+    probability of UP to a calibrated one.
+
+    'sigmoid' (Platt scaling) fits a logistic curve to the raw probabilities and
+    suits the few hundred calibration rows of a daily history; 'isotonic' fits a
+    monotonic step function and needs more data. None leaves probabilities raw.
+    """
+
+    def __init__(self, horizon, model, method=None, calibration=None, accuracy=None, brier=None):
+        self.horizon = horizon
+        self.model = model
+        self.method = method
+        self.calibration = calibration
+        self.accuracy = accuracy
+        self.brier = brier
+        self._flat = None
+
+    @property
+    def flat(self):
+        """The forest flattened for fast inference (built on first use)"""
+        if self._flat is None:
+            self._flat = FlatForest(self.model)
+        return self._flat
+
+    def __getstate__(self):
+        # the flattened forest is rebuilt on demand, keep it out of pickles
+        return {**self.__dict__, '_flat': None}
+
+    def calibrate(self, raw):
+        """Calibrated probabilities of UP for raw forest probabilities"""
+        raw = np.asarray(raw, dtype=np.float64)
+        if self.method == 'sigmoid':
+            coef, intercept = self.calibration
+            return 1 / (1 + np.exp(-(coef * raw + intercept)))
+        if self.method == 'isotonic':
+            x, y = self.calibration
+            return np.interp(raw, x, y)
+        return raw
+
+
+def fit_horizon_model(features, close, horizon, model_params=None, method=None, calibration_size=None,
+                      evaluation_size=None):
+    """
+    Train and calibrate the model for one horizon.
+
+    The rows are split in time: the forest trains on the oldest part, the
+    calibration is fitted on the next part, and accuracy and Brier score are
+    measured on the newest part, which neither has seen. The last `horizon` rows
+    before each boundary are left out, because their targets would look into the
+    next part.
+
+    Args:
+        features (np.ndarray): (rows, features) feature matrix in time order
+        close (np.ndarray): Close price of every row
+        horizon (int): Days ahead to predict
+        model_params (dict): RandomForestClassifier parameters (default: config.MODEL_PARAMS)
+        method (str): 'sigmoid', 'isotonic' or None (default: from config)
+        calibration_size (float): Fraction of rows used for calibration and evaluation (default: from config)
+        evaluation_size (float): Part of those rows used for evaluation (default: from config)
+
+    Returns:
+        HorizonModel
+    """
+    settings = config.PREDICTION_SETTINGS
+    method = settings['calibration'] if method is None else method
+    calibration_size = calibration_size or settings['calibration_size']
+    evaluation_size = evaluation_size or settings['evaluation_size']
+    target = horizon_target(close, horizon)
+    n = int((~np.isnan(target)).sum())  # only the last rows lack a target
+    split = int(n * (1 - calibration_size))
+    evaluate_from = split + int((n - split) * (1 - evaluation_size))
+    train = slice(0, max(split - horizon, 0))
+    calibration = slice(split, max(evaluate_from - horizon, split))
+    evaluation = slice(evaluate_from, n)
+    y_train = target[train]
+    if len(np.unique(y_train)) < 2:
+        raise ValueError(f"not enough history to train a {horizon} day model")
+
+    model = RandomForestClassifier(**(model_params or config.MODEL_PARAMS))
+    model.fit(features[train], y_train.astype(int))
+    result = HorizonModel(horizon, model)
+
+    y_cal = target[calibration]
+    if method and len(np.unique(y_cal)) == 2:
+        raw = result.flat.predict_proba(features[calibration])[:, 1]
+        if method == 'sigmoid':
+            platt = LogisticRegression().fit(raw.reshape(-1, 1), y_cal.astype(int))
+            result.calibration = (float(platt.coef_[0, 0]), float(platt.intercept_[0]))
+        elif method == 'isotonic':
+            iso = IsotonicRegression(y_min=0, y_max=1, out_of_bounds='clip').fit(raw, y_cal)
+            result.calibration = (iso.X_thresholds_, iso.y_thresholds_)
+        else:
+            raise ValueError(f"Unknown calibration method: {method}")
+        result.method = method
+
+    y_eval = target[evaluation]
+    if len(y_eval) > 0:
+        prob = result.calibrate(result.flat.predict_proba(features[evaluation])[:, 1])
+        result.accuracy = float(((prob > 0.5) == y_eval).mean())
+        result.brier = float(((prob - y_eval) ** 2).mean())
+    return result
+
+
+# combined forests of recently used model sets, so repeated calls skip concatenating;
+# the models are held weakly, so a refit frees the old set's entry
+_combined = OrderedDict()
+_combined_lock = threading.Lock()
+_COMBINED_MAX = 16
+
+
+def _combined_forest(models):
+    key = tuple(id(m) for m in models)
+    with _combined_lock:
+        for stale in [k for k, (refs, _) in _combined.items() if any(r() is None for r in refs)]:
+            del _combined[stale]
+        entry = _combined.get(key)
+        # ids can be reused by new objects, so also check the models are the same ones
+        if entry is None or any(r() is not m for r, m in zip(entry[0], models)):
+            entry = ([weakref.ref(m) for m in models], FlatForest.concat([m.flat for m in models]))
+            _combined[key] = entry
+            if len(_combined) > _COMBINED_MAX:
+                _combined.popitem(last=False)
+        _combined.move_to_end(key)
+        return entry[1]
+
+
+def predict_horizons(predictors, horizons=None):
+    """
+    Calibrated direction probabilities of many symbols over several horizons.
+
+    Every (symbol, horizon) model is evaluated on its symbol's current features in
+    one pass over the trees of all of them; nothing is retrained or copied into
+    DataFrames on the way. Predictors need horizon models (train_horizons()).
+
+    Args:
+        predictors: A StockPredictor or a list of them
+        horizons (list): Horizons in trading days (default: from config)
+
+    Returns:
+        pd.DataFrame: One row per symbol and horizon with the direction, calibrated and
+                      raw probability of UP, confidence (%) and the bar predicted from
+    """
+    if not isinstance(predictors, (list, tuple)):
+        predictors = [predictors]
+    horizons = horizons or config.PREDICTION_SETTINGS['horizons']
+
+    rows, stamps, entries = [], [], []
+    for predictor in predictors:
+        current = predictor.current_features()
+        if current is None or not predictor.horizon_models:
+            continue
+        timestamp, values = current
+        for h in horizons:
+            if h in predictor.horizon_models:
+                entries.append((predictor.symbol, h, len(rows), predictor.horizon_models[h]))
+        rows.append(values)
+        stamps.append(timestamp)
+    if not entries:
+        return pd.DataFrame(columns=PREDICTION_COLUMNS)
+
+    models = [e[3] for e in entries]
+    row_of = np.array([e[2] for e in entries])
+    raw = _combined_forest(models).group_proba(np.vstack(rows), row_of)[:, 1]
+    prob = np.array([m.calibrate(r) for m, r in zip(models, raw)])
+    return pd.DataFrame({
+        'symbol': [e[0] for e in entries],
+        'horizon': [e[1] for e in entries],
+        'direction': np.where(prob > 0.5, 'UP', 'DOWN'),
+        'prob_up': prob,
+        'raw_prob_up': raw,
+        'confidence': np.maximum(prob, 1 - prob) * 100,
+        'as_of': [stamps[r] for r in row_of],
+    })
@@ -0,0 +1,213 @@
+"""
+Async Quote Fetcher for Stock Price Predictor
+Fetches recent bars for many symbols concurrently, in batches, with retries and request coalescing
+"""
+
+import asyncio
+import threading
+
+import pandas as pd
+import yfinance as yf
+
+import config
+
+
+class YFinanceTransport:
+    """Downloads bars from Yahoo Finance, many symbols per request"""
+
+    async def fetch(self, symbols, interval, period):
+        """
+        Bars for several symbols
+
+        Returns:
+            dict: symbol -> DataFrame (symbols without data may be missing)
+        """
+        loop = asyncio.get_running_loop()
+        # yfinance is blocking, so it runs on the loop's thread pool
+        return await loop.run_in_executor(None, self._download, list(symbols), interval, period)
+
+    @staticmethod
+    def _download(symbols, interval, period):
+        df = yf.download(tickers=symbols, period=period, interval=interval, group_by='ticker',
+                         auto_adjust=True, progress=False, threads=False)
+        if not isinstance(df.columns, pd.MultiIndex):
+            return {symbols[0]: df}
+        return {s: df[s].dropna(how='all') for s in symbols if s in df.columns.get_level_values(0)}
+
+
+class SourceTransport:
+    """
+    Fetches through any object with the data_cache history() method (CSVSource,
+    ReplaySource, a stand-in for Yahoo in tests...) or an OHLCVCache, one symbol at a time
+    """
+
+    def __init__(self, source):
+        self.source = source
+
+    async def fetch(self, symbols, interval, period):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._fetch, list(symbols), interval, period)
+
+    def _fetch(self, symbols, interval, period):
+        if hasattr(self.source, 'history'):
+            return {s: self.source.history(s, interval=interval, period=period) for s in symbols}
+        return {s: self.source.get(s, period=period, interval=interval) for s in symbols}
+
+
+class QuoteFetcher:
+    """
+    Concurrent fetcher of recent bars for many symbols.
+
+    Requests made within batch_window seconds of each other are sent together,
+    up to batch_size symbols per transport call, with at most max_concurrency calls
+    in flight. Callers asking for a symbol that is already being fetched share that
+    request instead of sending another one. Failed calls are retried with
+    exponential backoff.
+
+    Use the async methods (get, get_many) from your own event loop, or the blocking
+    ones (fetch, fetch_many) from any thread: they run on a private loop, so
+    concurrent threads, e.g. the live predictors' serving threads, are batched and
+    coalesced together.
+    """
+
+    def __init__(self, transport=None, max_concurrency=None, batch_size=None, batch_window=None,
+                 retries=None, backoff=None):
+        """
+        Initialize the quote fetcher
+
+        Args:
+            transport: Object with an async fetch(symbols, interval, period) method
+                       returning symbol -> DataFrame (default: YFinanceTransport)
+            max_concurrency (int): Transport calls in flight at once
+            batch_size (int): Symbols per transport call
+            batch_window (float): Seconds to wait for more symbols before sending a batch
+            retries (int): Retries of a failed transport call
+            backoff (float): Seconds before the first retry, doubled for every further one
+        All defaults not listed come from config.QUOTE_SETTINGS.
+        """
+        settings = config.QUOTE_SETTINGS
+        self.transport = transport or YFinanceTransport()
+        self.max_concurrency = max_concurrency or settings['max_concurrency']
+        self.batch_size = batch_size or settings['batch_size']
+        self.batch_window = settings['batch_window_seconds'] if batch_window is None else batch_window
+        self.retries = settings['retries'] if retries is None else retries
+        self.backoff = settings['backoff_seconds'] if backoff is None else backoff
+        self.requests = 0      # transport calls made, including retries
+        self._loop = None      # the loop the async state below belongs to
+        self._inflight = {}    # (symbol, interval, period) -> future of its bars
+        self._pending = {}     # (interval, period) -> symbols waiting for the next batch
+        self._semaphore = None
+        self._thread = None
+        self._thread_loop = None
+        self._thread_lock = threading.Lock()
+
+    def _bind(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is None:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        elif self._loop is not loop:
+            raise RuntimeError("QuoteFetcher is already used by another event loop")
+        return loop
+
+    async def get(self, symbol, interval='1m', period='5d'):
+        """
+        Recent bars of one symbol
+
+        Returns:
+            pd.DataFrame: The bars, empty if the transport had none for the symbol
+        """
+        loop = self._bind()
+        key = (symbol, interval, period)
+        future = self._inflight.get(key)
+        if future is None:
+            future = self._inflight[key] = loop.create_future()
+            pending = self._pending.setdefault((interval, period), [])
+            pending.append(symbol)
+            if len(pending) >= self.batch_size:
+                self._flush(interval, period)
+            elif len(pending) == 1:
+                loop.call_later(self.batch_window, self._flush, interval, period)
+        # shield: one caller giving up must not cancel the request for the others
+        return await asyncio.shield(future)
+
+    async def get_many(self, symbols, interval='1m', period='5d'):
+        """
+        Recent bars of several symbols
+
+        Returns:
+            dict: symbol -> DataFrame, or the exception that fetching it raised
+        """
+        results = await asyncio.gather(*(self.get(s, interval, period) for s in symbols),
+                                       return_exceptions=True)
+        return dict(zip(symbols, results))
+
+    def _flush(self, interval, period):
+        """Send the symbols waiting for (interval, period) as batches"""
+        symbols = self._pending.pop((interval, period), [])
+        for i in range(0, len(symbols), self.batch_size):
+            self._loop.create_task(self._run_batch(symbols[i:i + self.batch_size], interval, period))
+
+    async def _run_batch(self, symbols, interval, period):
+        result, error = None, None
+        async with self._semaphore:
+            for attempt in range(self.retries + 1):
+                try:
+                    self.requests += 1
+                    result = await self.transport.fetch(symbols, interval, period)
+                    break
+                except Exception as e:
+                    error = e
+                    if attempt < self.retries:
+                        await asyncio.sleep(self.backoff * 2 ** attempt)
+        for symbol in symbols:
+            future = self._inflight.pop((symbol, interval, period))
+            if future.done():
+                continue
+            if result is None:
+                future.set_exception(error)
+            else:
+                future.set_result(result.get(symbol, pd.DataFrame()))
+
+    def _run(self, coro, timeout):
+        """Run a coroutine on the private loop thread and wait for its result"""
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread_loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._thread_loop.run_forever,
+                                                name="quote-fetcher", daemon=True)
+                self._thread.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._thread_loop).result(timeout)
+
+    def fetch(self, symbol, interval='1m', period='5d', timeout=None):
+        """Blocking get(), safe to call from any thread"""
+        return self._run(self.get(symbol, interval, period), timeout)
+
+    def fetch_many(self, symbols, interval='1m', period='5d', timeout=None):
+        """Blocking get_many(), safe to call from any thread"""
+        return self._run(self.get_many(list(symbols), interval, period), timeout)
+
+    def close(self):
+        """Stop the private loop thread, if the blocking methods started one"""
+        with self._thread_lock:
+            if self._thread is not None:
+                self._thread_loop.call_soon_threadsafe(self._thread_loop.stop)
+                self._thread.join()
+                self._thread_loop.close()
+                if self._loop is self._thread_loop:
+                    self._loop = self._semaphore = None
+                    self._inflight, self._pending = {}, {}
+                self._thread = self._thread_loop = None
+
+
+_default_fetcher = None
+
+
+def default_quote_fetcher():
+    """The shared fetcher configured in config.QUOTE_SETTINGS, or None if it is disabled"""
+    global _default_fetcher
+    if not config.QUOTE_SETTINGS['enabled']:
+        return None
+    if _default_fetcher is None:
+        _default_fetcher = QuoteFetcher()
+    return _default_fetcher
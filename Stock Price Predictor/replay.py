@@ -0,0 +1,193 @@
+"""
+Market Data Replay for Stock Price Predictor
+Streams stored OHLCV bars on a simulated clock, for offline development and load tests
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_cache import period_start, CSVSource, default_cache
+import config
+
+
+class ReplaySource:
+    """
+    Serves stored bars as if they were arriving live.
+
+    The replay clock starts at `start` and runs `speed` times faster than real time;
+    history() only returns bars up to the clock, so a LiveStockPredictor using this
+    source (live_source=...) sees the market unfold bar by bar. With speed=0 the
+    clock only moves through advance(), which makes runs reproducible.
+    It has the same history() method as the data_cache sources.
+    """
+
+    def __init__(self, frames=None, source=None, interval='1m', period='5d', speed=None,
+                 start=None, warmup_bars=None, loop=False):
+        """
+        Initialize the replay
+
+        Args:
+            frames (dict): symbol -> OHLCV DataFrame to replay
+            source: Where to load symbols missing from frames, an object with a
+                    history(symbol, interval, start, end, period) method
+                    (default: the configured cache, or CSVSource of the offline directory)
+            interval (str): Interval of the replayed bars
+            period (str): History loaded per symbol from the source
+            speed (float): Simulated seconds per real second (default: from config, 0 = manual clock)
+            start: Replay start time (default: after the first warmup_bars bars of the first symbol)
+            warmup_bars (int): Bars visible when the replay starts (default: from config)
+            loop (bool): Start over when the clock passes the last bar
+        """
+        settings = config.REPLAY_SETTINGS
+        self.frames = dict(frames or {})
+        if source is None and not self.frames:
+            offline = config.CACHE_SETTINGS.get('offline_directory')
+            source = CSVSource(offline) if offline else default_cache()
+        self.source = source
+        self.interval = interval
+        self.period = period
+        self.speed = settings['speed'] if speed is None else speed
+        self.warmup_bars = settings['warmup_bars'] if warmup_bars is None else warmup_bars
+        self.loop = loop
+        self._start = None if start is None else pd.Timestamp(start)
+        self._offset = pd.Timedelta(0)
+        self._real_start = time.monotonic()
+
+    def _frame(self, symbol):
+        if symbol not in self.frames:
+            if self.source is None:
+                raise KeyError(f"No replay data for {symbol}")
+            if hasattr(self.source, 'history'):
+                df = self.source.history(symbol, interval=self.interval, period=self.period)
+            else:
+                df = self.source.get(symbol, period=self.period, interval=self.interval)
+            self.frames[symbol] = df.sort_index()
+        return self.frames[symbol]
+
+    @property
+    def start(self):
+        """Simulated time at which the replay started"""
+        if self._start is None:
+            df = self._frame(next(iter(self.frames))) if self.frames else None
+            if df is None or len(df) == 0:
+                raise ValueError("Nothing to replay; pass frames or a start time")
+            self._start = df.index[min(self.warmup_bars, len(df) - 1)]
+        return self._start
+
+    def now(self):
+        """Current simulated time"""
+        elapsed = pd.Timedelta(0)
+        if self.speed:
+            elapsed = pd.Timedelta(seconds=(time.monotonic() - self._real_start) * self.speed)
+        return self.start + self._offset + elapsed
+
+    def advance(self, seconds):
+        """Move the simulated clock forward"""
+        self._offset += pd.Timedelta(seconds=seconds)
+
+    def finished(self, symbol):
+        """True once every bar of the symbol has been replayed"""
+        df = self._frame(symbol)
+        return len(df) == 0 or self.now() >= df.index[-1]
+
+    def history(self, symbol, interval=None, start=None, end=None, period=None):
+        """
+        Bars of a symbol up to the replay clock
+
+        Args:
+            symbol (str): Stock symbol
+            interval (str): Ignored, the replay has one interval
+            start, end: Optional range, further limited by the clock
+            period (str): yfinance-style period counted back from the clock
+
+        Returns:
+            pd.DataFrame: The visible bars (never a bar after the clock)
+        """
+        df = self._frame(symbol)
+        now = self.now()
+        if self.loop and len(df) > 1 and now > df.index[-1]:
+            # wrap around: restart at the beginning once the stored bars run out
+            span = df.index[-1] - self.start
+            if span > pd.Timedelta(0):
+                now = self.start + (now - self.start) % span
+        now = _like(now, df.index)
+        stop = np.searchsorted(df.index, now, side='right')
+        if end is not None:
+            stop = min(stop, np.searchsorted(df.index, _like(end, df.index), side='left'))
+        first = 0
+        if start is None and period is not None:
+            start = period_start(period, now=now)
+        if start is not None:
+            first = np.searchsorted(df.index, _like(start, df.index), side='left')
+        return df.iloc[first:stop]
+
+
+def _like(ts, index):
+    """A timestamp comparable with the index (same timezone awareness and resolution)"""
+    ts = pd.Timestamp(ts)
+    if index.tz is not None:
+        ts = ts.tz_localize(index.tz) if ts.tzinfo is None else ts.tz_convert(index.tz)
+    elif ts.tzinfo is not None:
+        ts = ts.tz_convert(None)
+    return ts.as_unit(index.unit, round_ok=True)
+
+
+def run_replay(predictor, replay, ticks=100, step_seconds=60):
+    """
+    Drive a trained LiveStockPredictor through a replay with a manual clock and time
+    every live prediction
+
+    Args:
+        predictor (LiveStockPredictor): Predictor using the replay as live_source
+        replay (ReplaySource): The replay (its clock is advanced step_seconds per tick)
+        ticks (int): Number of predictions
+        step_seconds (float): Simulated seconds between predictions
+
+    Returns:
+        dict: Tick count, simulated span and prediction latency statistics in milliseconds
+    """
+    latencies = []
+    replay.history(predictor.symbol)  # loads the symbol, which fixes the replay start
+    start = replay.now()
+    for _ in range(ticks):
+        replay.advance(step_seconds)
+        began = time.perf_counter()
+        predictor.get_live_prediction()
+        latencies.append((time.perf_counter() - began) * 1000)
+    latencies = np.array(latencies)
+    real = latencies.sum() / 1000
+    simulated = (replay.now() - start).total_seconds()
+    return {
+        'ticks': ticks,
+        'simulated_seconds': simulated,
+        'speedup': simulated / real if real > 0 else np.inf,
+        'mean_ms': latencies.mean(),
+        'p50_ms': np.percentile(latencies, 50),
+        'p99_ms': np.percentile(latencies, 99),
+        'max_ms': latencies.max(),
+    }
+
+
+def main():
+    """Benchmark the live prediction loop against replayed bars"""
+    from live_predictor import LiveStockPredictor
+
+    symbol = input("Enter stock symbol (default: AAPL): ").strip().upper() or 'AAPL'
+    ticks = int(input("Number of ticks (default: 1000): ").strip() or 1000)
+    replay = ReplaySource(speed=0)
+    predictor = LiveStockPredictor(symbol=symbol, live_source=replay)
+    predictor.verbose = False
+    if not predictor.fetch_data() or not predictor.create_features() or not predictor.train_model():
+        print("Could not prepare the predictor.")
+        return
+    stats = run_replay(predictor, replay, ticks=ticks)
+    print(f"{stats['ticks']} ticks over {stats['simulated_seconds'] / 3600:.1f} simulated hours "
+          f"({stats['speedup']:.0f}x real time)")
+    print(f"Prediction latency: mean {stats['mean_ms']:.2f} ms, p50 {stats['p50_ms']:.2f} ms, "
+          f"p99 {stats['p99_ms']:.2f} ms, max {stats['max_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
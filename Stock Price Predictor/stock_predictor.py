@@ -3,6 +3,9 @@ Stock Price Predictor
 A basic machine learning model to predict next-day stock price trends (up/down)
 """
 
+import os
+import tempfile
+
 import yfinance as yf
 import pandas as pd
 import numpy as np
@@ -15,127 +18,389 @@ from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
 
+from data_cache import default_cache
+from streaming_features import IncrementalFeatureEngine
+from indicators import OHLCV, add_indicators, compute, feature_columns, rolling_mean
+from model_store import default_model_store, model_key
+from fast_forest import FlatForest
+from prediction import fit_horizon_model
+import config
+
+# Features used for training with the default config, in model column order
+FEATURE_COLUMNS = feature_columns(config.FEATURE_PARAMS)
+
+# Moving averages drawn on the price charts
+CHART_MA_WINDOWS = (5, 20)
+
+
+def _buffers(values):
+    """The distinct arrays behind a DataFrame's or Series' values, as id -> array"""
+    arrays = [values.to_numpy()] if isinstance(values, pd.Series) else [values[c].to_numpy() for c in values.columns]
+    buffers = {}
+    for a in arrays:
+        while isinstance(a.base, np.ndarray):
+            a = a.base
+        buffers[id(a)] = a
+    return buffers
+
+
 class StockPredictor:
-    def __init__(self, symbol='AAPL', period='2y'):
+    def __init__(self, symbol='AAPL', period='2y', verbose=True, cache=None, feature_params=None,
+                 model_store=None, compact=None):
         """
         Initialize the Stock Predictor
         
         Args:
             symbol (str): Stock symbol (default: AAPL)
             period (str): Time period for data collection (default: 2y)
+            verbose (bool): Print progress and reports (default: True)
+            cache (OHLCVCache): On-disk bar cache (default: the one from config, if enabled)
+            feature_params (dict): Indicator windows (default: config.FEATURE_PARAMS)
+            model_store (ModelStore): Where trained models are kept (default: the one from config, if enabled)
+            compact (bool): Keep features as float32 columns and drop intermediate indicator
+                            columns (default: config.MEMORY_SETTINGS)
         """
         self.symbol = symbol
         self.period = period
+        self.verbose = verbose
+        self.cache = cache if cache is not None else default_cache()
+        self.feature_params = feature_params or config.FEATURE_PARAMS
+        self.feature_columns = feature_columns(self.feature_params)
+        self.model_store = model_store if model_store is not None else default_model_store()
+        self.model_version = None
+        self.model_params = dict(config.MODEL_PARAMS)
+        self._flat_model = None
+        self.horizon_models = {}
+        self.compact = config.MEMORY_SETTINGS['compact'] if compact is None else compact
+        self._chart_data = None
         self.data = None
         self.model = None
         self.features = None
         self.target = None
+        self.accuracy = None
+        # held-out rows of the trained model, the newest row it was fitted with and its split settings
+        self.test_index = None
+        self.trained_until = None
+        self._split = (0.2, 42)
+        self.feature_engine = None
+        self.latest_bar = None
+        self._previous_bar = None
+        
+    def _log(self, *args):
+        """Print progress output unless the predictor is running quietly"""
+        if self.verbose:
+            print(*args)
         
     def fetch_data(self):
         """Fetch stock data using yfinance"""
-        print(f"Fetching data for {self.symbol}...")
+        self._log(f"Fetching data for {self.symbol}...")
         try:
-            ticker = yf.Ticker(self.symbol)
-            self.data = ticker.history(period=self.period)
-            print(f"Successfully fetched {len(self.data)} days of data")
+            if self.cache is not None:
+                self.data = self.cache.get(self.symbol, period=self.period, interval='1d')
+            else:
+                ticker = yf.Ticker(self.symbol)
+                self.data = ticker.history(period=self.period)
+            self._log(f"Successfully fetched {len(self.data)} days of data")
             return True
         except Exception as e:
-            print(f"Error fetching data: {e}")
+            self._log(f"Error fetching data: {e}")
             return False
     
     def create_features(self):
         """Create technical indicators and features"""
-        if self.data is None:
-            print("No data available. Please fetch data first.")
+        if self.data is None or len(self.data) == 0:
+            self._log("No data available. Please fetch data first.")
+            return False
+        # one bar to warm the incremental engine up on, besides the newest (provisional) one
+        if len(self.data) < 2:
+            self._log(f"Not enough data to create features ({len(self.data)} bar)")
             return False
             
-        print("Creating features...")
-        df = self.data.copy()
-        
-        # Price-based features
-        df['Price_Change'] = df['Close'].pct_change()
-        df['High_Low_Pct'] = (df['High'] - df['Low']) / df['Close']
-        df['Open_Close_Pct'] = (df['Close'] - df['Open']) / df['Open']
-        
-        # Moving averages
-        df['MA_5'] = df['Close'].rolling(window=5).mean()
-        df['MA_10'] = df['Close'].rolling(window=10).mean()
-        df['MA_20'] = df['Close'].rolling(window=20).mean()
-        
-        # Moving average ratios
-        df['MA_5_ratio'] = df['Close'] / df['MA_5']
-        df['MA_10_ratio'] = df['Close'] / df['MA_10']
-        df['MA_20_ratio'] = df['Close'] / df['MA_20']
-        
-        # Volatility
-        df['Volatility_5'] = df['Price_Change'].rolling(window=5).std()
-        df['Volatility_10'] = df['Price_Change'].rolling(window=10).std()
-        
-        # Volume features
-        df['Volume_MA_5'] = df['Volume'].rolling(window=5).mean()
-        df['Volume_ratio'] = df['Volume'] / df['Volume_MA_5']
-        
-        # RSI (Relative Strength Index)
-        delta = df['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df['RSI'] = 100 - (100 / (1 + rs))
-        
-        # Target variable: Next day price direction (1 for up, 0 for down)
-        df['Next_Day_Return'] = df['Close'].shift(-1) / df['Close'] - 1
-        df['Target'] = (df['Next_Day_Return'] > 0).astype(int)
-        
-        # Drop rows with NaN values
-        df = df.dropna()
-        
-        # Select features for training
-        feature_columns = [
-            'Price_Change', 'High_Low_Pct', 'Open_Close_Pct',
-            'MA_5_ratio', 'MA_10_ratio', 'MA_20_ratio',
-            'Volatility_5', 'Volatility_10', 'Volume_ratio', 'RSI'
-        ]
-        
-        self.features = df[feature_columns]
-        self.target = df['Target']
-        self.data = df
-        
-        print(f"Created {len(feature_columns)} features from {len(df)} data points")
+        self._log("Creating features...")
+        self._start_feature_engine(self.data)
+        if self.compact:
+            self._create_compact_features()
+        else:
+            df = self.data.copy()
+            
+            # Technical indicators for the configured windows, in one vectorized pass
+            df = add_indicators(df, self.feature_params)
+            
+            # Target variable: Next day price direction (1 for up, 0 for down)
+            df['Next_Day_Return'] = df['Close'].shift(-1) / df['Close'] - 1
+            df['Target'] = (df['Next_Day_Return'] > 0).astype(int)
+            
+            # Drop rows with NaN values
+            df = df.dropna()
+            
+            self.features = df[self.feature_columns]
+            self.target = df['Target']
+            self.data = df
+        
+        if len(self.features) == 0:
+            self._log("Not enough data to create features: every row lacks an indicator window")
+            self.features = self.target = None
+            self.feature_engine = self.latest_bar = None
+            return False
+        
+        self._log(f"Created {len(self.feature_columns)} features from {len(self.data)} data points")
+        if config.MEMORY_SETTINGS['profile']:
+            usage = self.memory_usage()
+            self._log("Memory: " + ", ".join(f"{name} {size / 2**20:.2f} MiB" for name, size in usage.items()))
+        return True
+    
+    def _create_compact_features(self):
+        """
+        create_features in compact mode: only the feature columns are kept, as float32
+        (see _store_features), and data keeps the bars and the target but none of the
+        intermediate indicator columns (moving averages, volume average, ...)
+        """
+        bars = self.data
+        values = compute({k: bars[k].to_numpy(dtype=np.float64) for k in OHLCV}, self.feature_params)
+        close = bars['Close'].to_numpy(dtype=np.float64)
+        next_return = np.append(close[1:] / close[:-1] - 1, np.nan)
+        
+        # the rows create_features keeps: complete bars with every feature and a next-day return
+        keep = ~np.isnan(next_return) & bars[OHLCV].notna().all(axis=1).to_numpy()
+        for c in self.feature_columns:
+            keep &= ~np.isnan(values[c])
+        
+        data = bars[OHLCV].assign(Next_Day_Return=next_return, Target=(next_return > 0).astype(np.int8))
+        self.data = data[keep]
+        self.target = self.data['Target']
+        self._store_features(self.data.index, [values[c][keep] for c in self.feature_columns])
+    
+    def _store_features(self, index, columns):
+        """
+        Set features from one array per feature column. Compact features live in a single
+        float32 array holding each column contiguously, memory-mapped when
+        MEMORY_SETTINGS['memmap_directory'] is set, which the DataFrame wraps without a copy.
+        """
+        shape = (len(columns), len(index))
+        directory = config.MEMORY_SETTINGS['memmap_directory']
+        if directory and len(index) > 0:
+            os.makedirs(directory, exist_ok=True)
+            fd, path = tempfile.mkstemp(prefix=f'{self.symbol}_', suffix='.features', dir=directory)
+            os.close(fd)
+            store = np.memmap(path, dtype=np.float32, mode='w+', shape=shape)
+            try:
+                # the mapping keeps the file's data; it is freed with the last reference
+                os.remove(path)
+            except OSError:
+                pass  # systems that can't remove mapped files keep it in the directory
+        else:
+            store = np.empty(shape, dtype=np.float32)
+        for row, values in zip(store, columns):
+            row[:] = values
+        self.features = pd.DataFrame(store.T, index=index, columns=self.feature_columns, copy=False)
+    
+    def memory_usage(self):
+        """
+        Profiling hook: bytes held by the values of data, features and target.
+        Arrays shared between them, e.g. features that are columns of data, count once in total.
+        
+        Returns:
+            dict: 'data', 'features', 'target', 'total', and 'mapped', the part of the
+                  total held in memory-mapped files rather than RAM
+        """
+        usage, seen = {}, {}
+        for name in ('data', 'features', 'target'):
+            values = getattr(self, name)
+            buffers = _buffers(values) if values is not None else {}
+            usage[name] = sum(a.nbytes for a in buffers.values())
+            seen.update(buffers)
+        usage['total'] = sum(a.nbytes for a in seen.values())
+        usage['mapped'] = sum(a.nbytes for a in seen.values() if isinstance(a, np.memmap))
+        return usage
+    
+    def chart_data(self):
+        """
+        data with the columns used by the charts (Close, Volume, MA_5, MA_20, RSI, Price_Change).
+        Those data lacks, e.g. moving averages of windows that are not in ma_windows, or all
+        of them in compact mode, are added here, once per version of data. None before create_features.
+        """
+        if self.data is None or self.features is None:
+            return None
+        if self._chart_data is None or self._chart_data[0] is not self.data:
+            close = self.data['Close'].to_numpy(dtype=np.float64)
+            extra = {f'MA_{w}': rolling_mean(close, w) for w in CHART_MA_WINDOWS if f'MA_{w}' not in self.data}
+            for column in ('RSI', 'Price_Change'):
+                if column not in self.data:
+                    extra[column] = self.features[column]
+            self._chart_data = (self.data, self.data.assign(**extra) if extra else self.data)
+        return self._chart_data[1]
+    
+    def _start_feature_engine(self, bars):
+        """
+        Warm up the incremental feature engine on the tail of the raw bars, except the newest.
+        The newest bar has no next-day target yet and may still be in progress (during market
+        hours the daily history includes today's session so far), so it is only previewed:
+        append_bars replaces it with newer versions of the same bar and commits it to the
+        engine once the next bar arrives.
+        """
+        self.feature_engine = IncrementalFeatureEngine.from_history(bars.iloc[:-1], **self.feature_params)
+        self._previous_bar = bars.index[-2] if len(bars) > 1 else None
+        self._set_latest_bar(bars.index[-1], bars.iloc[-1])
+    
+    def _set_latest_bar(self, timestamp, bar):
+        self.latest_bar = (timestamp, {**bar.to_dict(), **self.feature_engine.peek(bar)})
+    
+    @property
+    def latest_features(self):
+        """Features of the newest finished bar, which has no target yet (None before create_features)"""
+        if self.latest_bar is None:
+            return None
+        timestamp, row = self.latest_bar
+        return pd.DataFrame([[row[c] for c in self.feature_columns]], columns=self.feature_columns, index=[timestamp])
+    
+    def append_bars(self, bars):
+        """
+        Add newly finished bars without recomputing indicators over the whole history
+        
+        The previous newest bar is committed to the incremental feature engine (O(1)
+        per bar), gets its target and joins features/target; each new bar becomes the
+        newest. A bar with the timestamp of the newest bar is a newer version of it
+        (e.g. today's session so far) and replaces it.
+        
+        Args:
+            bars (pd.DataFrame): OHLCV bars; rows older than the newest known bar are ignored
+        
+        Returns:
+            int: Number of bars appended
+        """
+        if self.feature_engine is None:
+            self._log("No features available. Please create features first.")
+            return 0
+        
+        new = bars[bars.index >= self.latest_bar[0]]
+        rows, index = [], []
+        added = 0
+        for timestamp, bar in new.iterrows():
+            prev_time, prev = self.latest_bar
+            if timestamp == prev_time:
+                if bar['Close'] != prev['Close']:
+                    self._retarget_previous_bar(bar['Close'])
+                self._set_latest_bar(timestamp, bar)
+                continue
+            prev.update(self.feature_engine.push(prev))
+            prev['Next_Day_Return'] = bar['Close'] / prev['Close'] - 1
+            prev['Target'] = int(prev['Next_Day_Return'] > 0)
+            if not any(pd.isna(prev[c]) for c in self.feature_columns):
+                rows.append(prev)
+                index.append(prev_time)
+            self._previous_bar = prev_time
+            self._set_latest_bar(timestamp, bar)
+            added += 1
+        
+        if rows:
+            appended = pd.DataFrame(rows, index=index)
+            self.data = pd.concat([self.data, appended.reindex(columns=self.data.columns).astype(
+                self.data.dtypes.to_dict(), errors='ignore')])
+            if self.compact:
+                old = self.features.to_numpy()
+                self._store_features(self.data.index, [
+                    np.concatenate([old[:, i], appended[c].to_numpy(dtype=np.float64)])
+                    for i, c in enumerate(self.feature_columns)])
+            else:
+                self.features = self.data[self.feature_columns]
+            self.target = self.data['Target']
+        return added
+    
+    def _retarget_previous_bar(self, close):
+        """Recompute the target of the bar before the newest one from a new close of the newest"""
+        if len(self.data) == 0 or self.data.index[-1] != self._previous_bar:
+            return
+        # a new frame rather than writing into one that may have been handed out (e.g. in a snapshot)
+        data = self.data.copy(deep=False)
+        last = data.index[-1]
+        next_return = close / data['Close'].iloc[-1] - 1
+        data.loc[last, 'Next_Day_Return'] = next_return
+        data.loc[last, 'Target'] = int(next_return > 0)
+        self.data = data
+        self.target = data['Target']
+    
+    def preview_bar(self, bar):
+        """
+        Features for a bar that is still in progress (e.g. today's session so far),
+        computed from the engine state without committing the bar
+        
+        Returns:
+            pd.DataFrame: A single row of features, or None before create_features
+        """
+        if self.feature_engine is None:
+            return None
+        row = self.feature_engine.peek(bar)
+        return pd.DataFrame([[row[c] for c in self.feature_columns]], columns=self.feature_columns, index=[bar.name])
+    
+    def _model_key(self, test_size=0.2, random_state=42, **extra):
+        """Model store key for this symbol, period, feature set and training parameters"""
+        # n_jobs only changes how fast a model trains, not the model
+        params = {k: v for k, v in self.model_params.items() if k != 'n_jobs'}
+        params.update(random_state=random_state, test_size=test_size, **extra)
+        return model_key(self.symbol, self.period, self.feature_params, params)
+    
+    def load_model(self, test_size=0.2, random_state=42):
+        """
+        Load a stored model trained with the same settings, if there is a recent enough one
+        
+        Returns:
+            bool: True if a model was loaded
+        """
+        if self.model_store is None:
+            return False
+        data_end = self.features.index[-1] if self.features is not None else None
+        model, meta = self.model_store.load(self._model_key(test_size, random_state), data_end=data_end)
+        if model is None:
+            return False
+        self.model = model
+        self.accuracy = meta['accuracy']
+        self.model_version = meta['version']
+        trained = self.features.index <= pd.Timestamp(meta['data_end'])
+        if meta.get('held_out') is not None:
+            test_index = pd.DatetimeIndex(pd.to_datetime(meta['held_out'])).tz_convert(self.features.index.tz)
+        else:
+            # the split is deterministic, so the rows the model was trained on give back its held-out rows
+            test_index = self._split_rows(self.features[trained], self.target[trained],
+                                          test_size, random_state)[1].index
+        self._record_split(test_index, test_size, random_state)
+        self.trained_until = pd.Timestamp(meta['data_end'])
+        self._log(f"Loaded stored model {meta['version']} (trained on data up to {meta['data_end'][:10]})")
         return True
     
-    def train_model(self, test_size=0.2, random_state=42):
-        """Train the machine learning model"""
+    def train_model(self, test_size=0.2, random_state=42, retrain=False):
+        """
+        Train the machine learning model
+        
+        A model stored for the same settings and data is loaded instead of training
+        again, unless retrain is True. Newly trained models are added to the store.
+        """
         if self.features is None or self.target is None:
-            print("No features available. Please create features first.")
+            self._log("No features available. Please create features first.")
             return False
+        
+        if not retrain and self.load_model(test_size, random_state):
+            return True
             
-        print("Training model...")
+        self._log("Training model...")
         
         # Split the data
-        X_train, X_test, y_train, y_test = train_test_split(
-            self.features, self.target, test_size=test_size, 
-            random_state=random_state, stratify=self.target
-        )
+        X_train, X_test, y_train, y_test = self._split_rows(self.features, self.target, test_size, random_state)
+        self._record_split(X_test.index, test_size, random_state)
         
         # Train Random Forest model
-        self.model = RandomForestClassifier(
-            n_estimators=100,
-            random_state=random_state,
-            max_depth=10,
-            min_samples_split=5,
-            min_samples_leaf=2
-        )
+        self.model = RandomForestClassifier(**{**self.model_params, 'random_state': random_state})
         
         self.model.fit(X_train, y_train)
         
         # Make predictions and evaluate
         y_pred = self.model.predict(X_test)
         accuracy = accuracy_score(y_test, y_pred)
+        self.accuracy = accuracy
         
-        print(f"Model trained successfully!")
-        print(f"Accuracy: {accuracy:.4f}")
-        print("\nClassification Report:")
-        print(classification_report(y_test, y_pred))
+        self._log(f"Model trained successfully!")
+        self._log(f"Accuracy: {accuracy:.4f}")
+        self._log("\nClassification Report:")
+        self._log(classification_report(y_test, y_pred))
         
         # Feature importance
         feature_importance = pd.DataFrame({
@@ -143,30 +408,163 @@ class StockPredictor:
             'importance': self.model.feature_importances_
         }).sort_values('importance', ascending=False)
         
-        print("\nFeature Importance:")
-        print(feature_importance)
+        self._log("\nFeature Importance:")
+        self._log(feature_importance)
         
+        self._store_model()
         return True
     
+    @staticmethod
+    def _split_rows(features, target, test_size, random_state):
+        """Training and held-out rows of train_model"""
+        return train_test_split(features, target, test_size=test_size,
+                                random_state=random_state, stratify=target)
+    
+    def _record_split(self, test_index, test_size, random_state):
+        """Remember the held-out rows of the current model, for update_model"""
+        self.test_index = test_index
+        self.trained_until = self.features.index[-1]
+        self._split = (test_size, random_state)
+    
+    def _store_model(self):
+        """Add the current model to the model store as a new version"""
+        if self.model_store is None:
+            return
+        try:
+            self.model_version = self.model_store.save(
+                self._model_key(*self._split), self.model, self.features.index[-1],
+                accuracy=self.accuracy, feature_columns=self.feature_columns, held_out=self.test_index)
+        except OSError as e:
+            self._log(f"Could not store model: {e}")
+    
+    def train_horizons(self, horizons=None, retrain=False):
+        """
+        Train one calibrated model per prediction horizon, used by prediction.predict_horizons.
+        Models stored for the same settings and data are loaded instead, unless retrain is True.
+        
+        Args:
+            horizons (list): Horizons in trading days (default: config.PREDICTION_SETTINGS)
+        """
+        if self.features is None:
+            self._log("No features available. Please create features first.")
+            return False
+        
+        settings = config.PREDICTION_SETTINGS
+        horizons = horizons or settings['horizons']
+        features = self.features.to_numpy(dtype=np.float64)
+        close = self.data['Close'].to_numpy(dtype=np.float64)
+        for horizon in horizons:
+            key = self._model_key(horizon=horizon, calibration=settings['calibration'],
+                                  calibration_size=settings['calibration_size'],
+                                  evaluation_size=settings['evaluation_size'])
+            if not retrain and self.model_store is not None:
+                model, _ = self.model_store.load(key, data_end=self.features.index[-1])
+                if model is not None:
+                    self.horizon_models[horizon] = model
+                    continue
+            try:
+                model = fit_horizon_model(features, close, horizon, self.model_params)
+            except ValueError as e:
+                self._log(f"Skipping {horizon} day horizon: {e}")
+                continue
+            self.horizon_models[horizon] = model
+            if model.accuracy is not None:
+                self._log(f"{horizon} day model: held-out accuracy {model.accuracy:.4f}, "
+                          f"Brier score {model.brier:.4f}")
+            if self.model_store is not None:
+                try:
+                    self.model_store.save(key, model, self.features.index[-1], accuracy=model.accuracy,
+                                          feature_columns=self.feature_columns)
+                except OSError as e:
+                    self._log(f"Could not store model: {e}")
+        return bool(self.horizon_models)
+    
+    def current_features(self):
+        """
+        The newest feature row to predict from
+        
+        Returns:
+            tuple: (timestamp, 1D array in feature column order), or None before create_features
+        """
+        if self.latest_bar is not None:
+            timestamp, row = self.latest_bar
+            return timestamp, np.array([row[c] for c in self.feature_columns], dtype=np.float64)
+        if self.features is not None and len(self.features) > 0:
+            return self.features.index[-1], self.features.to_numpy(dtype=np.float64)[-1]
+        return None
+    
+    def update_model(self, n_trees=None):
+        """
+        Grow the trained forest with trees fitted on the current features (warm start),
+        e.g. after append_bars, instead of training a new forest from scratch.
+        The oldest trees are dropped once the forest exceeds TRAINING_SETTINGS['max_trees'].
+        Rows added since the last fit are split like train_model's data, the new trees
+        are fitted without any held-out row, and the accuracy is measured again on the
+        held-out rows before the grown model is added to the store.
+        
+        Args:
+            n_trees (int): Trees to add (default: TRAINING_SETTINGS['warm_start_trees'])
+        """
+        if self.model is None or self.features is None:
+            self._log("No trained model available. Please train the model first.")
+            return False
+        
+        settings = config.TRAINING_SETTINGS
+        n_trees = n_trees or settings['warm_start_trees']
+        # sklearn seeds the new trees by replaying random_state past the existing ones; once old trees
+        # are dropped below, the same seed would repeat the newest trees, so every update gets its own
+        seed = np.random.RandomState(self.model.random_state).randint(np.iinfo(np.int32).max)
+        index = self.features.index
+        held_out = index.isin(self.test_index) if self.test_index is not None else np.zeros(len(index), bool)
+        if self.trained_until is not None:
+            new = index > self.trained_until
+            held_out |= new & (np.random.RandomState(seed).rand(len(index)) < self._split[0])
+        self.model.set_params(warm_start=True, n_estimators=len(self.model.estimators_) + n_trees,
+                              random_state=seed)
+        self.model.fit(self.features[~held_out], self.target[~held_out])
+        excess = len(self.model.estimators_) - settings['max_trees']
+        if excess > 0:
+            self.model.estimators_ = self.model.estimators_[excess:]
+            self.model.n_estimators = len(self.model.estimators_)
+        self._flat_model = None
+        self.test_index = index[held_out]
+        self.trained_until = index[-1]
+        if held_out.any():
+            self.accuracy = accuracy_score(self.target[held_out], self.model.predict(self.features[held_out]))
+        self._log(f"Added {n_trees} trees, the forest has {len(self.model.estimators_)}"
+                  + (f", accuracy {self.accuracy:.4f}" if self.accuracy is not None else ""))
+        self._store_model()
+        return True
+    
+    def _predict_proba(self, X):
+        """Class probabilities from the trained model, through the flattened forest if enabled"""
+        if not config.TRAINING_SETTINGS['fast_inference'] or not hasattr(self.model, 'estimators_'):
+            return self.model.predict_proba(X)
+        if self._flat_model is None or self._flat_model[0] is not self.model:
+            self._flat_model = (self.model, FlatForest(self.model))
+        return self._flat_model[1].predict_proba(np.asarray(X))
+    
     def predict_next_day(self):
         """Predict the next day's price direction"""
+        if self.model is None and self.features is not None:
+            self.load_model()
         if self.model is None:
-            print("No trained model available. Please train the model first.")
+            self._log("No trained model available. Please train the model first.")
             return None
             
         # Get the latest features
         latest_features = self.features.iloc[-1:].values
         
         # Make prediction
-        prediction = self.model.predict(latest_features)[0]
-        prediction_proba = self.model.predict_proba(latest_features)[0]
+        prediction_proba = self._predict_proba(latest_features)[0]
+        prediction = self.model.classes_[np.argmax(prediction_proba)]
         
         direction = "UP" if prediction == 1 else "DOWN"
         confidence = max(prediction_proba) * 100
         
-        print(f"\nNext Day Prediction for {self.symbol}:")
-        print(f"Direction: {direction}")
-        print(f"Confidence: {confidence:.2f}%")
+        self._log(f"\nNext Day Prediction for {self.symbol}:")
+        self._log(f"Direction: {direction}")
+        self._log(f"Confidence: {confidence:.2f}%")
         
         return {
             'direction': direction,
@@ -177,30 +575,31 @@ class StockPredictor:
     
     def plot_analysis(self):
         """Create visualization plots"""
-        if self.data is None:
-            print("No data available for plotting.")
+        data = self.chart_data()
+        if data is None:
+            self._log("No data available for plotting.")
             return
             
         fig, axes = plt.subplots(2, 2, figsize=(15, 10))
         fig.suptitle(f'{self.symbol} Stock Analysis', fontsize=16)
         
         # Price chart with moving averages
-        axes[0, 0].plot(self.data.index, self.data['Close'], label='Close Price', linewidth=2)
-        axes[0, 0].plot(self.data.index, self.data['MA_5'], label='MA 5', alpha=0.7)
-        axes[0, 0].plot(self.data.index, self.data['MA_20'], label='MA 20', alpha=0.7)
+        axes[0, 0].plot(data.index, data['Close'], label='Close Price', linewidth=2)
+        axes[0, 0].plot(data.index, data['MA_5'], label='MA 5', alpha=0.7)
+        axes[0, 0].plot(data.index, data['MA_20'], label='MA 20', alpha=0.7)
         axes[0, 0].set_title('Price and Moving Averages')
         axes[0, 0].set_ylabel('Price ($)')
         axes[0, 0].legend()
         axes[0, 0].grid(True, alpha=0.3)
         
         # Volume
-        axes[0, 1].bar(self.data.index, self.data['Volume'], alpha=0.7, color='orange')
+        axes[0, 1].bar(data.index, data['Volume'], alpha=0.7, color='orange')
         axes[0, 1].set_title('Trading Volume')
         axes[0, 1].set_ylabel('Volume')
         axes[0, 1].grid(True, alpha=0.3)
         
         # RSI
-        axes[1, 0].plot(self.data.index, self.data['RSI'], color='purple', linewidth=2)
+        axes[1, 0].plot(data.index, data['RSI'], color='purple', linewidth=2)
         axes[1, 0].axhline(y=70, color='r', linestyle='--', alpha=0.7, label='Overbought')
         axes[1, 0].axhline(y=30, color='g', linestyle='--', alpha=0.7, label='Oversold')
         axes[1, 0].set_title('RSI (Relative Strength Index)')
@@ -209,7 +608,7 @@ class StockPredictor:
         axes[1, 0].grid(True, alpha=0.3)
         
         # Price changes distribution
-        axes[1, 1].hist(self.data['Price_Change'], bins=50, alpha=0.7, color='skyblue', edgecolor='black')
+        axes[1, 1].hist(data['Price_Change'], bins=50, alpha=0.7, color='skyblue', edgecolor='black')
         axes[1, 1].set_title('Daily Price Changes Distribution')
         axes[1, 1].set_xlabel('Price Change')
         axes[1, 1].set_ylabel('Frequency')
@@ -220,8 +619,8 @@ class StockPredictor:
     
     def run_full_analysis(self):
         """Run the complete analysis pipeline"""
-        print(f"Starting Stock Price Prediction Analysis for {self.symbol}")
-        print("=" * 50)
+        self._log(f"Starting Stock Price Prediction Analysis for {self.symbol}")
+        self._log("=" * 50)
         
         # Step 1: Fetch data
         if not self.fetch_data():
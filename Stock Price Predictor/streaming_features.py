@@ -0,0 +1,212 @@
+"""
+Incremental Feature Engine for Stock Price Predictor
+Updates the technical indicators of create_features with O(1) work per new bar
+"""
+
+import math
+from collections import deque
+
+
+class RollingMean:
+    """Mean over the last `window` values, kept as a running sum"""
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.total = 0.0
+
+    def _next(self, x):
+        total = self.total + x
+        if len(self.values) == self.window:
+            total -= self.values[0]
+        return total
+
+    def peek(self, x):
+        """Value after pushing x, without changing the state"""
+        if len(self.values) + 1 < self.window:
+            return math.nan
+        return self._next(x) / self.window
+
+    def push(self, x):
+        """Add x and return the updated mean (NaN until the window is full)"""
+        self.total = self._next(x)
+        self.values.append(x)
+        if len(self.values) > self.window:
+            self.values.popleft()
+        return self.total / self.window if len(self.values) == self.window else math.nan
+
+
+class RollingStd:
+    """Sample standard deviation over the last `window` values (Welford, with removal)"""
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def _next(self, x):
+        n = len(self.values)
+        if n < self.window:
+            # plain Welford step while the window fills up
+            mean = self.mean + (x - self.mean) / (n + 1)
+            return mean, self.m2 + (x - self.mean) * (x - mean)
+        # replace the oldest value with x
+        old = self.values[0]
+        mean = self.mean + (x - old) / n
+        return mean, max(self.m2 + (x - old) * (x - mean + old - self.mean), 0.0)
+
+    def peek(self, x):
+        """Value after pushing x, without changing the state"""
+        if math.isnan(x) or len(self.values) + 1 < self.window:
+            return math.nan
+        return math.sqrt(self._next(x)[1] / (self.window - 1))
+
+    def push(self, x):
+        """Add x and return the updated standard deviation (NaN until the window is full)"""
+        if math.isnan(x):
+            # only the first price change is undefined; skipping it matches pandas' rolling
+            return math.nan
+        self.mean, self.m2 = self._next(x)
+        self.values.append(x)
+        if len(self.values) > self.window:
+            self.values.popleft()
+        return math.sqrt(self.m2 / (self.window - 1)) if len(self.values) == self.window else math.nan
+
+
+class Ema:
+    """Exponential moving average, the same recursion as pandas' ewm(span, adjust=False)"""
+
+    def __init__(self, span):
+        self.alpha = 2.0 / (span + 1)
+        self.value = None
+
+    def peek(self, x):
+        """Value after pushing x, without changing the state"""
+        if self.value is None:
+            return x
+        return self.alpha * x + (1 - self.alpha) * self.value
+
+    def push(self, x):
+        """Add x and return the updated average"""
+        self.value = self.peek(x)
+        return self.value
+
+
+class RollingRSI:
+    """RSI from rolling means of gains and losses, the same definition as create_features"""
+
+    def __init__(self, period=14):
+        self.gains = RollingMean(period)
+        self.losses = RollingMean(period)
+        self.last_close = None
+
+    def _split(self, close):
+        delta = 0.0 if self.last_close is None else close - self.last_close
+        return max(delta, 0.0), max(-delta, 0.0)
+
+    @staticmethod
+    def _rsi(gain, loss):
+        if math.isnan(gain) or math.isnan(loss) or (gain == 0 and loss == 0):
+            return math.nan
+        if loss == 0:
+            return 100.0
+        return 100 - 100 / (1 + gain / loss)
+
+    def peek(self, close):
+        """Value after pushing close, without changing the state"""
+        gain, loss = self._split(close)
+        return self._rsi(self.gains.peek(gain), self.losses.peek(loss))
+
+    def push(self, close):
+        """Add a closing price and return the updated RSI"""
+        gain, loss = self._split(close)
+        self.last_close = close
+        return self._rsi(self.gains.push(gain), self.losses.push(loss))
+
+
+class IncrementalFeatureEngine:
+    """
+    Streaming version of StockPredictor.create_features.
+
+    push(bar) commits a finished bar and returns its indicator values; peek(bar)
+    returns the values a bar would get without committing it, which is what an
+    in-progress bar needs while it is still being updated tick by tick.
+    """
+
+    def __init__(self, ma_windows=(5, 10, 20), volatility_windows=(5, 10), rsi_period=14, volume_ma_window=5,
+                 macd=None, bollinger=None, atr_period=None):
+        """Windows as in config.FEATURE_PARAMS; macd, bollinger and atr_period are optional"""
+        self.ma = {w: RollingMean(w) for w in ma_windows}
+        self.volatility = {w: RollingStd(w) for w in volatility_windows}
+        self.volume_ma_window = volume_ma_window
+        self.volume_ma = RollingMean(volume_ma_window)
+        self.rsi = RollingRSI(rsi_period)
+        self.macd = macd and (Ema(macd[0]), Ema(macd[1]), Ema(macd[2]))
+        self.bollinger = bollinger and (RollingMean(bollinger[0]), RollingStd(bollinger[0]), bollinger[1])
+        self.atr = atr_period and RollingMean(atr_period)
+        self.last_close = None
+        self.last_row = None
+        windows = [max(ma_windows), max(volatility_windows) + 1, rsi_period + 1, volume_ma_window,
+                   bollinger[0] if bollinger else 0, atr_period + 1 if atr_period else 0]
+        # an EMA never forgets, so MACD needs the whole history to match the batch computation
+        self.warmup = None if macd else max(windows)
+
+    @classmethod
+    def from_history(cls, bars, **params):
+        """Build an engine and warm it up on the last bars of an OHLCV DataFrame"""
+        engine = cls(**params)
+        history = bars if engine.warmup is None else bars.iloc[-engine.warmup:]
+        for _, bar in history.iterrows():
+            engine.push(bar)
+        return engine
+
+    def _step(self, bar, commit):
+        op = 'push' if commit else 'peek'
+        close, volume = float(bar['Close']), float(bar['Volume'])
+        change = math.nan if self.last_close is None else close / self.last_close - 1
+        row = {
+            'Price_Change': change,
+            'High_Low_Pct': (bar['High'] - bar['Low']) / close,
+            'Open_Close_Pct': (close - bar['Open']) / bar['Open'],
+        }
+        for w, ma in self.ma.items():
+            row[f'MA_{w}'] = getattr(ma, op)(close)
+            row[f'MA_{w}_ratio'] = close / row[f'MA_{w}']
+        for w, std in self.volatility.items():
+            row[f'Volatility_{w}'] = getattr(std, op)(change)
+        volume_ma = getattr(self.volume_ma, op)(volume)
+        row[f'Volume_MA_{self.volume_ma_window}'] = volume_ma
+        row['Volume_ratio'] = volume / volume_ma if volume_ma else math.nan
+        row['RSI'] = getattr(self.rsi, op)(close)
+        if self.macd:
+            fast, slow, signal = (getattr(e, op) for e in self.macd)
+            row['MACD'] = fast(close) - slow(close)
+            row['MACD_signal'] = signal(row['MACD'])
+            row['MACD_hist'] = row['MACD'] - row['MACD_signal']
+            row['MACD_pct'] = row['MACD'] / close
+            row['MACD_hist_pct'] = row['MACD_hist'] / close
+        if self.bollinger:
+            mean, std, num_std = self.bollinger
+            middle, spread = getattr(mean, op)(close), num_std * getattr(std, op)(close)
+            row['BB_upper'], row['BB_lower'] = middle + spread, middle - spread
+            row['BB_width'] = 2 * spread / middle
+            row['BB_pct'] = (close - row['BB_lower']) / (2 * spread) if spread else math.nan
+        if self.atr:
+            prev = self.last_close if self.last_close is not None else math.nan
+            high, low = float(bar['High']), float(bar['Low'])
+            true_range = max(high - low, abs(high - prev), abs(low - prev)) if prev == prev else high - low
+            row['ATR'] = getattr(self.atr, op)(true_range)
+            row['ATR_pct'] = row['ATR'] / close
+        if commit:
+            self.last_close = close
+            self.last_row = row
+        return row
+
+    def peek(self, bar):
+        """Indicator values for an unfinished bar, the state is left untouched"""
+        return self._step(bar, commit=False)
+
+    def push(self, bar):
+        """Commit a finished bar and return its indicator values"""
+        return self._step(bar, commit=True)
@@ -2,13 +2,13 @@
 Streamlit Live Preview for Stock Price Predictor
 """
 
-import time
+import uuid
 from datetime import datetime
 
 import streamlit as st
 import plotly.graph_objects as go
 
-from live_predictor import LiveStockPredictor
+from live_predictor import LiveStockPredictor, PredictorPool, live_chart
 import config
 
 st.set_page_config(page_title="Stock Price Predictor - Live", layout="wide")
@@ -33,62 +33,92 @@ with col_btn2:
 st.title("📈 Live Stock Price Predictor")
 st.caption("Intraday live data with next-day direction prediction")
 
-# Predictor instance (cache per selection)
+# Predictors are shared by all sessions watching the same selection. Each refreshes data,
+# features, model and prediction on its own background thread, so reruns only read its
+# latest snapshot. The pool stops predictors nobody has watched for a while.
+def new_predictor(selected_symbol: str, selected_period: str) -> LiveStockPredictor:
+    predictor = LiveStockPredictor(symbol=selected_symbol, period=selected_period)
+    predictor.verbose = False
+    return predictor
+
 @st.cache_resource(show_spinner=False)
-def get_predictor(selected_symbol: str, selected_period: str) -> LiveStockPredictor:
-    return LiveStockPredictor(symbol=selected_symbol, period=selected_period, update_interval=update_interval)
+def get_pool() -> PredictorPool:
+    return PredictorPool(factory=new_predictor)
 
-predictor = get_predictor(symbol, period)
+pool = get_pool()
+session_id = st.session_state.setdefault('session_id', str(uuid.uuid4()))
+pool.expire()
+predictor = pool.acquire(session_id, symbol, period)
+# the refresher reads the interval on every cycle
+predictor.update_interval = update_interval
 
-# Update or train actions
+# Update or train actions run on the predictor's thread
 if fetch_btn:
-    with st.spinner("Fetching historical data and creating features..."):
-        predictor.fetch_data()
-        predictor.create_features()
-
+    predictor.request('update')
+    st.toast("Fetching historical data and creating features...")
 if train_btn:
-    with st.spinner("Training model..."):
-        if predictor.features is None:
-            predictor.fetch_data()
-            predictor.create_features()
-        predictor.train_model()
-
-# Ensure we have data
-if predictor.data is None:
-    predictor.fetch_data()
-    predictor.create_features()
-
-# Live prediction section
-live_col1, live_col2, live_col3 = st.columns(3)
-
-with live_col1:
-    pred = predictor.get_live_prediction()
-    if pred:
-        st.metric(label="Prediction", value=pred['direction'], delta=f"{pred['confidence']:.1f}% confidence")
+    predictor.request('train')
+    st.toast("Training model...")
+
+# The chart only changes when a new bar arrives. It is drawn from the snapshot's data,
+# so the script never reads the predictor's own state while its thread updates it.
+@st.cache_data(show_spinner=False, max_entries=32)
+def chart_figure(selected_symbol: str, selected_period: str, chart_version: int, last_bar: str, _data):
+    return live_chart(selected_symbol, _data)
+
+# Live tiles rerun on their own every refresh interval, without rerunning the page
+@st.fragment(run_every=update_interval)
+def live_tiles():
+    # polling keeps the session alive; a timed out session gets its predictor back
+    live = pool.get(session_id) or pool.acquire(session_id, symbol, period)
+    snapshot = live.snapshot()
+    if snapshot is None:
+        st.info("⏳ Fetching data and preparing the model...")
+        return
+
+    live_col1, live_col2, live_col3 = st.columns(3)
+
+    with live_col1:
+        pred = snapshot['prediction']
+        if pred:
+            st.metric(label="Prediction", value=pred['direction'], delta=f"{pred['confidence']:.1f}% confidence")
+            horizons = snapshot['horizons']
+            if horizons is not None and len(horizons) > 0:
+                st.caption(" • ".join(
+                    f"{h}d: {d} ({p:.0%} up)" for h, d, p in zip(horizons['horizon'], horizons['direction'], horizons['prob_up'])
+                ))
+        else:
+            st.info("Train the model to see predictions.")
+
+    with live_col2:
+        current_price = snapshot['current_price']
+        price_change = snapshot['price_change']
+        if current_price is not None:
+            delta_str = f"{price_change:.2f}%" if price_change is not None else None
+            st.metric(label=f"{symbol} Price", value=f"${current_price:.2f}", delta=delta_str)
+        else:
+            st.warning("No live price yet")
+
+    with live_col3:
+        if snapshot['model_trained']:
+            st.success("Model: Trained")
+        else:
+            st.error("Model: Not trained")
+
+    # Chart
+    data = snapshot['data']
+    if data is not None and len(data) > 0:
+        figure = chart_figure(symbol, period, snapshot['chart_version'], str(data.index[-1]), data)
+        st.plotly_chart(figure, use_container_width=True)
+        with st.expander("Latest features"):
+            st.dataframe(snapshot['recent_features'], use_container_width=True)
     else:
-        st.info("Train the model to see predictions.")
-
-with live_col2:
-    current_price = predictor.get_current_price()
-    price_change = predictor.get_price_change()
-    if current_price is not None:
-        delta_str = f"{price_change:.2f}%" if price_change is not None else None
-        st.metric(label=f"{symbol} Price", value=f"${current_price:.2f}", delta=delta_str)
-    else:
-        st.warning("No live price yet")
+        st.plotly_chart(go.Figure(), use_container_width=True)
 
-with live_col3:
-    if predictor.model is not None:
-        st.success("Model: Trained")
-    else:
-        st.error("Model: Not trained")
-
-# Chart
-fig = predictor.create_live_chart()
-st.plotly_chart(fig, use_container_width=True)
-
-# Footer info
-st.caption(
-    f"Last update: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} • Interval: {config.LIVE_SETTINGS.get('intraday_interval', '1m')} • Auto-refresh: {update_interval}s"
-)
+    # Footer info
+    updated = snapshot['last_update'] or datetime.now()
+    st.caption(
+        f"Last update: {updated.strftime('%Y-%m-%d %H:%M:%S')} • Interval: {config.LIVE_SETTINGS.get('intraday_interval', '1m')} • Auto-refresh: {update_interval}s"
+    )
 
+live_tiles()
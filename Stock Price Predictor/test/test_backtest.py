@@ -0,0 +1,32 @@
+import pandas as pd
+
+from backtest import WalkForwardBacktester
+from stock_predictor import StockPredictor
+from test_portfolio import offline_config
+
+def test_folds_never_train_on_the_test_window():
+
+    for mode in ('expanding', 'rolling'):
+        backtester = WalkForwardBacktester(None, train_size=50, test_size=7, mode=mode, verbose=False)
+        folds = backtester.folds(200)
+        assert folds[0][1][0] == 50 and folds[-1][1][1] == 200
+        for i, ((train_start, train_stop), (test_start, test_stop)) in enumerate(folds):
+            assert 0 <= train_start < train_stop <= test_start < test_stop <= 200
+            if mode == 'rolling':
+                assert train_stop - train_start == 50
+            else:
+                assert train_start == 0
+            # test windows follow each other without gaps or repeats
+            if i > 0:
+                assert test_start == folds[i - 1][1][1]
+
+def test_parallel_run_matches_serial(monkeypatch, tmp_path):
+
+    offline_config(monkeypatch, tmp_path, ['AAA'])
+    predictor = StockPredictor('AAA', verbose=False)
+    assert predictor.fetch_data() and predictor.create_features()
+    params = dict(train_size=200, test_size=50, model_params={'n_estimators': 20}, verbose=False)
+    serial = WalkForwardBacktester(predictor, workers=1, **params)
+    parallel = WalkForwardBacktester(predictor, workers=2, **params)
+    pd.testing.assert_frame_equal(serial.run(), parallel.run())
+    assert serial.stats == parallel.stats
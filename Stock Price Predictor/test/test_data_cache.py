@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+from data_cache import OHLCVCache, CSVSource, period_start
+
+class IntradaySource:
+    """ bars every 30 minutes over the last `days` days, whatever the interval """
+
+    def __init__(self, days=20):
+        index = pd.date_range(end=pd.Timestamp.now(tz='UTC').floor('30min'), periods=days * 48, freq='30min')
+        self.bars = pd.DataFrame({'Close': np.arange(len(index), dtype=float)}, index=index)
+        self.calls = []
+
+    def history(self, symbol, interval='1d', start=None, end=None, period=None):
+        self.calls.append((start, end, period))
+        if start is None and period is not None:
+            start = period_start(period)
+        bars = self.bars
+        if start is not None:
+            bars = bars[bars.index >= start]
+        if end is not None:
+            bars = bars[bars.index < end]
+        return bars
+
+def test_missing_symbol_returns_empty_frame(tmp_path):
+
+    cache = OHLCVCache(directory=str(tmp_path / 'cache'), source=CSVSource(str(tmp_path)))
+    assert len(cache.get('NONE', period='1y')) == 0
+    assert len(cache.get('NONE', period='max')) == 0
+
+def test_intraday_cache_keeps_only_the_servable_window(tmp_path):
+
+    source = IntradaySource()
+    cache = OHLCVCache(directory=str(tmp_path), source=source, max_age_seconds=0)
+    oldest = period_start('7d')
+    bars = cache.get('AAA', period='1mo', interval='1m')
+    assert len(bars) > 0 and bars.index[0] >= oldest
+    assert bars.index[-1] == source.bars.index[-1]
+    cached, meta = cache.load('AAA', '1m')
+    assert cached.index[0] >= oldest
+    assert pd.Timestamp(meta['covered_from']) >= oldest
+
+    # later requests only fetch the tail, never anything before the window
+    cache.get('AAA', period='1mo', interval='1m')
+    start, end, period = source.calls[-1]
+    assert start == cached.index[-1] and end is None
+    cached, _ = cache.load('AAA', '1m')
+    assert cached.index[0] >= oldest
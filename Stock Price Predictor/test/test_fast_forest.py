@@ -0,0 +1,37 @@
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+from fast_forest import FlatForest
+
+def fitted_forest(seed=0, n_estimators=50, max_depth=None):
+    rng = np.random.RandomState(seed)
+    X = rng.normal(size=(400, 6))
+    y = (X[:, 0] + 0.5 * X[:, 1] ** 2 + rng.normal(0, 0.5, 400) > 0.5).astype(int)
+    model = RandomForestClassifier(n_estimators=n_estimators, max_depth=max_depth, random_state=seed).fit(X, y)
+    return model, rng.normal(size=(300, 6))
+
+def test_probabilities_match_sklearn():
+
+    for max_depth in (None, 3):
+        model, X = fitted_forest(max_depth=max_depth)
+        flat = FlatForest(model)
+        np.testing.assert_array_equal(flat.predict_proba(X), model.predict_proba(X))
+        np.testing.assert_array_equal(flat.predict_proba(X[0]), model.predict_proba(X[:1]))
+        np.testing.assert_array_equal(flat.predict(X), model.predict(X))
+
+def test_early_exit_agrees_with_predict():
+
+    model, X = fitted_forest(seed=1, n_estimators=101)
+    flat = FlatForest(model)
+    expected = flat.predict(X)
+    for chunk in (1, 7, 16, 500):
+        np.testing.assert_array_equal(flat.predict(X, early_exit=True, chunk=chunk), expected)
+
+def test_grouped_forests_match_each_forest():
+
+    models = [fitted_forest(seed=s, n_estimators=10 + s)[0] for s in range(3)]
+    _, X = fitted_forest(seed=5)
+    combined = FlatForest.concat([FlatForest(m) for m in models])
+    proba = combined.group_proba(X[:3], np.array([0, 1, 2]))
+    expected = np.vstack([m.predict_proba(X[i:i + 1]) for i, m in enumerate(models)])
+    np.testing.assert_allclose(proba, expected, rtol=1e-12)
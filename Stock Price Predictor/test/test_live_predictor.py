@@ -0,0 +1,119 @@
+from contextvars import copy_context
+
+import dash
+import numpy as np
+import pandas as pd
+from dash._callback_context import context_value
+from dash._utils import AttributeDict
+
+import live_predictor
+from live_predictor import PredictorPool, lttb_indices, live_chart
+
+def chart_rows(days, seed=0):
+    rng = np.random.RandomState(seed)
+    index = pd.date_range('2024-01-01', periods=days, freq='D', tz='UTC')
+    close = 100 + np.cumsum(rng.normal(0, 1, days))
+    return pd.DataFrame({
+        'Open': close + rng.normal(0, 0.5, days),
+        'Close': close,
+        'MA_5': close,
+        'MA_20': close,
+        'Volume': rng.randint(1000, 5000, days).astype(float),
+        'RSI': rng.uniform(20, 80, days),
+    }, index=index)
+
+def run_dashboard(chart_state, trigger='interval-component.n_intervals'):
+    """ call update_dashboard inside a Dash callback context, as triggered by `trigger` """
+    def run():
+        context_value.set(AttributeDict(triggered_inputs=[{'prop_id': trigger, 'value': 1}]))
+        return live_predictor.update_dashboard(None, None, 1, {'symbol': 'AAA', 'period': '1y'},
+                                               'session', chart_state)
+    return copy_context().run(run)
+
+class FakePredictor:
+    """ serves whatever snapshot the test sets, like a LiveStockPredictor's serving thread """
+
+    def __init__(self, symbol, period):
+        self.symbol = symbol
+        self.period = period
+        self.commands = []
+        self.snapshot_value = None
+
+    def start(self):
+        pass
+
+    def stop(self, timeout=None):
+        pass
+
+    def request(self, command):
+        self.commands.append(command)
+
+    def snapshot(self):
+        return self.snapshot_value
+
+    def publish(self, data, chart_version=1):
+        self.snapshot_value = {
+            'prediction': {'direction': 'UP', 'confidence': 60.0},
+            'horizons': None,
+            'current_price': float(data['Close'].iloc[-1]),
+            'price_change': 1.0,
+            'model_trained': True,
+            'chart_version': chart_version,
+            'figure': live_chart(self.symbol, data),
+            'chart_last': data.index[-1].isoformat(),
+            'data': data,
+        }
+
+def test_lttb_keeps_endpoints_and_point_count():
+
+    rng = np.random.RandomState(0)
+    x = np.arange(1000)
+    y = np.cumsum(rng.normal(size=1000))
+    for n_out in (3, 10, 257, 999):
+        keep = lttb_indices(x, y, n_out)
+        assert len(keep) == n_out
+        assert keep[0] == 0 and keep[-1] == 999
+        assert np.all(np.diff(keep) > 0)
+    # the extremes of a spike survive downsampling
+    y[500] = 100
+    assert 500 in lttb_indices(x, y, 20)
+    # nothing to drop
+    np.testing.assert_array_equal(lttb_indices(x[:5], y[:5], 10), np.arange(5))
+
+def test_update_dashboard_sends_figure_then_extensions(monkeypatch):
+
+    pool = PredictorPool(factory=FakePredictor)
+    monkeypatch.setattr(live_predictor, 'pool', pool)
+    predictor = pool.acquire('session', 'AAA', '1y')
+    data = chart_rows(60)
+
+    # nothing published yet
+    outputs = run_dashboard(None)
+    assert outputs[4] is dash.no_update and outputs[5] is None
+
+    predictor.publish(data.iloc[:50])
+    _, _, _, figure, extend, state = run_dashboard(None)
+    assert figure is predictor.snapshot()['figure'] and extend is dash.no_update
+    assert state['last'] == data.index[49].isoformat()
+
+    # same data: the browser keeps its figure
+    outputs = run_dashboard(state)
+    assert outputs[3] is dash.no_update and outputs[4] is dash.no_update and outputs[5] == state
+
+    # new bars only extend the traces
+    predictor.snapshot_value['data'] = data.iloc[:52]
+    _, _, _, figure, extend, new_state = run_dashboard(state)
+    assert figure is dash.no_update
+    update, traces = extend
+    assert traces == list(range(len(live_predictor.CHART_TRACES)))
+    assert list(update['x'][0]) == list(data.index[50:52])
+    assert new_state['last'] == data.index[51].isoformat()
+
+    # replaced data (a new chart version) sends a full figure again
+    predictor.publish(data, chart_version=2)
+    _, _, _, figure, extend, _ = run_dashboard(new_state)
+    assert figure is predictor.snapshot()['figure'] and extend is dash.no_update
+
+    # buttons are handed to the serving thread
+    run_dashboard(new_state, trigger='train-button.n_clicks')
+    assert predictor.commands == ['train']
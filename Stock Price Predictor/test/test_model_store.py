@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+from model_store import ModelStore, model_key
+
+def trained_model(seed):
+    rng = np.random.RandomState(seed)
+    X = rng.normal(size=(100, 4))
+    return RandomForestClassifier(n_estimators=5, random_state=seed).fit(X, X[:, 0] > 0), X
+
+def test_save_load_and_latest_version(tmp_path):
+
+    store = ModelStore(directory=str(tmp_path), max_versions=2, reuse_days=5)
+    key = model_key('aapl', '2y', {'rsi': 14}, {'n_estimators': 5})
+    assert key.startswith('AAPL_2y_')
+    assert store.load(key) == (None, None)
+
+    day = pd.Timestamp('2024-03-01', tz='UTC')
+    versions = []
+    for i in range(3):
+        model, X = trained_model(i)
+        versions.append(store.save(key, model, day + pd.Timedelta(days=i), accuracy=0.5 + i / 10,
+                                   feature_columns=['a', 'b', 'c', 'd']))
+    assert versions == sorted(versions) and len(set(versions)) == 3
+
+    # only the newest max_versions are kept, newest first
+    assert [m['version'] for m in store.versions(key)] == versions[:0:-1]
+    loaded, meta = store.load(key, mmap=False)
+    assert meta['version'] == versions[-1]
+    assert meta['accuracy'] == 0.7 and meta['feature_columns'] == ['a', 'b', 'c', 'd']
+    np.testing.assert_array_equal(loaded.predict_proba(X), model.predict_proba(X))
+
+    # a specific version, and versions trained on data too old for reuse
+    _, meta = store.load(key, version=versions[1])
+    assert meta['version'] == versions[1]
+    assert store.load(key, data_end=day + pd.Timedelta(days=6))[1]['version'] == versions[-1]
+    assert store.load(key, data_end=day + pd.Timedelta(days=30)) == (None, None)
@@ -0,0 +1,66 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+
+import config
+from data_cache import OHLCVCache, CSVSource
+from portfolio import PortfolioRunner
+from stock_predictor import StockPredictor
+
+def write_bars(directory, symbol, days=600, seed=0):
+    rng = np.random.RandomState(seed)
+    index = pd.bdate_range(end=pd.Timestamp.now(tz='UTC').normalize(), periods=days)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, days)))
+    open_ = close * (1 + rng.normal(0, 0.005, days))
+    bars = pd.DataFrame({
+        'Open': open_,
+        'High': np.maximum(open_, close) * 1.01,
+        'Low': np.minimum(open_, close) * 0.99,
+        'Close': close,
+        'Volume': rng.randint(1_000_000, 5_000_000, days).astype(float),
+    }, index=index)
+    bars.to_csv(directory / f"{symbol}.csv")
+
+def offline_config(monkeypatch, tmp_path, symbols):
+    csv_dir = tmp_path / 'csv'
+    csv_dir.mkdir()
+    for i, symbol in enumerate(symbols):
+        write_bars(csv_dir, symbol, seed=i)
+    monkeypatch.setitem(config.CACHE_SETTINGS, 'enabled', True)
+    monkeypatch.setitem(config.CACHE_SETTINGS, 'directory', str(tmp_path / 'cache'))
+    monkeypatch.setitem(config.CACHE_SETTINGS, 'offline_directory', str(csv_dir))
+    monkeypatch.setitem(config.MODEL_STORE_SETTINGS, 'directory', str(tmp_path / 'models'))
+    monkeypatch.setattr('data_cache._default_cache', None)
+    monkeypatch.setattr('model_store._default_store', None, raising=False)
+    return csv_dir
+
+def test_cache_pickles_without_locks(tmp_path):
+
+    cache = OHLCVCache(directory=str(tmp_path), source=CSVSource(str(tmp_path)))
+    with cache._lock('AAPL', '1d'):
+        copy = pickle.loads(pickle.dumps(cache))
+    assert copy.directory == cache.directory
+    assert copy._locks == {}
+    # the copy's locks are its own
+    with copy._lock('AAPL', '1d'):
+        pass
+
+def test_predictor_with_default_cache_pickles(monkeypatch, tmp_path):
+
+    offline_config(monkeypatch, tmp_path, ['AAA'])
+    predictor = StockPredictor('AAA', verbose=False)
+    assert predictor.cache is not None
+    assert predictor.fetch_data()
+    copy = pickle.loads(pickle.dumps(predictor))
+    assert copy.data.equals(predictor.data)
+
+def test_portfolio_trains_in_process_pool(monkeypatch, tmp_path):
+
+    symbols = ['AAA', 'BBB']
+    offline_config(monkeypatch, tmp_path, symbols)
+    runner = PortfolioRunner(symbols, period='2y', train_workers=2, verbose=False)
+    results = runner.run()
+    assert sorted(results['symbol']) == symbols
+    assert results['error'].isna().all()
+    assert results['direction'].isin(['UP', 'DOWN']).all()
@@ -0,0 +1,94 @@
+import asyncio
+
+import pandas as pd
+import pytest
+
+from quote_fetcher import QuoteFetcher
+
+class FakeTransport:
+    """ records every call; fails the first `failures` calls with `error` """
+
+    def __init__(self, failures=0, error=ConnectionError("no route"), delay=0.01):
+        self.calls = []
+        self.failures = failures
+        self.error = error
+        self.delay = delay
+
+    async def fetch(self, symbols, interval, period):
+        self.calls.append(list(symbols))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if len(self.calls) <= self.failures:
+            raise self.error
+        return {s: pd.DataFrame({'Close': [float(len(s))]}) for s in symbols}
+
+def make_fetcher(transport, **kwargs):
+    params = dict(max_concurrency=2, batch_size=4, batch_window=0.01, retries=2, backoff=0.1)
+    params.update(kwargs)
+    return QuoteFetcher(transport=transport, **params)
+
+def test_batches_by_batch_size():
+
+    transport = FakeTransport()
+    fetcher = make_fetcher(transport)
+    symbols = [f"S{i}" for i in range(10)]
+    try:
+        bars = fetcher.fetch_many(symbols, timeout=5)
+    finally:
+        fetcher.close()
+    assert sorted(len(c) for c in transport.calls) == [2, 4, 4]
+    assert sorted(s for c in transport.calls for s in c) == sorted(symbols)
+    assert fetcher.requests == 3
+    assert all(bars[s]['Close'].iloc[0] == len(s) for s in symbols)
+
+def test_coalesces_inflight_symbols():
+
+    transport = FakeTransport(delay=0.05)
+    fetcher = make_fetcher(transport)
+
+    async def run():
+        single = [asyncio.ensure_future(fetcher.get('AAPL')) for _ in range(3)]
+        many = asyncio.ensure_future(fetcher.get_many(['AAPL', 'MSFT']))
+        # past the batch window, so the batch is in flight when this one asks
+        await asyncio.sleep(0.03)
+        assert transport.calls == [['AAPL', 'MSFT']]
+        late = await fetcher.get('MSFT')
+        return await asyncio.gather(*single), await many, late
+
+    frames, by_symbol, late = asyncio.run(run())
+    assert transport.calls == [['AAPL', 'MSFT']]
+    assert fetcher.requests == 1
+    assert all(f is frames[0] for f in frames)
+    assert by_symbol['AAPL'] is frames[0]
+    assert late is by_symbol['MSFT']
+
+def test_retries_with_exponential_backoff(monkeypatch):
+
+    delays = []
+    sleep = asyncio.sleep
+    async def recording_sleep(delay, *args, **kwargs):
+        delays.append(delay)
+        await sleep(0)
+    transport = FakeTransport(failures=2, delay=0)
+    fetcher = make_fetcher(transport, retries=2, backoff=0.1)
+    monkeypatch.setattr(asyncio, 'sleep', recording_sleep)
+
+    bars = asyncio.run(fetcher.get('AAPL'))
+    assert fetcher.requests == 3
+    assert len(transport.calls) == 3
+    assert delays == pytest.approx([0.1, 0.2])
+    assert bars['Close'].iloc[0] == 4
+
+def test_errors_propagate_through_fetch_many():
+
+    transport = FakeTransport(failures=100, error=ConnectionError("down"), delay=0)
+    fetcher = make_fetcher(transport, retries=1, backoff=0.001)
+    try:
+        results = fetcher.fetch_many(['AAPL', 'MSFT'], timeout=5)
+    finally:
+        fetcher.close()
+    assert fetcher.requests == 2  # first try and one retry, for the single batch
+    assert set(results) == {'AAPL', 'MSFT'}
+    assert all(isinstance(r, ConnectionError) and str(r) == "down" for r in results.values())
+    with pytest.raises(ConnectionError):
+        asyncio.run(make_fetcher(transport, retries=0).get('AAPL'))
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+import config
+from live_predictor import LiveStockPredictor
+from replay import ReplaySource, run_replay
+from test_portfolio import offline_config
+
+def minute_bars(day, minutes=390, seed=0):
+    rng = np.random.RandomState(seed)
+    index = pd.date_range(day + pd.Timedelta(hours=14, minutes=30), periods=minutes, freq='1min')
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, minutes)))
+    return pd.DataFrame({
+        'Open': close, 'High': close * 1.001, 'Low': close * 0.999, 'Close': close,
+        'Volume': rng.randint(100, 1000, minutes).astype(float),
+    }, index=index)
+
+def test_history_stops_at_the_replay_clock():
+
+    bars = minute_bars(pd.Timestamp('2024-03-01', tz='UTC'))
+    replay = ReplaySource(frames={'AAA': bars}, speed=0, warmup_bars=10)
+    assert replay.history('AAA').index[-1] == bars.index[10]
+    replay.advance(90)
+    assert replay.history('AAA').index[-1] == bars.index[11]
+    assert len(replay.history('AAA', start=bars.index[5])) == 7
+    assert not replay.finished('AAA')
+    replay.advance(24 * 3600)
+    assert replay.finished('AAA') and replay.history('AAA').equals(bars)
+
+def test_short_replay_run(monkeypatch, tmp_path):
+
+    offline_config(monkeypatch, tmp_path, ['AAA'])
+    monkeypatch.setitem(config.QUOTE_SETTINGS, 'enabled', False)
+    tomorrow = pd.Timestamp.now(tz='UTC').normalize() + pd.Timedelta(days=1)
+    replay = ReplaySource(frames={'AAA': minute_bars(tomorrow)}, speed=0, warmup_bars=5)
+    predictor = LiveStockPredictor('AAA', live_source=replay)
+    predictor.verbose = False
+    assert predictor.fetch_data() and predictor.create_features() and predictor.train_model()
+    rows = len(predictor.features)
+
+    stats = run_replay(predictor, replay, ticks=20, step_seconds=60)
+    assert stats['ticks'] == 20 and stats['simulated_seconds'] == 1200
+    assert stats['max_ms'] >= stats['p50_ms'] > 0
+    # the replayed session is today's provisional bar, and yesterday's bar joined the training rows
+    assert predictor.live_data.index[-1] == replay.now()
+    assert predictor.latest_bar[0] == tomorrow
+    assert len(predictor.features) == rows + 1
+    assert predictor.get_live_prediction()['current_price'] == predictor.live_data['Close'].iloc[-1]
@@ -0,0 +1,66 @@
+import numpy as np
+from sklearn.metrics import accuracy_score
+
+import config
+from stock_predictor import StockPredictor
+from test_portfolio import offline_config
+
+def test_update_model_keeps_held_out_rows_and_stores_the_model(monkeypatch, tmp_path):
+
+    offline_config(monkeypatch, tmp_path, ['AAA'])
+    predictor = StockPredictor('AAA', verbose=False)
+    assert predictor.fetch_data()
+    bars = predictor.data
+    predictor.data = bars.iloc[:-40]
+    assert predictor.create_features() and predictor.train_model()
+    held_out = predictor.test_index
+    key = predictor._model_key()
+
+    assert predictor.append_bars(bars.iloc[-40:]) == 40
+    fitted = []
+    fit = type(predictor.model).fit
+    monkeypatch.setattr(type(predictor.model), 'fit', lambda model, X, y: fitted.append(X.index) or fit(model, X, y))
+    assert predictor.update_model(n_trees=5)
+
+    # the new trees never see a held-out row, old or new
+    assert held_out.isin(predictor.test_index).all()
+    assert len(predictor.test_index) > len(held_out)
+    assert not fitted[0].isin(predictor.test_index).any()
+    assert len(fitted[0]) + len(predictor.test_index) == len(predictor.features)
+    expected = accuracy_score(predictor.target[predictor.test_index],
+                              predictor.model.predict(predictor.features.loc[predictor.test_index]))
+    assert predictor.accuracy == expected
+
+    # the grown model is the newest stored version, and brings its held-out rows along
+    latest = predictor.model_store.versions(key)[0]
+    assert latest['version'] == predictor.model_version and latest['accuracy'] == expected
+    loaded = StockPredictor('AAA', verbose=False)
+    assert loaded.fetch_data() and loaded.create_features() and loaded.load_model()
+    assert loaded.model.n_estimators == predictor.model.n_estimators
+    assert loaded.test_index.equals(predictor.test_index)
+    np.testing.assert_array_equal(loaded.model.predict_proba(loaded.features),
+                                  predictor.model.predict_proba(loaded.features))
+
+def test_compact_features_match_full_features(monkeypatch, tmp_path):
+
+    offline_config(monkeypatch, tmp_path, ['AAA'])
+    full = StockPredictor('AAA', verbose=False, compact=False)
+    assert full.fetch_data() and full.create_features()
+    mapped_dir = tmp_path / 'mapped'
+    for memmap in (False, True):
+        monkeypatch.setitem(config.MEMORY_SETTINGS, 'memmap_directory', str(mapped_dir) if memmap else None)
+        compact = StockPredictor('AAA', verbose=False, compact=True)
+        assert compact.fetch_data() and compact.create_features()
+        assert list(compact.features.columns) == list(full.features.columns)
+        assert compact.features.index.equals(full.features.index)
+        assert compact.target.equals(full.target.astype(compact.target.dtype))
+        assert (compact.features.dtypes == np.float32).all()
+        np.testing.assert_allclose(compact.features.to_numpy(dtype=np.float64),
+                                   full.features.to_numpy(dtype=np.float64), rtol=1e-6, atol=1e-6)
+
+        usage = compact.memory_usage()
+        assert usage['features'] == compact.features.size * 4
+        assert usage['total'] < full.memory_usage()['total']
+        assert usage['mapped'] == (usage['features'] if memmap else 0)
+    # the mapped file is gone from the directory, the mapping keeps its data
+    assert list(mapped_dir.iterdir()) == []
@@ -0,0 +1,265 @@
+"""
+Benchmarks for the micrograd engine and nn.
+
+    python bench.py                          # print a report
+    python bench.py --out results.json       # also save it
+    python bench.py --compare old.json       # ratios against an earlier run
+    python bench.py --quick                  # smaller sizes, for CI
+
+Covers forward and backward throughput of Value graphs of increasing depth and
+width, MLP training steps per second (per-sample graphs, forward_batch, traced
+kernels and TensorMLP) and peak memory per node, including the original
+closure-based node (kept below as LegacyValue, verbatim apart from the name) as
+a fixed reference point.
+"""
+
+import gc
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tracemalloc
+
+import numpy as np
+
+from micrograd.engine import Value, Tensor
+from micrograd.nn import MLP, TensorMLP
+from micrograd.optim import SGD
+from micrograd.compiler import trace
+
+class LegacyValue:
+    """ the original Value: a __dict__, a set of children and a closure per node """
+
+    def __init__(self, data, _children=(), _op=''):
+        self.data = data
+        self.grad = 0
+        self._backward = lambda: None
+        self._prev = set(_children)
+        self._op = _op
+
+    def __add__(self, other):
+        other = other if isinstance(other, LegacyValue) else LegacyValue(other)
+        out = LegacyValue(self.data + other.data, (self, other), '+')
+
+        def _backward():
+            self.grad += out.grad
+            other.grad += out.grad
+        out._backward = _backward
+
+        return out
+
+    def __mul__(self, other):
+        other = other if isinstance(other, LegacyValue) else LegacyValue(other)
+        out = LegacyValue(self.data * other.data, (self, other), '*')
+
+        def _backward():
+            self.grad += other.data * out.grad
+            other.grad += self.data * out.grad
+        out._backward = _backward
+
+        return out
+
+    def relu(self):
+        out = LegacyValue(0 if self.data < 0 else self.data, (self,), 'ReLU')
+
+        def _backward():
+            self.grad += (out.data > 0) * out.grad
+        out._backward = _backward
+
+        return out
+
+    def backward(self):
+        topo = []
+        visited = set()
+        stack = [(self, False)]
+        while stack:
+            v, expanded = stack.pop()
+            if expanded:
+                topo.append(v)
+            elif v not in visited:
+                visited.add(v)
+                stack.append((v, True))
+                stack.extend((child, False) for child in v._prev if child not in visited)
+        self.grad = 1
+        for v in reversed(topo):
+            v._backward()
+
+def count_nodes(root):
+    seen, stack = set(), [root]
+    while stack:
+        v = stack.pop()
+        if v not in seen:
+            seen.add(v)
+            stack.extend(v._prev)
+    return len(seen)
+
+def build_graph(cls, nin=256, nout=64):
+    # one dense relu layer followed by a sum, i.e. what a micrograd Layer + loss builds
+    x = [cls(random.uniform(-1, 1)) for _ in range(nin)]
+    out = cls(0.0)
+    for _ in range(nout):
+        act = cls(0.0)
+        for xi in x:
+            act = act + cls(random.uniform(-1, 1)) * xi
+        out = out + act.relu()
+    return out
+
+def best_of(fn, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def peak_bytes_per_node(cls):
+    gc.collect()
+    tracemalloc.start()
+    root = build_graph(cls)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / count_nodes(root)
+
+def bench_nodes(repeats):
+    # the reference graph for both node types: nodes/s covers build + backward
+    results = {}
+    for name, cls in (('legacy', LegacyValue), ('value', Value)):
+        seconds = best_of(lambda: build_graph(cls).backward(), repeats)
+        results[name] = {
+            'peak_bytes_per_node': peak_bytes_per_node(cls),
+            'nodes_per_second': count_nodes(build_graph(cls)) / seconds,
+        }
+    return results
+
+def grid_graph(depth, width):
+    # width independent lanes, each step mixes a lane with its neighbour
+    x = [Value(random.uniform(-1, 1)) for _ in range(width)]
+    for _ in range(depth):
+        x = [(xi * 0.5 + x[(i + 1) % width]).tanh() for i, xi in enumerate(x)]
+    return sum(x)
+
+def bench_graphs(shapes, repeats):
+    results = []
+    for depth, width in shapes:
+        roots = []
+        forward = best_of(lambda: roots.append(grid_graph(depth, width)), repeats)
+        nodes = count_nodes(roots[-1])
+        backward = best_of(lambda: roots[-1].backward(), repeats)
+        results.append({
+            'depth': depth,
+            'width': width,
+            'nodes': nodes,
+            'forward_nodes_per_second': nodes / forward,
+            'backward_nodes_per_second': nodes / backward,
+        })
+    return results
+
+def bench_mlp(nin, nouts, batch_size, repeats):
+    rng = np.random.RandomState(0)
+    X = rng.randn(batch_size, nin)
+    y = rng.choice([-1.0, 1.0], batch_size)
+
+    model = MLP(nin, nouts)
+    opt = SGD(model.parameters(), lr=0.01)
+
+    def per_sample():
+        losses = [(1 + -yi * model(list(xi))).relu() for xi, yi in zip(X, y)]
+        loss = sum(losses) * (1.0 / batch_size)
+        opt.zero_grad()
+        loss.backward()
+        opt.step()
+
+    def batched():
+        loss = (1 - model.forward_batch(X) * y[:, None]).relu().mean()
+        opt.zero_grad()
+        loss.backward()
+        opt.step()
+
+    kernel = trace(lambda v: (1 + -v[-1] * model(v[:-1])).relu() * (1.0 / batch_size), nin + 1, model.parameters())
+    rows = np.column_stack([X, y]).tolist()
+    def traced():
+        opt.zero_grad()
+        for row in rows:
+            kernel(row)
+        opt.step()
+
+    tmodel = TensorMLP(nin, nouts)
+    topt = SGD(tmodel.parameters(), lr=0.01)
+    def tensor():
+        loss = (1 - tmodel(X) * y[:, None]).relu().mean()
+        topt.zero_grad()
+        loss.backward()
+        topt.step()
+
+    results = {'nin': nin, 'nouts': nouts, 'batch_size': batch_size}
+    for name, step in (('per_sample', per_sample), ('forward_batch', batched),
+                       ('kernel', traced), ('tensor_mlp', tensor)):
+        results[f'{name}_steps_per_second'] = 1 / best_of(step, repeats)
+    return results
+
+def run(quick=False):
+    random.seed(1337)
+    np.random.seed(1337)
+    repeats = 2 if quick else 3
+    shapes = [(4, 16), (16, 64), (64, 64)] if quick else [(4, 16), (16, 64), (64, 64), (64, 256), (256, 256)]
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'quick': quick,
+        },
+        'nodes': bench_nodes(repeats),
+        'graphs': bench_graphs(shapes, repeats),
+        'mlp': bench_mlp(16, [16, 16, 1], 32, repeats) if quick else bench_mlp(64, [32, 32, 1], 64, repeats),
+    }
+
+def report(results, baseline=None):
+    def ratio(new, old):
+        return f"  ({new / old:.2f}x)" if old else ''
+
+    base = baseline or {}
+    print("node memory and throughput (build + backward)")
+    for name, r in results['nodes'].items():
+        old = base.get('nodes', {}).get(name, {})
+        print(f"  {name:>8}: {r['peak_bytes_per_node']:8.1f} peak bytes/node"
+              f" {r['nodes_per_second']:12,.0f} nodes/s{ratio(r['nodes_per_second'], old.get('nodes_per_second'))}")
+
+    print("Value graphs, nodes/s")
+    old_graphs = {(g['depth'], g['width']): g for g in base.get('graphs', [])}
+    for g in results['graphs']:
+        old = old_graphs.get((g['depth'], g['width']), {})
+        print(f"  depth {g['depth']:>4} width {g['width']:>4} ({g['nodes']:>7} nodes):"
+              f" forward {g['forward_nodes_per_second']:12,.0f}{ratio(g['forward_nodes_per_second'], old.get('forward_nodes_per_second'))}"
+              f" backward {g['backward_nodes_per_second']:12,.0f}{ratio(g['backward_nodes_per_second'], old.get('backward_nodes_per_second'))}")
+
+    m = results['mlp']
+    print(f"MLP({m['nin']}, {m['nouts']}) training steps/s at batch size {m['batch_size']}")
+    for key, value in m.items():
+        if key.endswith('_steps_per_second'):
+            print(f"  {key[:-len('_steps_per_second')]:>14}: {value:10.2f}{ratio(value, base.get('mlp', {}).get(key))}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="micrograd benchmarks")
+    parser.add_argument('--out', help="write the results to this JSON file")
+    parser.add_argument('--compare', help="JSON file of an earlier run to compare against")
+    parser.add_argument('--quick', action='store_true', help="smaller sizes and fewer repeats")
+    args = parser.parse_args(argv)
+
+    results = run(quick=args.quick)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    report(results, baseline)
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"saved {args.out}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
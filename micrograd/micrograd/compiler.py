@@ -0,0 +1,162 @@
+import math
+from micrograd.engine import Value, build_topo, _softmax_probs
+
+# straight-line python for each fixed-arity op code: the forward expression and the
+# gradient pushed into each child. {o} is the output, {a} and {b} the children, {k}
+# the op's non-Value operand and {g} the output's gradient.
+_FORWARD = {
+    '+': '{a} + {b}',
+    '*': '{a} * {b}',
+    '**': '{a} ** {k}',
+    '/': '{a} / {b}',
+    'ReLU': '{a} if {a} > 0 else 0',
+    'exp': 'exp({a})',
+    'log': 'log({a})',
+    'tanh': 'tanh({a})',
+    'sigmoid': '0.5 * (1 + tanh(0.5 * {a}))',
+}
+_GRADIENTS = {
+    '+': ('{g}', '{g}'),
+    '*': ('{b} * {g}', '{a} * {g}'),
+    '**': ('{k} * {a} ** ({k} - 1) * {g}',),
+    '/': ('{g} / {b}', '-{g} * {o} / {b}'),
+    'ReLU': ('({o} > 0) * {g}',),
+    'exp': ('{o} * {g}',),
+    'log': ('{g} / {a}',),
+    'tanh': ('(1 - {o}**2) * {g}',),
+    'sigmoid': ('{o} * (1 - {o}) * {g}',),
+}
+_CHUNK = 64 # terms per statement of an unrolled affine, keeps the compiler's ast shallow
+
+def _forward_lines(op, o, c, k, shared):
+    """ statements that compute v{o}, c holds the children's expressions """
+    if op in _FORWARD:
+        return [f'v{o} = ' + _FORWARD[op].format(o=f'v{o}', k=repr(k), **dict(zip('ab', c)))]
+    if op == 'affine':
+        terms = [f'{w} * {x}' for w, x in zip(c[:k], c[k:2*k])]
+        lines = [f'v{o} = ' + ' + '.join([c[-1]] + terms[:_CHUNK])]
+        lines += [f'v{o} = v{o} + ' + ' + '.join(terms[i:i+_CHUNK]) for i in range(_CHUNK, len(terms), _CHUNK)]
+        return lines
+    # softmax and cross-entropy share one evaluation of the probabilities per set of logits
+    lines = []
+    if c not in shared:
+        shared[c] = (f'p{o}', f'l{o}')
+        lines.append(f"p{o}, l{o} = _softmax(({', '.join(c)},))")
+    p, lse = shared[c]
+    if op == 'softmax':
+        return lines + [f'v{o} = {p}[{k[0]}]']
+    return lines + [f'v{o} = {lse} - {c[k[0]]}'] # 'xent'
+
+def _gradient(op, o, j, c, k, shared):
+    """ expression for the gradient that node o pushes into its j-th child """
+    g = f'g{o}'
+    if op in _GRADIENTS:
+        return _GRADIENTS[op][j].format(o=f'v{o}', g=g, k=repr(k), **dict(zip('ab', c)))
+    if op == 'affine':
+        return f'{c[k+j]} * {g}' if j < k else f'{c[j-k]} * {g}' if j < 2*k else g
+    p, _ = shared[c]
+    if op == 'softmax':
+        return f'{g} * {p}[{k[0]}] * ({int(k[0] == j)} - {p}[{j}])'
+    return f'{g} * ({p}[{j}] - 1)' if j == k[0] else f'{g} * {p}[{j}]' # 'xent'
+
+class Kernel:
+    """ a micrograd graph traced once and compiled to straight-line python
+
+    Replaying the kernel evaluates the same expression for new input values without
+    allocating any Value nodes. Every leaf that is neither an input nor a parameter is
+    frozen as a constant with the value it had when the graph was traced. Parameters
+    are read from their Value's .data on every call, so they can keep training.
+    """
+
+    def __init__(self, root, inputs, params=()):
+        self.outputs = list(root) if isinstance(root, (list, tuple)) else [root]
+        self.inputs = list(inputs)
+        self.params = list(params)
+        # the flat instruction list, children before parents:
+        # (op, out index, child indices, non-Value operand)
+        self.instructions = []
+        self.source = self._generate()
+        namespace = {'P': self.params, 'inf': float('inf'), 'nan': float('nan'),
+                     'exp': math.exp, 'log': math.log, 'tanh': math.tanh, '_softmax': _softmax_probs}
+        exec(compile(self.source, f'<micrograd kernel {id(self):x}>', 'exec'), namespace)
+        self._forward = namespace['forward']
+        self._backward = namespace.get('backward')
+
+    def _generate(self):
+        # one topological order over every output, shared nodes are only visited once
+        order, index = [], {}
+        for out in self.outputs:
+            for v in build_topo(out):
+                if v not in index:
+                    index[v] = len(order)
+                    order.append(v)
+        for v in order:
+            if v._op:
+                self.instructions.append((v._op, index[v], tuple(index[c] for c in v._prev), v._arg))
+
+        input_ids = {index[v] for v in self.inputs if v in index}
+        param_ids = {index[p]: k for k, p in enumerate(self.params) if p in index}
+        # only nodes that depend on a parameter need a gradient
+        needs_grad = set(param_ids)
+        for op, o, children, k in self.instructions:
+            if any(c in needs_grad for c in children):
+                needs_grad.add(o)
+
+        def val(i):
+            v = order[i]
+            if v._op or i in param_ids or i in input_ids:
+                return f'v{i}'
+            c = repr(float(v.data)) # a traced constant
+            return f'({c})' if c.startswith('-') else c
+
+        lines = ['def forward(x):']
+        lines.append(f"    {', '.join(f'v{index[v]}' if v in index else '_' for v in self.inputs)}, = x")
+        lines += [f'    v{i} = P[{k}].data' for i, k in param_ids.items()]
+        shared = {}
+        for op, o, children, k in self.instructions:
+            lines += ['    ' + line for line in _forward_lines(op, o, tuple(map(val, children)), k, shared)]
+        forward_lines = lines[1:]
+        lines.append(f"    return {', '.join(f'v{index[v]}' for v in self.outputs)},")
+
+        if len(self.outputs) == 1 and self.outputs[0] in index and needs_grad:
+            root = index[self.outputs[0]]
+            lines.append('def backward(x):')
+            lines += forward_lines
+            lines.append(f'    g{root} = 1')
+            assigned = {root}
+            for op, o, children, k in reversed(self.instructions):
+                if o not in assigned:
+                    continue # no parameter upstream of this node
+                names = tuple(map(val, children))
+                for j, c in enumerate(children):
+                    if c not in needs_grad:
+                        continue
+                    grad = _gradient(op, o, j, names, k, shared)
+                    lines.append(f"    g{c} {'+=' if c in assigned else '='} {grad}")
+                    assigned.add(c)
+            lines += [f'    P[{k}].grad += g{i}' for i, k in param_ids.items() if i in assigned]
+            lines.append(f'    return v{root}')
+        return '\n'.join(lines) + '\n'
+
+    def forward(self, x):
+        """ evaluate the outputs for the input values x, a single float per output """
+        out = self._forward(x)
+        return out[0] if len(out) == 1 else list(out)
+
+    def __call__(self, x):
+        """ forward and backward for the input values x, like root.backward() this
+        accumulates into the .grad of every parameter and returns the root's value """
+        assert self._backward is not None, "backward needs a single output that depends on a parameter"
+        return self._backward(x)
+
+    def __repr__(self):
+        return f"Kernel(instructions={len(self.instructions)}, inputs={len(self.inputs)}, params={len(self.params)})"
+
+def trace(fn, nin, params=()):
+    """ call fn once on nin placeholder inputs and compile the graph it builds
+
+    fn takes a list of Values, e.g. a micrograd.nn model or a closure that computes a
+    loss. Python-level branching on input data inside fn is frozen at trace time.
+    """
+    inputs = [Value(0.0) for _ in range(nin)]
+    return Kernel(fn(inputs), inputs, params)
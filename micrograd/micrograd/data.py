@@ -0,0 +1,24 @@
+import numpy as np
+
+class DataLoader:
+    """ iterates over (X, y) in mini-batches of numpy arrays, reshuffled every epoch """
+
+    def __init__(self, X, y, batch_size=32, shuffle=True, drop_last=False):
+        self.X = np.asarray(X)
+        self.y = np.asarray(y)
+        assert len(self.X) == len(self.y), "X and y need the same number of samples"
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+
+    def __iter__(self):
+        n = len(self.X)
+        order = np.random.permutation(n) if self.shuffle else np.arange(n)
+        stop = n - n % self.batch_size if self.drop_last else n
+        for i in range(0, stop, self.batch_size):
+            idx = order[i:i+self.batch_size]
+            yield self.X[idx], self.y[idx]
+
+    def __len__(self):
+        n = len(self.X)
+        return n // self.batch_size if self.drop_last else -(-n // self.batch_size)
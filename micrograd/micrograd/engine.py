@@ -1,71 +1,461 @@
+import math
+from contextlib import contextmanager
+from contextvars import ContextVar
+import numpy as np
+
+# when False, ops still compute their result but don't record a graph: no children,
+# no op code and no backward closure, so nothing is kept alive for backward().
+# a context variable, so a no_grad() block in one thread (or asyncio task) never
+# switches off graph building in another
+_grad_enabled = ContextVar('grad_enabled', default=True)
+
+def is_grad_enabled():
+    return _grad_enabled.get()
+
+@contextmanager
+def no_grad():
+    """ disable graph construction inside the block, e.g. for inference. only affects
+    the current thread / asyncio task """
+    token = _grad_enabled.set(False)
+    try:
+        yield
+    finally:
+        _grad_enabled.reset(token)
+
+def build_topo(root):
+    """ topological order of the graph ending at root, children before parents """
+    # iterative post-order dfs, so that deep graphs (e.g. the long sum chain of a
+    # wide Neuron) don't run into python's recursion limit
+    topo = []
+    visited = set()
+    stack = [(root, False)]
+    while stack:
+        v, expanded = stack.pop()
+        if expanded:
+            topo.append(v)
+        elif v not in visited:
+            visited.add(v)
+            stack.append((v, True))
+            stack.extend((child, False) for child in v._prev if child not in visited)
+    return topo
 
 class Value:
     """ stores a single scalar value and its gradient """
 
-    def __init__(self, data, _children=(), _op=''):
+    # compact nodes: no per-instance __dict__, a tuple of children and an op code
+    # that selects a shared backward rule instead of a fresh closure per node
+    __slots__ = ('data', 'grad', '_prev', '_op', '_arg')
+
+    def __init__(self, data, _children=(), _op='', _arg=None):
         self.data = data
         self.grad = 0
         # internal variables used for autograd graph construction
-        self._backward = lambda: None
-        self._prev = set(_children)
+        if not _grad_enabled.get():
+            _children, _op, _arg = (), '', None
+        self._prev = _children
         self._op = _op # the op that produced this node, for graphviz / debugging / etc
+        self._arg = _arg # non-Value operand of the op, e.g. the exponent of '**'
 
     def __add__(self, other):
         other = other if isinstance(other, Value) else Value(other)
-        out = Value(self.data + other.data, (self, other), '+')
+        return Value(self.data + other.data, (self, other), '+')
+
+    def __mul__(self, other):
+        other = other if isinstance(other, Value) else Value(other)
+        return Value(self.data * other.data, (self, other), '*')
+
+    def __pow__(self, other):
+        assert isinstance(other, (int, float)), "only supporting int/float powers for now"
+        return Value(self.data**other, (self,), '**', other)
+
+    def __truediv__(self, other): # self / other
+        other = other if isinstance(other, Value) else Value(other)
+        return Value(self.data / other.data, (self, other), '/')
+
+    def relu(self):
+        return Value(0 if self.data < 0 else self.data, (self,), 'ReLU')
+
+    def exp(self):
+        return Value(math.exp(self.data), (self,), 'exp')
+
+    def log(self):
+        return Value(math.log(self.data), (self,), 'log')
+
+    def tanh(self):
+        return Value(math.tanh(self.data), (self,), 'tanh')
+
+    def sigmoid(self):
+        # written through tanh so that large |x| can't overflow math.exp
+        return Value(0.5 * (1 + math.tanh(0.5 * self.data)), (self,), 'sigmoid')
+
+    # backward rules, one per op code. each pushes self.grad into the children
+
+    def _add_backward(self):
+        a, b = self._prev
+        a.grad += self.grad
+        b.grad += self.grad
+
+    def _mul_backward(self):
+        a, b = self._prev
+        a.grad += b.data * self.grad
+        b.grad += a.data * self.grad
+
+    def _pow_backward(self):
+        a, = self._prev
+        a.grad += (self._arg * a.data**(self._arg-1)) * self.grad
+
+    def _div_backward(self):
+        a, b = self._prev
+        a.grad += self.grad / b.data
+        b.grad -= self.grad * self.data / b.data
+
+    def _relu_backward(self):
+        a, = self._prev
+        a.grad += (self.data > 0) * self.grad
+
+    def _exp_backward(self):
+        a, = self._prev
+        a.grad += self.data * self.grad
+
+    def _log_backward(self):
+        a, = self._prev
+        a.grad += self.grad / a.data
+
+    def _tanh_backward(self):
+        a, = self._prev
+        a.grad += (1 - self.data**2) * self.grad
+
+    def _sigmoid_backward(self):
+        a, = self._prev
+        a.grad += self.data * (1 - self.data) * self.grad
+
+    def _affine_backward(self):
+        # children are w_1..w_n, x_1..x_n, b and _arg is n
+        c, n, g = self._prev, self._arg, self.grad
+        for wi, xi in zip(c[:n], c[n:2*n]):
+            wi.grad += xi.data * g
+            xi.grad += wi.data * g
+        c[-1].grad += g
+
+    def _softmax_backward(self):
+        # output i of a softmax over all children, _arg is (i, probabilities)
+        i, p = self._arg
+        gp = self.grad * p[i]
+        for j, a in enumerate(self._prev):
+            a.grad += gp * ((i == j) - p[j])
+
+    def _cross_entropy_backward(self):
+        # children are the logits, _arg is (target index, probabilities)
+        t, p = self._arg
+        for j, a in enumerate(self._prev):
+            a.grad += self.grad * (p[j] - (j == t))
+
+    def _leaf_backward(self):
+        pass
+
+    _BACKWARD = {
+        '': _leaf_backward,
+        '+': _add_backward,
+        '*': _mul_backward,
+        '**': _pow_backward,
+        '/': _div_backward,
+        'ReLU': _relu_backward,
+        'exp': _exp_backward,
+        'log': _log_backward,
+        'tanh': _tanh_backward,
+        'sigmoid': _sigmoid_backward,
+        'affine': _affine_backward,
+        'softmax': _softmax_backward,
+        'xent': _cross_entropy_backward,
+    }
+
+    def _backward(self):
+        self._BACKWARD[self._op](self)
+
+    def backward(self):
+
+        # topological order all of the children in the graph
+        topo = build_topo(self)
+
+        # go one variable at a time and apply the chain rule to get its gradient
+        self.grad = 1
+        rules = self._BACKWARD
+        for v in reversed(topo):
+            rules[v._op](v)
+
+    def __neg__(self): # -self
+        return self * -1
+
+    def __radd__(self, other): # other + self
+        return self + other
+
+    def __sub__(self, other): # self - other
+        return self + (-other)
+
+    def __rsub__(self, other): # other - self
+        return other + (-self)
+
+    def __rmul__(self, other): # other * self
+        return self * other
+
+    def __rtruediv__(self, other): # other / self
+        return Value(other) / self
+
+    def __repr__(self):
+        return f"Value(data={self.data}, grad={self.grad})"
+
+
+# fused ops over lists of Values: one node with a hand-written backward rule
+# instead of the chain of +, * and ** nodes they would otherwise expand into
+
+def _softmax_probs(logits):
+    m = max(logits)
+    e = [math.exp(z - m) for z in logits]
+    s = sum(e)
+    return tuple(ei / s for ei in e), m + math.log(s)
+
+def affine(w, x, b):
+    """ w·x + b as a single node, x may mix Values and plain numbers """
+    x = [xi if isinstance(xi, Value) else Value(xi) for xi in x]
+    b = b if isinstance(b, Value) else Value(b)
+    act = b.data
+    for wi, xi in zip(w, x):
+        act += wi.data * xi.data
+    return Value(act, (*w, *x, b), 'affine', len(w))
+
+def softmax(logits):
+    """ softmax over a list of Values, returns a list of Values """
+    logits = tuple(logits)
+    p, _ = _softmax_probs([z.data for z in logits])
+    return [Value(pi, logits, 'softmax', (i, p)) for i, pi in enumerate(p)]
+
+def cross_entropy(logits, target):
+    """ -log(softmax(logits)[target]) as a single node, target is a class index """
+    logits = tuple(logits)
+    data = [z.data for z in logits]
+    p, lse = _softmax_probs(data)
+    return Value(lse - data[target], logits, 'xent', (target, p))
+
+def _unbroadcast(grad, shape):
+    # sum out the dimensions that numpy broadcasting added or stretched
+    while grad.ndim > len(shape):
+        grad = grad.sum(axis=0)
+    for i, dim in enumerate(shape):
+        if dim == 1 and grad.shape[i] != 1:
+            grad = grad.sum(axis=i, keepdims=True)
+    return grad
+
+def _expand(grad, shape, axis, keepdims):
+    # undo a reduction over axis so that grad lines up with an input of shape
+    if axis is not None and not keepdims:
+        grad = np.expand_dims(grad, axis)
+    return np.broadcast_to(grad, shape)
+
+class Tensor:
+    """ stores an n-dimensional array of float64 values and its gradient """
+
+    __array_ufunc__ = None # make numpy defer to our reflected ops, e.g. ndarray + Tensor
+
+    def __init__(self, data, _children=(), _op=''):
+        self.data = np.asarray(data, dtype=np.float64)
+        self.grad = np.zeros_like(self.data)
+        # internal variables used for autograd graph construction
+        self._backward = lambda: None
+        self._prev = set(_children) if _grad_enabled.get() else set()
+        self._op = _op # the op that produced this node, for graphviz / debugging / etc
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    def __add__(self, other):
+        other = other if isinstance(other, Tensor) else Tensor(other)
+        out = Tensor(self.data + other.data, (self, other), '+')
 
         def _backward():
-            self.grad += out.grad
-            other.grad += out.grad
-        out._backward = _backward
+            self.grad += _unbroadcast(out.grad, self.data.shape)
+            other.grad += _unbroadcast(out.grad, other.data.shape)
+        if _grad_enabled.get():
+            out._backward = _backward
 
         return out
 
     def __mul__(self, other):
-        other = other if isinstance(other, Value) else Value(other)
-        out = Value(self.data * other.data, (self, other), '*')
+        other = other if isinstance(other, Tensor) else Tensor(other)
+        out = Tensor(self.data * other.data, (self, other), '*')
 
         def _backward():
-            self.grad += other.data * out.grad
-            other.grad += self.data * out.grad
-        out._backward = _backward
+            self.grad += _unbroadcast(other.data * out.grad, self.data.shape)
+            other.grad += _unbroadcast(self.data * out.grad, other.data.shape)
+        if _grad_enabled.get():
+            out._backward = _backward
 
         return out
 
     def __pow__(self, other):
         assert isinstance(other, (int, float)), "only supporting int/float powers for now"
-        out = Value(self.data**other, (self,), f'**{other}')
+        out = Tensor(self.data**other, (self,), f'**{other}')
 
         def _backward():
             self.grad += (other * self.data**(other-1)) * out.grad
-        out._backward = _backward
+        if _grad_enabled.get():
+            out._backward = _backward
+
+        return out
+
+    def __matmul__(self, other):
+        other = other if isinstance(other, Tensor) else Tensor(other)
+        out = Tensor(self.data @ other.data, (self, other), '@')
+
+        def _backward():
+            # promote vectors to matrices so both cases share the same rule
+            a = self.data if self.data.ndim > 1 else self.data[None, :]
+            b = other.data if other.data.ndim > 1 else other.data[:, None]
+            batch = np.broadcast_shapes(a.shape[:-2], b.shape[:-2])
+            g = out.grad.reshape(batch + (a.shape[-2], b.shape[-1]))
+            da = g @ np.swapaxes(b, -1, -2)
+            db = np.swapaxes(a, -1, -2) @ g
+            self.grad += _unbroadcast(da, a.shape).reshape(self.data.shape)
+            other.grad += _unbroadcast(db, b.shape).reshape(other.data.shape)
+        if _grad_enabled.get():
+            out._backward = _backward
+
+        return out
+
+    def sum(self, axis=None, keepdims=False):
+        out = Tensor(self.data.sum(axis=axis, keepdims=keepdims), (self,), 'sum')
+
+        def _backward():
+            self.grad += _expand(out.grad, self.data.shape, axis, keepdims)
+        if _grad_enabled.get():
+            out._backward = _backward
+
+        return out
+
+    def mean(self, axis=None, keepdims=False):
+        out = Tensor(self.data.mean(axis=axis, keepdims=keepdims), (self,), 'mean')
+        n = self.data.size // max(out.data.size, 1)
+
+        def _backward():
+            self.grad += _expand(out.grad, self.data.shape, axis, keepdims) / n
+        if _grad_enabled.get():
+            out._backward = _backward
+
+        return out
+
+    def max(self, axis=None, keepdims=False):
+        out = Tensor(self.data.max(axis=axis, keepdims=keepdims), (self,), 'max')
+
+        def _backward():
+            # ties share the gradient evenly
+            mask = self.data == _expand(out.data, self.data.shape, axis, keepdims)
+            count = mask.sum(axis=axis, keepdims=True)
+            self.grad += mask * _expand(out.grad, self.data.shape, axis, keepdims) / count
+        if _grad_enabled.get():
+            out._backward = _backward
 
         return out
 
     def relu(self):
-        out = Value(0 if self.data < 0 else self.data, (self,), 'ReLU')
+        out = Tensor(np.maximum(self.data, 0), (self,), 'ReLU')
 
         def _backward():
             self.grad += (out.data > 0) * out.grad
-        out._backward = _backward
+        if _grad_enabled.get():
+            out._backward = _backward
+
+        return out
+
+    def __truediv__(self, other): # self / other
+        other = other if isinstance(other, Tensor) else Tensor(other)
+        out = Tensor(self.data / other.data, (self, other), '/')
+
+        def _backward():
+            self.grad += _unbroadcast(out.grad / other.data, self.data.shape)
+            other.grad -= _unbroadcast(out.grad * out.data / other.data, other.data.shape)
+        if _grad_enabled.get():
+            out._backward = _backward
+
+        return out
+
+    def exp(self):
+        out = Tensor(np.exp(self.data), (self,), 'exp')
+
+        def _backward():
+            self.grad += out.data * out.grad
+        if _grad_enabled.get():
+            out._backward = _backward
+
+        return out
+
+    def log(self):
+        out = Tensor(np.log(self.data), (self,), 'log')
+
+        def _backward():
+            self.grad += out.grad / self.data
+        if _grad_enabled.get():
+            out._backward = _backward
+
+        return out
+
+    def tanh(self):
+        out = Tensor(np.tanh(self.data), (self,), 'tanh')
+
+        def _backward():
+            self.grad += (1 - out.data**2) * out.grad
+        if _grad_enabled.get():
+            out._backward = _backward
+
+        return out
+
+    def sigmoid(self):
+        out = Tensor(0.5 * (1 + np.tanh(0.5 * self.data)), (self,), 'sigmoid')
+
+        def _backward():
+            self.grad += out.data * (1 - out.data) * out.grad
+        if _grad_enabled.get():
+            out._backward = _backward
+
+        return out
+
+    def softmax(self, axis=-1):
+        e = np.exp(self.data - self.data.max(axis=axis, keepdims=True))
+        out = Tensor(e / e.sum(axis=axis, keepdims=True), (self,), 'softmax')
+
+        def _backward():
+            s = out.data
+            self.grad += s * (out.grad - (out.grad * s).sum(axis=axis, keepdims=True))
+        if _grad_enabled.get():
+            out._backward = _backward
+
+        return out
+
+    def cross_entropy(self, targets):
+        """ mean of -log(softmax(logits)[target]) over a (batch, classes) or (classes,)
+        Tensor of logits, targets holds integer class indices """
+        logits = self.data if self.data.ndim > 1 else self.data[None, :]
+        targets = np.atleast_1d(np.asarray(targets))
+        rows = np.arange(len(targets))
+        shifted = logits - logits.max(axis=1, keepdims=True)
+        lse = np.log(np.exp(shifted).sum(axis=1))
+        out = Tensor((lse - shifted[rows, targets]).mean(), (self,), 'xent')
+
+        def _backward():
+            p = np.exp(shifted - lse[:, None])
+            p[rows, targets] -= 1
+            self.grad += (out.grad * p / len(targets)).reshape(self.data.shape)
+        if _grad_enabled.get():
+            out._backward = _backward
 
         return out
 
     def backward(self):
 
         # topological order all of the children in the graph
-        topo = []
-        visited = set()
-        def build_topo(v):
-            if v not in visited:
-                visited.add(v)
-                for child in v._prev:
-                    build_topo(child)
-                topo.append(v)
-        build_topo(self)
+        topo = build_topo(self)
 
         # go one variable at a time and apply the chain rule to get its gradient
-        self.grad = 1
+        self.grad = np.ones_like(self.data)
         for v in reversed(topo):
             v._backward()
 
@@ -84,11 +474,35 @@ class Value:
     def __rmul__(self, other): # other * self
         return self * other
 
-    def __truediv__(self, other): # self / other
-        return self * other**-1
+    def __rmatmul__(self, other): # other @ self
+        return Tensor(other) @ self
 
     def __rtruediv__(self, other): # other / self
-        return other * self**-1
+        return Tensor(other) / self
 
     def __repr__(self):
-        return f"Value(data={self.data}, grad={self.grad})"
+        return f"Tensor(data={self.data}, grad={self.grad})"
+
+class Tape:
+    """ a graph's topological order, recorded once and replayed on every backward """
+
+    def __init__(self, root):
+        self.root = root
+        self.order = list(reversed(build_topo(root)))
+        self.interior = [v for v in self.order if v._prev]
+
+    def backward(self):
+        # interior grads are only valid for a single pass, leaf grads keep accumulating
+        # like they do with root.backward() so zero_grad() is still up to the caller
+        for v in self.interior:
+            v.grad = 0
+        root = self.root
+        root.grad = np.ones_like(root.data) if isinstance(root, Tensor) else 1
+        for v in self.order:
+            v._backward()
+
+    def __len__(self):
+        return len(self.order)
+
+    def __repr__(self):
+        return f"Tape(nodes={len(self.order)}, root={self.root._op or 'leaf'})"
@@ -1,5 +1,18 @@
 import random
-from micrograd.engine import Value
+import numpy as np
+from micrograd.engine import Value, Tensor, is_grad_enabled, affine
+from micrograd.optim import FlatParameters
+
+def _pack(values, shape):
+    """ a Tensor leaf holding the data of some Values, its grad flows back into them """
+    out = Tensor(np.fromiter((v.data for v in values), np.float64, len(values)).reshape(shape), (), 'pack')
+
+    def _backward():
+        for v, g in zip(values, np.ravel(out.grad).tolist()):
+            v.grad += g
+    out._backward = _backward
+
+    return out
 
 class Module:
 
@@ -10,6 +23,23 @@ class Module:
     def parameters(self):
         return []
 
+    def save(self, path):
+        """ write all parameters to path as one flat float64 .npy array """
+        np.save(path, FlatParameters(self.parameters()).gather('data'))
+
+    def load(self, path, mmap=False):
+        """ read parameters written by save() into this module, which must have the same
+        layout. with mmap=True the file is memory-mapped copy-on-write and Tensor
+        parameters become views into it, so nothing is read until it is used """
+        flat = np.load(path, mmap_mode='c' if mmap else None)
+        params = FlatParameters(self.parameters())
+        assert flat.shape == (params.n,), f"{path} holds {flat.size} parameters, the model has {params.n}"
+        if mmap:
+            params.bind(flat)
+        else:
+            params.scatter(flat)
+        return self
+
 class Neuron(Module):
 
     def __init__(self, nin, nonlin=True):
@@ -18,7 +48,11 @@ class Neuron(Module):
         self.nonlin = nonlin
 
     def __call__(self, x):
-        act = sum((wi*xi for wi,xi in zip(self.w, x)), self.b)
+        if not is_grad_enabled():
+            # inference: plain float math, x may hold Values or floats
+            act = sum((wi.data * (xi.data if isinstance(xi, Value) else xi) for wi,xi in zip(self.w, x)), self.b.data)
+            return Value(0 if act < 0 and self.nonlin else act)
+        act = affine(self.w, x, self.b)
         return act.relu() if self.nonlin else act
 
     def parameters(self):
@@ -36,6 +70,14 @@ class Layer(Module):
         out = [n(x) for n in self.neurons]
         return out[0] if len(out) == 1 else out
 
+    def forward_batch(self, X):
+        # one (nin, nout) matmul for the whole batch instead of a graph per sample
+        nin = len(self.neurons[0].w)
+        W = _pack([n.w[i] for i in range(nin) for n in self.neurons], (nin, len(self.neurons)))
+        b = _pack([n.b for n in self.neurons], (len(self.neurons),))
+        act = X @ W + b
+        return act.relu() if self.neurons[0].nonlin else act
+
     def parameters(self):
         return [p for n in self.neurons for p in n.parameters()]
 
@@ -53,8 +95,71 @@ class MLP(Module):
             x = layer(x)
         return x
 
+    def forward_batch(self, X):
+        """ forward a (batch, nin) array as one shared Tensor graph, returns (batch, nout).
+        backward() on anything computed from it accumulates into the Value parameters """
+        for layer in self.layers:
+            X = layer.forward_batch(X)
+        return X
+
     def parameters(self):
         return [p for layer in self.layers for p in layer.parameters()]
 
     def __repr__(self):
         return f"MLP of [{', '.join(str(layer) for layer in self.layers)}]"
+
+# -----------------------------------------------------------------------------
+# matrix-backed equivalents of the above, one Tensor per weight matrix instead
+# of one Value per scalar. inputs are (nin,) vectors or (batch, nin) matrices.
+
+class TensorNeuron(Module):
+
+    def __init__(self, nin, nonlin=True):
+        self.w = Tensor(np.random.uniform(-1, 1, nin))
+        self.b = Tensor(0.0)
+        self.nonlin = nonlin
+
+    def __call__(self, x):
+        act = x @ self.w + self.b
+        return act.relu() if self.nonlin else act
+
+    def parameters(self):
+        return [self.w, self.b]
+
+    def __repr__(self):
+        return f"{'ReLU' if self.nonlin else 'Linear'}TensorNeuron({self.w.data.shape[0]})"
+
+class TensorLayer(Module):
+
+    def __init__(self, nin, nout, nonlin=True):
+        self.w = Tensor(np.random.uniform(-1, 1, (nin, nout)))
+        self.b = Tensor(np.zeros(nout))
+        self.nonlin = nonlin
+
+    def __call__(self, x):
+        act = x @ self.w + self.b
+        return act.relu() if self.nonlin else act
+
+    def parameters(self):
+        return [self.w, self.b]
+
+    def __repr__(self):
+        nin, nout = self.w.data.shape
+        return f"{'ReLU' if self.nonlin else 'Linear'}TensorLayer({nin}, {nout})"
+
+class TensorMLP(Module):
+
+    def __init__(self, nin, nouts):
+        sz = [nin] + nouts
+        self.layers = [TensorLayer(sz[i], sz[i+1], nonlin=i!=len(nouts)-1) for i in range(len(nouts))]
+
+    def __call__(self, x):
+        for layer in self.layers:
+            x = layer(x)
+        return x
+
+    def parameters(self):
+        return [p for layer in self.layers for p in layer.parameters()]
+
+    def __repr__(self):
+        return f"TensorMLP of [{', '.join(str(layer) for layer in self.layers)}]"
@@ -0,0 +1,110 @@
+from abc import ABC, abstractmethod
+import numpy as np
+from micrograd.engine import Tensor
+
+class FlatParameters:
+    """ views a list of Value and/or Tensor parameters as one flat float64 array """
+
+    def __init__(self, params):
+        self.params = list(params)
+        self.sizes = [p.data.size if isinstance(p, Tensor) else 1 for p in self.params]
+        self.scalar = not any(isinstance(p, Tensor) for p in self.params)
+        self.n = sum(self.sizes)
+
+    def gather(self, attr):
+        """ the data or grad of every parameter, concatenated into one flat array """
+        if self.scalar:
+            return np.fromiter((getattr(p, attr) for p in self.params), np.float64, self.n)
+        return np.concatenate([np.ravel(np.broadcast_to(getattr(p, attr), np.shape(p.data)))
+                               for p in self.params]) if self.params else np.zeros(0)
+
+    def scatter(self, flat):
+        """ write a flat array back into the parameters' data """
+        if self.scalar:
+            for p, x in zip(self.params, flat.tolist()):
+                p.data = x
+            return
+        i = 0
+        for p, n in zip(self.params, self.sizes):
+            if isinstance(p, Tensor):
+                p.data[...] = flat[i:i+n].reshape(p.data.shape)
+            else:
+                p.data = float(flat[i])
+            i += n
+
+    def bind(self, flat):
+        """ like scatter, but Tensor parameters become views into flat instead of copies """
+        if self.scalar:
+            return self.scatter(flat)
+        i = 0
+        for p, n in zip(self.params, self.sizes):
+            if isinstance(p, Tensor):
+                p.data = flat[i:i+n].reshape(p.data.shape)
+            else:
+                p.data = float(flat[i])
+            i += n
+
+class Optimizer(FlatParameters, ABC):
+    """ base class, subclasses implement update() on the flat data and grad arrays """
+
+    def zero_grad(self):
+        for p in self.params:
+            p.grad = 0
+
+    def step(self):
+        data = self.gather('data')
+        self.update(data, self.gather('grad'))
+        self.scatter(data)
+
+    @abstractmethod
+    def update(self, data, grad):
+        """ update the flat data array in place from the flat grad array """
+
+class SGD(Optimizer):
+
+    def __init__(self, params, lr=0.01, momentum=0.0, weight_decay=0.0):
+        super().__init__(params)
+        self.lr = lr
+        self.momentum = momentum
+        self.weight_decay = weight_decay
+        self.velocity = np.zeros(self.n)
+
+    def update(self, data, grad):
+        if self.weight_decay:
+            grad = grad + self.weight_decay * data
+        if self.momentum:
+            self.velocity *= self.momentum
+            self.velocity += grad
+            grad = self.velocity
+        data -= self.lr * grad
+
+    def __repr__(self):
+        return f"SGD(lr={self.lr}, momentum={self.momentum}, weight_decay={self.weight_decay})"
+
+class Adam(Optimizer):
+
+    def __init__(self, params, lr=0.001, betas=(0.9, 0.999), eps=1e-8, weight_decay=0.0):
+        super().__init__(params)
+        self.lr = lr
+        self.betas = betas
+        self.eps = eps
+        self.weight_decay = weight_decay
+        self.m = np.zeros(self.n)
+        self.v = np.zeros(self.n)
+        self.t = 0
+
+    def update(self, data, grad):
+        beta1, beta2 = self.betas
+        if self.weight_decay:
+            grad = grad + self.weight_decay * data
+        self.t += 1
+        self.m *= beta1
+        self.m += (1 - beta1) * grad
+        self.v *= beta2
+        self.v += (1 - beta2) * grad**2
+        mhat = self.m / (1 - beta1**self.t)
+        vhat = self.v / (1 - beta2**self.t)
+        data -= self.lr * mhat / (np.sqrt(vhat) + self.eps)
+
+    def __repr__(self):
+        return f"Adam(lr={self.lr}, betas={self.betas}, eps={self.eps}, weight_decay={self.weight_decay})"
@@ -0,0 +1,91 @@
+import multiprocessing as mp
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+from micrograd.engine import Tensor
+from micrograd.optim import FlatParameters
+
+# per-process state of a pool worker, set up once by _init_worker
+_worker = {}
+
+def _init_worker(model, loss_fn, params_name, grads_name, nshards):
+    flat = FlatParameters(model.parameters())
+    params_shm, grads_shm = SharedMemory(name=params_name), SharedMemory(name=grads_name)
+    _worker.update(
+        model=model,
+        loss_fn=loss_fn,
+        flat=flat,
+        params=np.ndarray((flat.n,), np.float64, buffer=params_shm.buf),
+        grads=np.ndarray((nshards, flat.n), np.float64, buffer=grads_shm.buf),
+        shms=(params_shm, grads_shm), # keep the mappings alive with the worker
+    )
+
+def _shard_backward(args):
+    i, X, y = args
+    w = _worker
+    # sync the replica with the master's parameters, then backprop the shard
+    w['flat'].scatter(w['params'])
+    w['model'].zero_grad()
+    loss = w['loss_fn'](w['model'], X, y)
+    loss.backward()
+    w['grads'][i] = w['flat'].gather('grad')
+    return float(loss.data)
+
+class DataParallel:
+    """ shards each mini-batch across a process pool that holds one model replica per worker
+
+    loss_fn(model, X, y) is called on every shard and must return the mean loss over
+    it as a scalar Value or Tensor. It has to be picklable, i.e. a module-level function.
+    Gradients are reduced through shared memory, weighted by shard size, so backward()
+    leaves the same .grad on the master parameters as a single process would.
+    """
+
+    def __init__(self, model, loss_fn, processes=None):
+        self.model = model
+        self.flat = FlatParameters(model.parameters())
+        self.processes = processes or mp.cpu_count()
+        nbytes = max(self.flat.n, 1) * 8
+        self._params_shm = SharedMemory(create=True, size=nbytes)
+        self._grads_shm = SharedMemory(create=True, size=nbytes * self.processes)
+        self.params = np.ndarray((self.flat.n,), np.float64, buffer=self._params_shm.buf)
+        self.grads = np.ndarray((self.processes, self.flat.n), np.float64, buffer=self._grads_shm.buf)
+        self.pool = mp.Pool(self.processes, initializer=_init_worker,
+                            initargs=(model, loss_fn, self._params_shm.name, self._grads_shm.name, self.processes))
+
+    def backward(self, X, y):
+        """ accumulate the gradient of the batch loss into the model's parameters, returns the loss """
+        X, y = np.asarray(X), np.asarray(y)
+        self.params[:] = self.flat.gather('data')
+        shards = [idx for idx in np.array_split(np.arange(len(X)), self.processes) if len(idx)]
+        losses = self.pool.map(_shard_backward, [(i, X[idx], y[idx]) for i, idx in enumerate(shards)])
+        weights = np.array([len(idx) for idx in shards], np.float64) / len(X)
+        grad = weights @ self.grads[:len(shards)]
+        for p, g in zip(self.flat.params, self._split(grad)):
+            p.grad += g
+        return float(weights @ np.array(losses))
+
+    def _split(self, flat):
+        if self.flat.scalar:
+            return flat.tolist()
+        i, out = 0, []
+        for p, n in zip(self.flat.params, self.flat.sizes):
+            out.append(flat[i:i+n].reshape(p.data.shape) if isinstance(p, Tensor) else float(flat[i]))
+            i += n
+        return out
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+        # drop our views before the mappings go away
+        del self.params, self.grads
+        for shm in (self._params_shm, self._grads_shm):
+            shm.close()
+            shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self):
+        return f"DataParallel(processes={self.processes}, params={self.flat.n})"
@@ -0,0 +1,62 @@
+import random
+from micrograd.engine import Value, softmax, cross_entropy
+from micrograd.nn import MLP
+from micrograd.compiler import trace
+
+def test_kernel_matches_graph():
+
+    random.seed(1337)
+    model = MLP(3, [8, 8, 1])
+    params = model.parameters()
+
+    def loss(v):
+        # svm loss on the score plus some ops that involve negative constants
+        score = model(v[:3])
+        return (1 + -v[3] * score).relu() + (score - 2)**2 / 4.0 + 10.0 / (score**2 + 1)
+
+    kernel = trace(loss, 4, params)
+    for _ in range(5):
+        x = [random.uniform(-2, 2) for _ in range(3)] + [random.choice([-1.0, 1.0])]
+
+        model.zero_grad()
+        ref = loss([Value(xi) for xi in x])
+        ref.backward()
+        ref_grads = [p.grad for p in params]
+
+        model.zero_grad()
+        out = kernel(x)
+        assert abs(out - ref.data) < 1e-9
+        assert abs(kernel.forward(x) - ref.data) < 1e-9
+        assert all(abs(g - p.grad) < 1e-9 for g, p in zip(ref_grads, params))
+
+def test_kernel_reads_current_params():
+
+    random.seed(0)
+    model = MLP(2, [4, 2])
+    kernel = trace(model, 2, model.parameters())
+    for p in model.parameters():
+        p.data *= 0.5
+    x = [0.3, -0.7]
+    assert kernel.forward(x) == [o.data for o in model([Value(xi) for xi in x])]
+
+def test_kernel_fused_ops():
+
+    random.seed(7)
+    model = MLP(4, [6, 3])
+    params = model.parameters()
+
+    def loss(v):
+        logits = model(v)
+        p = softmax(logits)
+        return cross_entropy(logits, 1) + (p[0] / p[2]).log().tanh() + logits[1].sigmoid() * logits[2].exp()
+
+    kernel = trace(loss, 4, params)
+    for _ in range(3):
+        x = [random.uniform(-2, 2) for _ in range(4)]
+        model.zero_grad()
+        ref = loss([Value(xi) for xi in x])
+        ref.backward()
+        ref_grads = [p.grad for p in params]
+        model.zero_grad()
+        assert abs(kernel(x) - ref.data) < 1e-9
+        assert all(abs(g - p.grad) < 1e-9 for g, p in zip(ref_grads, params))
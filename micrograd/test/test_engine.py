@@ -1,5 +1,5 @@
 import torch
-from micrograd.engine import Value
+from micrograd.engine import Value, affine, softmax, cross_entropy
 
 def test_sanity_check():
 
@@ -65,3 +65,51 @@ def test_more_ops():
     # backward pass went well
     assert abs(amg.grad - apt.grad.item()) < tol
     assert abs(bmg.grad - bpt.grad.item()) < tol
+
+def test_fused_ops():
+
+    a = Value(-1.5)
+    b = Value(0.8)
+    c = (a * b).tanh() + (a / b).sigmoid() + (b.log() - a).exp() / (2.0 + b)
+    c = c / a + 3.0 / c
+    c.backward()
+    amg, bmg, cmg = a, b, c
+
+    a = torch.Tensor([-1.5]).double()
+    b = torch.Tensor([0.8]).double()
+    a.requires_grad = True
+    b.requires_grad = True
+    c = (a * b).tanh() + (a / b).sigmoid() + (b.log() - a).exp() / (2.0 + b)
+    c = c / a + 3.0 / c
+    c.backward()
+    apt, bpt, cpt = a, b, c
+
+    tol = 1e-6
+    assert abs(cmg.data - cpt.data.item()) < tol
+    assert abs(amg.grad - apt.grad.item()) < tol
+    assert abs(bmg.grad - bpt.grad.item()) < tol
+
+def test_softmax_cross_entropy():
+
+    xs, ws = [0.5, -1.0, 2.0], [[0.1, -0.3, 0.7], [1.2, 0.4, -0.5], [-0.8, 0.9, 0.3]]
+    x = [Value(v) for v in xs]
+    w = [[Value(v) for v in row] for row in ws]
+    b = Value(0.25)
+    logits = [affine(row, x, b) for row in w]
+    probs = softmax(logits)
+    loss = cross_entropy(logits, 2) + probs[0] * probs[1]
+    loss.backward()
+
+    xt = torch.tensor(xs, dtype=torch.double, requires_grad=True)
+    wt = torch.tensor(ws, dtype=torch.double, requires_grad=True)
+    bt = torch.tensor(0.25, dtype=torch.double, requires_grad=True)
+    logits_pt = wt @ xt + bt
+    probs_pt = logits_pt.softmax(0)
+    loss_pt = torch.nn.functional.cross_entropy(logits_pt[None], torch.tensor([2])) + probs_pt[0] * probs_pt[1]
+    loss_pt.backward()
+
+    tol = 1e-6
+    assert abs(loss.data - loss_pt.item()) < tol
+    assert all(abs(xi.grad - g) < tol for xi, g in zip(x, xt.grad.tolist()))
+    assert all(abs(wij.grad - g) < tol for wi, gi in zip(w, wt.grad.tolist()) for wij, g in zip(wi, gi))
+    assert abs(b.grad - bt.grad.item()) < tol
@@ -0,0 +1,42 @@
+import random
+import numpy as np
+from micrograd.engine import Value
+from micrograd.nn import MLP, TensorMLP
+
+def test_save_load_mlp(tmp_path):
+
+    random.seed(1337)
+    model = MLP(3, [4, 4, 1])
+    path = tmp_path / 'mlp.npy'
+    model.save(path)
+
+    fresh = MLP(3, [4, 4, 1]).load(path)
+    assert [p.data for p in fresh.parameters()] == [p.data for p in model.parameters()]
+    x = [Value(0.5), Value(-1.0), Value(2.0)]
+    assert fresh(x).data == model(x).data
+
+def test_load_tensor_mlp_mmap(tmp_path):
+
+    np.random.seed(0)
+    model = TensorMLP(3, [4, 1])
+    path = tmp_path / 'tmlp.npy'
+    model.save(path)
+
+    fresh = TensorMLP(3, [4, 1]).load(path, mmap=True)
+    for p, q in zip(fresh.parameters(), model.parameters()):
+        assert isinstance(p.data.base, np.memmap) or isinstance(p.data, np.memmap)
+        assert np.array_equal(p.data, q.data)
+
+    # copy-on-write: training the loaded model leaves the file alone
+    fresh.layers[0].w.data -= 1.0
+    assert np.array_equal(np.load(path)[:12], model.layers[0].w.data.ravel())
+
+def test_load_wrong_layout(tmp_path):
+
+    path = tmp_path / 'mlp.npy'
+    MLP(3, [4, 1]).save(path)
+    try:
+        MLP(3, [5, 1]).load(path)
+    except AssertionError:
+        return
+    assert False, "loading a differently shaped model should fail"
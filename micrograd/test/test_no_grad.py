@@ -0,0 +1,58 @@
+import random
+import threading
+import numpy as np
+from micrograd.engine import Value, Tensor, no_grad, is_grad_enabled
+from micrograd.nn import MLP
+
+def test_no_grad_builds_no_graph():
+
+    a = Value(2.0)
+    t = Tensor([1.0, -2.0])
+    with no_grad():
+        assert not is_grad_enabled()
+        b = (a * 3 + 1).relu() ** 2 / a
+        u = (t @ t + t).relu().sum()
+    assert is_grad_enabled()
+    assert b.data == 24.5 and b._prev == () and b._op == ''
+    assert u.data == 9.0 and not u._prev
+
+    # graph construction is back on after the block
+    c = a * a
+    c.backward()
+    assert a.grad == 4.0
+
+def test_no_grad_mlp_matches_graph():
+
+    random.seed(1337)
+    model = MLP(4, [8, 8, 3])
+    for _ in range(5):
+        x = [random.uniform(-1, 1) for _ in range(4)]
+        ref = [o.data for o in model([Value(xi) for xi in x])]
+        with no_grad():
+            out = model(x)
+        assert np.allclose([o.data for o in out], ref)
+        assert all(o._prev == () for o in out)
+
+def test_no_grad_is_per_thread():
+
+    inside, done = threading.Event(), threading.Event()
+    seen = []
+    def serve():
+        with no_grad():
+            seen.append(is_grad_enabled())
+            inside.set()
+            done.wait(5)
+
+    worker = threading.Thread(target=serve)
+    worker.start()
+    assert inside.wait(5)
+    try:
+        # another thread's no_grad() block doesn't switch off graph building here
+        assert is_grad_enabled()
+        t = Tensor([1.0, -2.0])
+        (t * t).sum().backward()
+        assert np.allclose(t.grad, [2.0, -4.0])
+    finally:
+        done.set()
+        worker.join()
+    assert seen == [False]
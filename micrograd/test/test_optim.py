@@ -0,0 +1,80 @@
+import random
+import pytest
+import numpy as np
+from micrograd.engine import Value, Tensor
+from micrograd.nn import MLP
+from micrograd.optim import Optimizer, SGD, Adam
+from micrograd.data import DataLoader
+
+def test_forward_batch_matches_per_sample():
+
+    random.seed(1337)
+    model = MLP(3, [6, 6, 2])
+    X = np.random.RandomState(0).randn(5, 3)
+
+    model.zero_grad()
+    out = model.forward_batch(X)
+    (out * out).sum().backward()
+    batch_grads = [p.grad for p in model.parameters()]
+
+    model.zero_grad()
+    loss = Value(0)
+    for row in X:
+        for o in model(list(row)):
+            loss = loss + o * o
+    loss.backward()
+
+    assert abs(out.data.ravel() @ out.data.ravel() - loss.data) < 1e-9
+    assert np.allclose(batch_grads, [p.grad for p in model.parameters()])
+
+def test_adam_matches_reference():
+
+    a = [Value(1.0), Value(-2.0)]
+    t = Tensor([[0.5, 3.0]])
+    opt = Adam(a + [t], lr=0.1)
+    m, v = np.zeros(4), np.zeros(4)
+    x = np.array([1.0, -2.0, 0.5, 3.0])
+    for step in range(1, 4):
+        opt.zero_grad()
+        loss = a[0]*a[0] + a[1]*a[1]*a[1]
+        loss.backward()
+        (t * t).sum().backward()
+        opt.step()
+
+        g = np.array([2*x[0], 3*x[1]**2, 2*x[2], 2*x[3]])
+        m = 0.9*m + 0.1*g
+        v = 0.999*v + 0.001*g**2
+        x = x - 0.1 * (m / (1 - 0.9**step)) / (np.sqrt(v / (1 - 0.999**step)) + 1e-8)
+        assert np.allclose([a[0].data, a[1].data] + list(t.data.ravel()), x)
+
+def test_sgd_momentum_trains_on_batches():
+
+    np.random.seed(0)
+    random.seed(0)
+    X = np.random.randn(64, 2)
+    y = (X[:, 0] + X[:, 1] > 0) * 2.0 - 1.0
+    model = MLP(2, [8, 1])
+    opt = SGD(model.parameters(), lr=0.05, momentum=0.9)
+    loader = DataLoader(X, y, batch_size=16)
+    assert len(loader) == 4
+
+    for epoch in range(20):
+        for Xb, yb in loader:
+            scores = model.forward_batch(Xb)
+            loss = (1 - scores * yb[:, None]).relu().mean()
+            opt.zero_grad()
+            loss.backward()
+            opt.step()
+
+    scores = model.forward_batch(X).data.ravel()
+    assert ((scores > 0) == (y > 0)).mean() > 0.9
+
+def test_optimizer_requires_update():
+
+    class NoUpdate(Optimizer):
+        pass
+
+    with pytest.raises(TypeError):
+        NoUpdate([Value(1.0)])
+    with pytest.raises(TypeError):
+        Optimizer([Value(1.0)])
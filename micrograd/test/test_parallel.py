@@ -0,0 +1,37 @@
+import random
+import numpy as np
+from micrograd.nn import MLP
+from micrograd.parallel import DataParallel
+
+def svm_loss(model, X, y):
+    scores = model.forward_batch(X)
+    return (1 - scores * y[:, None]).relu().mean()
+
+def test_data_parallel_matches_single_process():
+
+    random.seed(1337)
+    model = MLP(2, [8, 8, 1])
+    rng = np.random.RandomState(0)
+    X, y = rng.randn(11, 2), rng.choice([-1.0, 1.0], 11)
+
+    model.zero_grad()
+    loss = svm_loss(model, X, y)
+    loss.backward()
+    ref = [p.grad for p in model.parameters()]
+
+    model.zero_grad()
+    with DataParallel(model, svm_loss, processes=3) as dp:
+        dp_loss = dp.backward(X, y)
+        assert abs(dp_loss - loss.data) < 1e-9
+        assert np.allclose([p.grad for p in model.parameters()], ref)
+
+        # parameters changed by the master are picked up by the replicas
+        for p in model.parameters():
+            p.data *= 0.5
+        model.zero_grad()
+        dp.backward(X, y)
+        dp_grads = [p.grad for p in model.parameters()]
+
+    model.zero_grad()
+    svm_loss(model, X, y).backward()
+    assert np.allclose(dp_grads, [p.grad for p in model.parameters()])
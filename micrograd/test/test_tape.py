@@ -0,0 +1,41 @@
+import sys
+from micrograd.engine import Value, Tensor, Tape
+from micrograd.nn import Neuron
+
+def test_deep_graph_backward():
+
+    # far deeper than the default recursion limit
+    n = sys.getrecursionlimit() * 5
+    x = Value(0.5)
+    y = x
+    for _ in range(n):
+        y = y + x
+    y.backward()
+    assert x.grad == n + 1
+
+def test_tape_replays_backward():
+
+    n = Neuron(3)
+    x = [Value(1.0), Value(-2.0), Value(3.0)]
+    y = n(x) * n(x) + 1
+    y.backward()
+    grads = [p.grad for p in n.parameters()]
+
+    tape = Tape(y)
+    assert len(tape) > 0
+    for _ in range(3):
+        n.zero_grad()
+        for xi in x:
+            xi.grad = 0
+        tape.backward()
+        assert [p.grad for p in n.parameters()] == grads
+
+def test_tape_tensor_root():
+
+    a = Tensor([1.0, -2.0, 3.0])
+    y = (a * a).relu().sum()
+    tape = Tape(y)
+    tape.backward()
+    tape.backward()
+    # leaf grads accumulate across passes, interior grads don't
+    assert list(a.grad) == [4.0, -8.0, 12.0]
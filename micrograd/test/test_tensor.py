@@ -0,0 +1,86 @@
+import numpy as np
+from micrograd.engine import Value, Tensor, softmax, cross_entropy
+from micrograd.nn import MLP, TensorMLP
+
+def test_tensor_matches_value():
+
+    xs = [[-4.0, 2.0, 0.5], [1.5, -3.0, 2.5]]
+    ws = [0.3, -1.2, 2.0]
+
+    # scalar graph
+    x = [[Value(v) for v in row] for row in xs]
+    w = [Value(v) for v in ws]
+    out = Value(0)
+    for row in x:
+        z = sum((wi * xi for wi, xi in zip(w, row)), Value(1.0))
+        out = out + (z.relu() * z + z**2) / 2.0
+    out.backward()
+
+    # tensor graph
+    xt = Tensor(xs)
+    wt = Tensor(ws)
+    z = xt @ wt + 1.0
+    outt = ((z.relu() * z + z**2) / 2.0).sum()
+    outt.backward()
+
+    tol = 1e-9
+    assert abs(outt.data - out.data) < tol
+    assert np.allclose(wt.grad, [wi.grad for wi in w], atol=tol)
+    assert np.allclose(xt.grad, [[xi.grad for xi in row] for row in x], atol=tol)
+
+def test_tensor_reductions():
+
+    a = Tensor([[1.0, 5.0, 5.0], [-2.0, 0.0, 3.0]])
+    b = Tensor([2.0, -1.0, 0.5])
+    c = (a * b).mean(axis=0) + a.max(axis=1).sum() - (3 - a).sum(axis=1, keepdims=True).mean()
+    c.sum().backward()
+
+    # c has shape (3,), so every scalar term is broadcast three times into the final sum.
+    # the mean over axis 0 contributes b/2, the row max routes 3 to each row max (ties split)
+    # and the mean of the (2, 1) keepdims sum contributes 3 * 1/2 to every element
+    expected = np.array([[1.0, -0.5, 0.25], [1.0, -0.5, 0.25]])
+    expected += np.array([[0.0, 1.5, 1.5], [0.0, 0.0, 3.0]])
+    expected += 1.5
+    assert np.allclose(a.grad, expected)
+    assert np.allclose(b.grad, [-0.5, 2.5, 4.0])
+
+def test_tensor_mlp_matches_mlp():
+
+    np.random.seed(0)
+    model = TensorMLP(3, [4, 4, 1])
+    ref = MLP(3, [4, 4, 1])
+    # copy the tensor weights into the scalar model, neuron j of layer l reads column j
+    for tl, l in zip(model.layers, ref.layers):
+        for j, n in enumerate(l.neurons):
+            for i, wi in enumerate(n.w):
+                wi.data = tl.w.data[i, j]
+            n.b.data = tl.b.data[j]
+
+    X = np.random.randn(5, 3)
+    loss = model(X).sum()
+    loss.backward()
+    ref_loss = sum(ref(list(row)) for row in X)
+    ref_loss.backward()
+
+    assert abs(loss.data - ref_loss.data) < 1e-9
+    ref_grad = np.array([[n.w[i].grad for n in ref.layers[0].neurons] for i in range(3)])
+    assert np.allclose(model.layers[0].w.grad, ref_grad)
+
+def test_tensor_fused_ops_match_value():
+
+    xs = [[0.5, -1.0, 2.0], [1.5, 0.2, -0.7]]
+    ws = [[1.0, -2.0, 0.5], [0.3, 0.3, 2.0]]
+
+    x = Tensor(xs)
+    loss = x.cross_entropy([2, 0]) + (x.exp() / (1 + x.sigmoid())).log().tanh().sum() + (x.softmax() * ws).sum()
+    loss.backward()
+
+    v = [[Value(e) for e in row] for row in xs]
+    ref = (cross_entropy(v[0], 2) + cross_entropy(v[1], 0)) / 2
+    for row, wrow in zip(v, ws):
+        ref = ref + sum((e.exp() / (1 + e.sigmoid())).log().tanh() for e in row)
+        ref = ref + sum(p * wi for p, wi in zip(softmax(row), wrow))
+    ref.backward()
+
+    assert abs(loss.data - ref.data) < 1e-9
+    assert np.allclose(x.grad, [[e.grad for e in row] for row in v])